@@ -1,60 +1,260 @@
-from schemas import ProposedGoal, EncodedTx
+from schemas import ADDRESS_PATTERN, ProposedGoal, EncodedTx
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import time
 import os
-import hashlib
+import json
+
+WEI_PER_ETH = 10**18
+UINT256_MAX = 2**256 - 1
+
+# Keccak-f[1600] round constants and rotation offsets (lane index x + 5*y)
+_KECCAK_ROUND_CONSTANTS = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+)
+_KECCAK_ROTATIONS = (
+    0, 1, 62, 28, 27,
+    36, 44, 6, 55, 20,
+    3, 10, 43, 25, 39,
+    41, 45, 15, 21, 8,
+    18, 2, 61, 56, 14,
+)
+_LANE_MASK = 2**64 - 1
+_KECCAK256_RATE = 136
+
+
+def _keccak_f(lanes: List[int]):
+    for round_constant in _KECCAK_ROUND_CONSTANTS:
+        # theta
+        columns = [lanes[x] ^ lanes[x + 5] ^ lanes[x + 10] ^ lanes[x + 15] ^ lanes[x + 20] for x in range(5)]
+        for x in range(5):
+            right = columns[(x + 1) % 5]
+            d = columns[(x - 1) % 5] ^ (((right << 1) | (right >> 63)) & _LANE_MASK)
+            for y in range(0, 25, 5):
+                lanes[x + y] ^= d
+        # rho and pi
+        moved = [0] * 25
+        for x in range(5):
+            for y in range(5):
+                lane = lanes[x + 5 * y]
+                shift = _KECCAK_ROTATIONS[x + 5 * y]
+                moved[y + 5 * ((2 * x + 3 * y) % 5)] = ((lane << shift) | (lane >> (64 - shift))) & _LANE_MASK
+        # chi
+        for y in range(0, 25, 5):
+            row = moved[y:y + 5]
+            for x in range(5):
+                lanes[x + y] = row[x] ^ (~row[(x + 1) % 5] & row[(x + 2) % 5])
+        # iota
+        lanes[0] ^= round_constant
+
+
+def keccak256(data: bytes) -> bytes:
+    """Ethereum's keccak256 (original Keccak padding, not NIST SHA3-256)"""
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(bytes(-len(padded) % _KECCAK256_RATE))
+    padded[-1] |= 0x80
+
+    lanes = [0] * 25
+    for start in range(0, len(padded), _KECCAK256_RATE):
+        block = padded[start:start + _KECCAK256_RATE]
+        for i in range(_KECCAK256_RATE // 8):
+            lanes[i] ^= int.from_bytes(block[8 * i:8 * i + 8], "little")
+        _keccak_f(lanes)
+    return b"".join(lane.to_bytes(8, "little") for lane in lanes[:4])
+
+
+def function_selector(signature: str) -> bytes:
+    """First 4 bytes of keccak256 of the canonical function signature"""
+    return keccak256(signature.encode())[:4]
+
+
+def encode_uint256(value: int) -> bytes:
+    if not 0 <= value <= UINT256_MAX:
+        raise ValueError(f"Value out of uint256 range: {value}")
+    return value.to_bytes(32, "big")
+
+
+def encode_address(address: str) -> bytes:
+    if not isinstance(address, str) or not ADDRESS_PATTERN.match(address):
+        raise ValueError(f"Invalid Ethereum address: {address!r}")
+    return bytes(12) + bytes.fromhex(address[2:])
+
+
+def decode_uint256(data: bytes, word: int = 0) -> int:
+    return int.from_bytes(data[32 * word:32 * word + 32], "big")
+
+
+def decode_address(data: bytes, word: int = 0) -> str:
+    return "0x" + data[32 * word + 12:32 * word + 32].hex()
+
+
+def decode_bool(data: bytes, word: int = 0) -> bool:
+    return decode_uint256(data, word) != 0
+
+
+def eth_to_wei(amount_eth) -> int:
+    """Convert an ETH amount to wei without float rounding (0.3 ETH is exactly 3 * 10**17 wei)"""
+    return int(Decimal(str(amount_eth)) * WEI_PER_ETH)
+
+
+# Selectors are hashed once at import, not per transaction
+CREATE_POOL_SIGNATURE = "createPool(address,uint256,uint256,string)"
+DEPOSIT_SIGNATURE = "deposit(uint256)"
+CREATE_POOL_SELECTOR = function_selector(CREATE_POOL_SIGNATURE)
+DEPOSIT_SELECTOR = function_selector(DEPOSIT_SIGNATURE)
+GET_POOL_SELECTOR = function_selector("getPool(uint256)")
+POOL_COUNT_SELECTOR = function_selector("poolCount()")
+AGGREGATE3_SELECTOR = function_selector("aggregate3((address,bool,bytes)[])")
+
+# Multicall3 is deployed at the same address on every major chain, Base Sepolia included
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Topics of the pool events; the pool id is the first indexed argument of each
+POOL_CREATED_TOPIC = "0x" + keccak256(b"PoolCreated(uint256,address,address,uint256,uint256)").hex()
+DEPOSIT_TOPIC = "0x" + keccak256(b"Deposit(uint256,address,uint256,uint256)").hex()
+FINALIZED_TOPIC = "0x" + keccak256(b"Finalized(uint256,uint256)").hex()
+REFUNDED_TOPIC = "0x" + keccak256(b"Refunded(uint256,address,uint256)").hex()
+POOL_EVENT_TOPICS = (POOL_CREATED_TOPIC, DEPOSIT_TOPIC, FINALIZED_TOPIC, REFUNDED_TOPIC)
+
+# createPool calldata: selector, four head words (recipient, goal, deadline,
+# offset of the string), then the string length word and its padded bytes.
+# The string is the only dynamic argument, so its offset is always 4 * 32.
+_CREATE_POOL_HEAD_SIZE = 4 + 4 * 32
+_CREATE_POOL_HEAD_TEMPLATE = bytes(CREATE_POOL_SELECTOR + bytes(3 * 32) + encode_uint256(4 * 32))
+
+
+def encode_create_pool_calldata(recipient: str, goal_wei: int, deadline: int, metadata: str) -> bytes:
+    """ABI-encode createPool(address,uint256,uint256,string) into a single preallocated buffer"""
+    metadata_bytes = metadata.encode()
+    padded_length = (len(metadata_bytes) + 31) // 32 * 32
+    calldata = bytearray(_CREATE_POOL_HEAD_SIZE + 32 + padded_length)
+
+    calldata[:_CREATE_POOL_HEAD_SIZE] = _CREATE_POOL_HEAD_TEMPLATE
+    calldata[4:36] = encode_address(recipient)
+    calldata[36:68] = encode_uint256(goal_wei)
+    calldata[68:100] = encode_uint256(deadline)
+    calldata[132:164] = encode_uint256(len(metadata_bytes))
+    calldata[164:164 + len(metadata_bytes)] = metadata_bytes
+    return bytes(calldata)
+
+
+def encode_deposit_calldata(pool_id: int) -> bytes:
+    """ABI-encode deposit(uint256)"""
+    return DEPOSIT_SELECTOR + encode_uint256(pool_id)
+
+
+def encode_get_pool_calldata(pool_id: int) -> bytes:
+    """ABI-encode getPool(uint256)"""
+    return GET_POOL_SELECTOR + encode_uint256(pool_id)
+
+
+def decode_get_pool(data: bytes) -> Dict[str, Any]:
+    """Decode getPool's (creator, recipient, goal, totalContrib, deadline, finalized, failed) tuple"""
+    if len(data) < 7 * 32:
+        raise ValueError(f"getPool returned {len(data)} bytes, expected {7 * 32}")
+    return {
+        "creator": decode_address(data, 0),
+        "recipient": decode_address(data, 1),
+        "goal_amount": decode_uint256(data, 2),
+        "raised_amount": decode_uint256(data, 3),
+        "deadline": decode_uint256(data, 4),
+        "finalized": decode_bool(data, 5),
+        "failed": decode_bool(data, 6)
+    }
+
+
+def encode_bytes(data: bytes) -> bytes:
+    """Length word followed by the data right-padded to a whole word"""
+    return encode_uint256(len(data)) + data + bytes(-len(data) % 32)
+
+
+def encode_dynamic_array(elements: List[bytes]) -> bytes:
+    """Length, per-element offsets (relative to the first offset word), then the encoded elements"""
+    head = bytearray(encode_uint256(len(elements)))
+    offset = 32 * len(elements)
+    for element in elements:
+        head += encode_uint256(offset)
+        offset += len(element)
+    return bytes(head) + b"".join(elements)
+
+
+def encode_aggregate3_calldata(target: str, calls: List[bytes], allow_failure: bool = True) -> bytes:
+    """ABI-encode Multicall3 aggregate3((address,bool,bytes)[]) with every call sent to one target"""
+    target_word = encode_address(target)
+    failure_word = encode_uint256(int(allow_failure))
+    # Each Call3 tuple: target, allowFailure, offset of callData (3 head words), callData
+    tuples = [target_word + failure_word + encode_uint256(3 * 32) + encode_bytes(call) for call in calls]
+    return AGGREGATE3_SELECTOR + encode_uint256(32) + encode_dynamic_array(tuples)
+
+
+def decode_aggregate3_results(data: bytes) -> List[Tuple[bool, bytes]]:
+    """Decode aggregate3's (bool success, bytes returnData)[] in one pass"""
+    array_start = decode_uint256(data[:32])
+    count = decode_uint256(data[array_start:array_start + 32])
+    heads = array_start + 32
+    results = []
+    for i in range(count):
+        start = heads + decode_uint256(data[heads + 32 * i:heads + 32 * i + 32])
+        success = decode_uint256(data[start:start + 32]) != 0
+        bytes_start = start + decode_uint256(data[start + 32:start + 64])
+        length = decode_uint256(data[bytes_start:bytes_start + 32])
+        results.append((success, data[bytes_start + 32:bytes_start + 32 + length]))
+    return results
+
 
 class ABIEncoder:
     def __init__(self):
         # Contract address (placeholder - should be set to actual deployed contract)
         self.contract_address = os.getenv("CONTRACT_ADDRESS", "0x1234567890123456789012345678901234567890")
-        
+
+    def build_create_pool(self, goal: ProposedGoal, now: Optional[int] = None) -> EncodedTx:
+        """Build the createPool transaction for a goal, with the deadline counted from now"""
+        now = int(time.time()) if now is None else now
+        metadata = json.dumps({
+            "title": goal.title,
+            "description": goal.description or "",
+            "created_at": now
+        }, separators=(",", ":"), ensure_ascii=False)
+
+        calldata = encode_create_pool_calldata(
+            goal.recipient,
+            eth_to_wei(goal.cost_eth),
+            now + int(goal.deadline_days) * 24 * 60 * 60,
+            metadata
+        )
+        return EncodedTx(
+            to=self.contract_address,
+            data="0x" + calldata.hex(),
+            value=0  # No ETH value needed for createPool
+        )
+
     async def encode_create_pool(self, goal: ProposedGoal) -> EncodedTx:
         """Encode createPool function call"""
         try:
-            # For demo purposes, return a mock transaction
-            # TODO: Implement proper ABI encoding when web3 is available
-            
-            # Convert cost to wei
-            cost_wei = int(goal.cost_eth * 10**18)
-            
-            # Calculate deadline timestamp
-            deadline_timestamp = int(time.time()) + (goal.deadline_days * 24 * 60 * 60)
-            
-            # Create metadata JSON
-            metadata = {
-                "title": goal.title,
-                "description": goal.description or "",
-                "created_at": int(time.time())
-            }
-            metadata_json = str(metadata).replace("'", '"')
-            
-            # Mock function selector (first 4 bytes of keccak256 hash)
-            # In a real implementation, this would be: Web3.keccak(text="createPool(address,uint256,uint256,string)")[:4]
-            function_selector = "0x12345678"  # Mock selector
-            
-            # Mock encoded parameters
-            # In a real implementation, this would use eth_abi.encode()
-            mock_data = f"{function_selector}{goal.recipient[2:]}{cost_wei:064x}{deadline_timestamp:064x}{len(metadata_json.encode()):064x}{metadata_json.encode().hex()}"
-            
-            return EncodedTx(
-                to=self.contract_address,
-                data=mock_data,
-                value=0  # No ETH value needed for createPool
-            )
-            
+            return self.build_create_pool(goal)
         except Exception as e:
             raise Exception(f"Failed to encode createPool transaction: {str(e)}")
-    
+
+    def encode_create_pool_batch(self, goals: Iterable[ProposedGoal]) -> List[EncodedTx]:
+        """Encode createPool calls for many goals, sharing one timestamp; failed goals map to their exception"""
+        now = int(time.time())
+        results = []
+        for goal in goals:
+            try:
+                results.append(self.build_create_pool(goal, now))
+            except Exception as e:
+                results.append(e)
+        return results
+
     def encode_deposit(self, pool_id: int, amount_wei: int) -> str:
-        """Encode deposit function call"""
+        """Encode deposit function call (amount_wei is sent as the transaction value)"""
         try:
-            # Mock function selector for deposit(uint256)
-            function_selector = "0x87654321"  # Mock selector
-            
-            # Mock encoded parameters
-            mock_data = f"{function_selector}{pool_id:064x}"
-            
-            return mock_data
-            
+            return "0x" + encode_deposit_calldata(pool_id).hex()
         except Exception as e:
             raise Exception(f"Failed to encode deposit transaction: {str(e)}")
@@ -0,0 +1,144 @@
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from metrics import ADMISSION_REJECTIONS, ADMISSION_WAIT_SECONDS
+
+
+class AdmissionRejected(Exception):
+    """A request was shed instead of queued; retry_after is a hint in whole seconds"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"LLM capacity exhausted ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class LLMAdmission:
+    """Bounds in-flight LLM calls with a semaphore and a short, bounded wait queue
+
+    Calls beyond LLM_MAX_CONCURRENCY wait for a slot; once LLM_MAX_QUEUE calls
+    are already waiting, or a call has waited LLM_QUEUE_TIMEOUT_SECONDS, it is
+    rejected at once so the client can back off instead of piling onto the provider.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_queue: Optional[int] = None,
+                 queue_timeout_seconds: Optional[float] = None):
+        self.max_concurrency = max_concurrency if max_concurrency is not None else int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("LLM_MAX_QUEUE", "64"))
+        self.queue_timeout_seconds = queue_timeout_seconds if queue_timeout_seconds is not None else float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "10"))
+
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        # Moving average of how long a call holds a slot, for Retry-After hints
+        self.avg_hold_seconds = 1.0
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained"""
+        backlog = (self.waiting + 1) / self.max_concurrency
+        return max(1, math.ceil(backlog * self.avg_hold_seconds))
+
+    def check(self):
+        """Raise AdmissionRejected if a new call would be shed right now"""
+        if self.in_flight >= self.max_concurrency and self.waiting >= self.max_queue:
+            ADMISSION_REJECTIONS.inc(reason="queue_full")
+            raise AdmissionRejected("queue_full", self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one LLM concurrency slot for the duration of the block"""
+        self.check()
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            ADMISSION_REJECTIONS.inc(reason="queue_timeout")
+            raise AdmissionRejected("queue_timeout", self.retry_after())
+        finally:
+            self.waiting -= 1
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+        self.in_flight += 1
+        acquired = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(acquired)
+
+    async def try_acquire(self) -> Optional[float]:
+        """Take a slot only if one is free and nobody is queued for it, without waiting
+
+        For optional calls such as a hedged duplicate. Returns the acquire time
+        to pass to release(), or None if the slot was not taken.
+        """
+        if self._slots.locked():
+            return None
+        await self._slots.acquire()  # free, so this returns at once
+        self.in_flight += 1
+        return time.perf_counter()
+
+    def release(self, acquired: float):
+        """Give back a slot held since `acquired`"""
+        self.in_flight -= 1
+        self._slots.release()
+        self.avg_hold_seconds = 0.8 * self.avg_hold_seconds + 0.2 * (time.perf_counter() - acquired)
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """Spend one token; returns 0 on success, else the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ClientRateLimiter:
+    """Per-client token buckets, keeping the most recently seen RATE_LIMIT_MAX_CLIENTS clients"""
+
+    def __init__(self, per_minute: Optional[float] = None, burst: Optional[int] = None,
+                 max_clients: Optional[int] = None):
+        per_minute = per_minute if per_minute is not None else float(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+        self.rate = per_minute / 60
+        self.burst = burst if burst is not None else int(os.getenv("RATE_LIMIT_BURST", "20"))
+        self.max_clients = max_clients if max_clients is not None else int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+        # client -> bucket, least recently seen first
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, client: str) -> Optional[int]:
+        """None if the client may proceed, else a Retry-After in whole seconds"""
+        if not self.enabled:
+            return None
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        self._buckets.move_to_end(client)
+
+        wait = bucket.take()
+        if wait:
+            ADMISSION_REJECTIONS.inc(reason="rate_limited")
+            return max(1, math.ceil(wait))
+        return None
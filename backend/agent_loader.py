@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class LazyAgent:
+    """Stands in for the agent until it is built, so importing main stays cheap
+
+    The factory (which imports langchain/langgraph and compiles the graph) runs
+    once: in a thread from warm_up(), e.g. a startup task, or on first
+    attribute access. Attribute access is then delegated to the built agent.
+    """
+
+    def __init__(self, factory: Callable[[], Any], on_load: Optional[Callable[[Any], None]] = None):
+        self._factory = factory
+        self._on_load = on_load
+        self._agent = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Future] = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._agent is not None
+
+    def load(self) -> Any:
+        """Build the agent if needed (blocking) and return it"""
+        if self._agent is not None:
+            return self._agent
+        with self._lock:
+            if self._agent is None:
+                started = time.perf_counter()
+                try:
+                    agent = self._factory()
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                self.load_seconds = time.perf_counter() - started
+                self.error = None
+                self.use(agent)
+        return self._agent
+
+    def use(self, agent: Any):
+        """Serve an already built agent, e.g. one with a fake LLM in benchmarks"""
+        self._agent = agent
+        if self._on_load is not None:
+            self._on_load(agent)
+
+    async def warm_up(self) -> Any:
+        """Build the agent off the event loop; concurrent callers share one build"""
+        if self._agent is not None:
+            return self._agent
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(asyncio.to_thread(self.load))
+        return await asyncio.shield(self._task)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes LazyAgent itself doesn't have
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
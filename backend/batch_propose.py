@@ -0,0 +1,94 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from admission import AdmissionRejected
+from metrics import PROPOSE_BATCH_ITEMS
+from schemas import ProposedGoal
+from single_flight import normalize_message
+
+
+class BatchProposer:
+    """Proposes goals for many messages in one request, yielding each item's result as it is ready
+
+    Messages the regex parsers resolve on their own are answered first, without
+    the LLM; the rest go to parse_goal with at most PROPOSE_BATCH_CONCURRENCY
+    in flight, so one large batch can't fill the admission queue by itself.
+    Repeated messages in a batch share one LLM call. With build_tx, goals are
+    also encoded as createPool transactions: the rule-resolved ones in a single
+    encoder pass, the others as their LLM call lands.
+    """
+
+    def __init__(self, agent, encoder=None, concurrency: Optional[int] = None):
+        self.agent = agent
+        self.encoder = encoder
+        self.concurrency = concurrency if concurrency is not None else int(os.getenv("PROPOSE_BATCH_CONCURRENCY", "8"))
+
+    async def run(self, messages: List[Any], engine: Optional[str] = None,
+                  build_tx: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Yield {"index", "resolved", "goal"[, "transaction"]} or {"index", "error"} per message, in completion order"""
+        resolved: List[Tuple[int, ProposedGoal]] = []
+        # Normalized message -> indexes waiting on its LLM call
+        pending: Dict[str, List[int]] = {}
+        for index, message in enumerate(messages):
+            if not isinstance(message, str) or not message.strip():
+                yield self._error(index, "Invalid message: must be a non-empty string")
+                continue
+            goal = self.agent.parse_goal_rules(message)
+            if goal is None:
+                pending.setdefault(normalize_message(message), []).append(index)
+            else:
+                resolved.append((index, goal))
+
+        for item in self._items(resolved, "rules", build_tx):
+            yield item
+
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def propose(message: str) -> Tuple[str, Any]:
+            async with semaphore:
+                try:
+                    return message, await self.agent.parse_goal(message, engine=engine)
+                except Exception as e:
+                    return message, e
+
+        tasks = [asyncio.create_task(propose(message)) for message in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                message, goal = await next_done
+                indexes = pending[message]
+                if isinstance(goal, AdmissionRejected):
+                    for index in indexes:
+                        yield self._error(index, f"LLM overloaded ({goal.reason}), retry after {goal.retry_after}s")
+                elif isinstance(goal, Exception):
+                    for index in indexes:
+                        yield self._error(index, f"Failed to parse goal: {str(goal)}")
+                else:
+                    for item in self._items([(index, goal) for index in indexes], "llm", build_tx):
+                        yield item
+        finally:
+            # The client went away mid-stream: stop spending LLM calls on it
+            for task in tasks:
+                task.cancel()
+
+    def _items(self, goals: List[Tuple[int, ProposedGoal]], resolved: str, build_tx: bool) -> List[Dict[str, Any]]:
+        if not goals:
+            return []
+        transactions = self.encoder.encode_create_pool_batch(goal for _, goal in goals) if build_tx else None
+        items = []
+        for position, (index, goal) in enumerate(goals):
+            item = {"index": index, "resolved": resolved, "goal": goal.to_dict()}
+            if transactions is not None:
+                tx = transactions[position]
+                if isinstance(tx, Exception):
+                    item["error"] = f"Failed to encode createPool transaction: {str(tx)}"
+                else:
+                    item["transaction"] = tx.to_dict()
+            PROPOSE_BATCH_ITEMS.inc(resolved=resolved)
+            items.append(item)
+        return items
+
+    @staticmethod
+    def _error(index: int, detail: str) -> Dict[str, Any]:
+        PROPOSE_BATCH_ITEMS.inc(resolved="error")
+        return {"index": index, "error": detail}
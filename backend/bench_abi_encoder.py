@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Throughput of createPool calldata encoding, per thousand encodings: with the
+keccak selector hashed on every call versus precomputed at import, and one
+request per goal versus the batch used by /llm/build_tx/batch
+"""
+import argparse
+import asyncio
+import time
+
+from abi_encoder import ABIEncoder, function_selector
+from schemas import ProposedGoal
+
+GOAL = ProposedGoal(
+    title="New laptop for design work",
+    cost_eth=2.5,
+    deadline_days=30,
+    recipient="0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
+    description="A laptop powerful enough to run the design suite I use for freelance work"
+)
+
+
+def encode_hashing_selector(encoder: ABIEncoder, count: int):
+    """Selector recomputed per transaction, as a naive encoder would"""
+    for _ in range(count):
+        function_selector("createPool(address,uint256,uint256,string)")
+        encoder.build_create_pool(GOAL)
+
+
+async def encode_one_by_one(encoder: ABIEncoder, count: int):
+    for _ in range(count):
+        await encoder.encode_create_pool(GOAL)
+
+
+def ms_per_thousand(seconds: float, count: int) -> float:
+    return seconds / count * 1000 * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000, help="Encodings per measurement")
+    args = parser.parse_args()
+
+    encoder = ABIEncoder()
+
+    started = time.perf_counter()
+    function_selector("createPool(address,uint256,uint256,string)")
+    selector_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    encode_hashing_selector(encoder, args.count)
+    hashing = time.perf_counter() - started
+
+    started = time.perf_counter()
+    asyncio.run(encode_one_by_one(encoder, args.count))
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    encoder.encode_create_pool_batch([GOAL] * args.count)
+    batch = time.perf_counter() - started
+
+    print("🧮 createPool ABI encoding")
+    print("=" * 50)
+    print(f"selector hash (once at import): {selector_ms:.2f} ms")
+    print(f"hashing the selector per call: {ms_per_thousand(hashing, args.count):.2f} ms / 1000 encodings")
+    print(f"one by one: {ms_per_thousand(single, args.count):.2f} ms / 1000 encodings")
+    print(f"batch:      {ms_per_thousand(batch, args.count):.2f} ms / 1000 encodings")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measure backend cold start in fresh interpreters: seconds and resident memory
+to import main (what /health waits for) and to build the agent (what /ready
+waits for), plus the slowest imports from -X importtime
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Runs in the child interpreter; peak RSS is in KiB on Linux
+PROBE = """
+import json, resource, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter() - started
+import_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+main.llm_agent.load()
+built = time.perf_counter() - started
+print(json.dumps({"import_seconds": imported, "import_rss_mb": import_rss / 1024,
+                  "agent_seconds": built, "ready_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+CHILD_ENV = {
+    "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "bench"),
+    "STATE_BACKEND": "memory",
+    "LLM_CACHE_BACKEND": "memory",
+    "RPC_URL": "",
+    "PYTHONDONTWRITEBYTECODE": "1",
+}
+
+
+def run_probe() -> dict:
+    result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True,
+                            env={**os.environ, **CHILD_ENV}, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> list:
+    """(cumulative seconds, module) of the slowest top-level imports while starting and building the agent"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main; main.llm_agent.load()"],
+                            capture_output=True, text=True, check=True,
+                            env={**os.environ, **CHILD_ENV}, cwd=os.path.dirname(os.path.abspath(__file__)))
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Top-level imports only (nested ones are indented and already in their parent's cumulative time)
+        name = name[1:]
+        if name == name.lstrip():
+            rows.append((int(cumulative) / 1e6, name))
+    return sorted(rows, reverse=True)[:top]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list (0 to skip)")
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.runs)]
+
+    print(f"🧊 Cold start, median of {args.runs} fresh interpreters")
+    print("=" * 50)
+    print(f"import main (/health):   {statistics.median(r['import_seconds'] for r in runs):.3f}s "
+          f"{statistics.median(r['import_rss_mb'] for r in runs):.1f} MB")
+    print(f"build agent (/ready):    {statistics.median(r['agent_seconds'] for r in runs):.3f}s "
+          f"{statistics.median(r['ready_rss_mb'] for r in runs):.1f} MB")
+
+    if args.top:
+        print("\n🐢 Slowest top-level imports")
+        for seconds, name in slowest_imports(args.top):
+            print(f"{seconds:8.3f}s  {name}")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Replay a conversation corpus with and without the deterministic fast path
+and report how many LLM calls it saves (fake LLM, no API key needed)
+"""
+import argparse
+import asyncio
+import json
+
+from fake_llm import FakeChatModel
+from langgraph_agent import DreamPoolReActAgent
+
+DEFAULT_CORPUS = "corpora/replay_conversations.json"
+
+
+async def replay(corpus, fast_path: bool):
+    """Replay every conversation turn by turn and count LLM calls"""
+    llm = FakeChatModel(call_tools=True)
+    agent = DreamPoolReActAgent(llm=llm, fast_path=fast_path)
+
+    turns = 0
+    completed = 0
+    for conversation in corpus:
+        messages = conversation["turns"]
+        state = await agent.start_conversation(messages[0])
+        for message in messages[1:]:
+            state = await agent.continue_conversation(state, message)
+        turns += len(messages)
+        completed += bool(state["conversation_complete"])
+
+    return {
+        "conversations": len(corpus),
+        "turns": turns,
+        "llm_calls": llm.calls,
+        "llm_calls_per_turn": round(llm.calls / turns, 2),
+        "completed": completed,
+        "fast_path_stats": dict(agent.fast_path_stats) if fast_path else None
+    }
+
+
+async def main(corpus_path: str, output: str = None):
+    with open(corpus_path) as f:
+        corpus = json.load(f)
+
+    baseline = await replay(corpus, fast_path=False)
+    fast = await replay(corpus, fast_path=True)
+    saved = baseline["llm_calls"] - fast["llm_calls"]
+    report = {
+        "corpus": corpus_path,
+        "baseline": baseline,
+        "fast_path": fast,
+        "llm_calls_saved": saved,
+        "llm_calls_saved_pct": round(100 * saved / baseline["llm_calls"], 1) if baseline["llm_calls"] else 0.0
+    }
+
+    print("⚡ Fast-path LLM savings")
+    print("=" * 50)
+    print(f"Conversations: {baseline['conversations']}, turns: {baseline['turns']}")
+    print(f"Baseline LLM calls:  {baseline['llm_calls']} ({baseline['llm_calls_per_turn']}/turn)")
+    print(f"Fast-path LLM calls: {fast['llm_calls']} ({fast['llm_calls_per_turn']}/turn)")
+    print(f"Saved: {saved} calls ({report['llm_calls_saved_pct']}%)")
+    print(f"Turns resolved without the LLM: {fast['fast_path_stats']['resolved']}")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+    asyncio.run(main(args.corpus, args.output))
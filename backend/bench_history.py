@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure prompt tokens per turn with and without history compaction on a
+synthetic long conversation (token counts are the ~4 chars/token estimate)
+"""
+import argparse
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from history import DEFAULT_MAX_MESSAGES, DEFAULT_MAX_TOKENS, compact_history, estimate_tokens
+from langgraph_agent import build_contract_payload, render_system_prompt
+
+
+def build_turn(turn: int):
+    """One user turn as the agent records it: tool calls, tool results, reply"""
+    user = HumanMessage(content=f"Let's adjust it: I need {turn + 1}.5 ETH in {10 + turn} days for the studio")
+    call = AIMessage(content="", tool_calls=[
+        {"name": "extract_eth_amount", "args": {"amount_text": f"{turn + 1}.5 ETH"}, "id": f"call_{turn}_0"},
+        {"name": "extract_deadline", "args": {"deadline_text": f"{10 + turn} days"}, "id": f"call_{turn}_1"},
+        {"name": "prepare_contract_payload", "args": {"goal_description": "Studio", "amount_eth": turn + 1.5,
+                                                      "deadline_days": 10 + turn}, "id": f"call_{turn}_2"}
+    ])
+    payload = json.dumps(build_contract_payload("Studio recording session", turn + 1.5, 10 + turn), indent=2)
+    results = [
+        ToolMessage(content=f"Extracted {turn + 1}.5 ETH", tool_call_id=f"call_{turn}_0", name="extract_eth_amount"),
+        ToolMessage(content=f"Extracted deadline: {10 + turn} days", tool_call_id=f"call_{turn}_1", name="extract_deadline"),
+        ToolMessage(content=f"Contract payload prepared: {payload}", tool_call_id=f"call_{turn}_2", name="prepare_contract_payload")
+    ]
+    reply = AIMessage(content=f"Updated! Your pool now asks for {turn + 1}.5 ETH within {10 + turn} days.")
+    return [user, call, *results, reply]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--max-messages", type=int, default=DEFAULT_MAX_MESSAGES)
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    args = parser.parse_args()
+
+    state = {"goal_description": "Studio recording session", "goal_amount_eth": 2.5, "deadline_days": 30,
+             "conversation_complete": True}
+    system_tokens = estimate_tokens({"content": render_system_prompt(state)})
+
+    print("🧹 Prompt tokens per agent call (first step of each turn)")
+    print("=" * 50)
+    print(f"{'turn':>4} {'full':>8} {'compacted':>10} {'saved':>7}")
+
+    history = []
+    full_total = compacted_total = 0
+    for turn in range(args.turns):
+        # The first agent step of a turn sees the history plus the new user message
+        turn_messages = build_turn(turn)
+        prompt = history + turn_messages[:1]
+        full = system_tokens + sum(estimate_tokens(m) for m in prompt)
+        compacted = system_tokens + sum(estimate_tokens(m) for m in
+                                        compact_history(prompt, args.max_messages, args.max_tokens))
+        full_total += full
+        compacted_total += compacted
+        print(f"{turn + 1:>4} {full:>8} {compacted:>10} {full - compacted:>7}")
+        history += turn_messages
+
+    print("-" * 50)
+    print(f"Total prompt tokens: {full_total} -> {compacted_total} "
+          f"({100 * (full_total - compacted_total) / full_total:.1f}% saved)")
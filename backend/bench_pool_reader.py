@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Reading every pool through the real JSON-RPC client against a local mock node
+(fake_rpc served over httpx's ASGI transport, with a per-request latency):
+one eth_call per pool versus JSON-RPC batches and Multicall3 aggregate3 calls
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from fake_rpc import FakePoolRPC
+from pool_reader import BatchedPoolReader, SequentialPoolReader
+from rpc_client import JSONRPCClient
+
+CREATOR = "0x742d35cc6634c0532925a3b844bc454e4438f44e"
+RECIPIENT = "0x1111111111111111111111111111111111111111"
+
+
+async def measure(node: FakePoolRPC, make_reader, pools: int):
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=node.asgi_app), base_url="http://rpc")
+    rpc = JSONRPCClient("http://rpc/", http_client=http)
+    reader = make_reader(rpc, node.contract_address)
+
+    node.round_trips = 0
+    started = time.perf_counter()
+    count = await reader.pool_count()
+    result = await reader.read_pools(list(range(1, count + 1)))
+    elapsed = time.perf_counter() - started
+    await rpc.aclose()
+
+    assert len(result) == pools
+    return elapsed, node.round_trips
+
+
+async def main(args):
+    node = FakePoolRPC(latency=args.latency)
+    deadline = int(time.time()) + 30 * 86400
+    for i in range(args.pools):
+        node.create_pool(CREATOR, RECIPIENT, (i + 1) * 10**16, deadline)
+
+    readers = [("sequential", lambda rpc, address: SequentialPoolReader(rpc, address))]
+    for mode in ("batch", "multicall"):
+        for batch_size in args.batch_sizes:
+            readers.append((
+                f"{mode} x{batch_size}",
+                lambda rpc, address, mode=mode, size=batch_size: BatchedPoolReader(
+                    rpc, address, mode=mode, batch_size=size, concurrency=args.concurrency)
+            ))
+
+    print(f"📦 Reading {args.pools} pools, {args.latency * 1000:.0f} ms per RPC request, concurrency {args.concurrency}")
+    print("=" * 60)
+    print(f"{'reader':<20}{'seconds':>10}{'requests':>10}{'speedup':>10}")
+    baseline = None
+    for name, make_reader in readers:
+        elapsed, trips = await measure(node, make_reader, args.pools)
+        baseline = baseline or elapsed
+        print(f"{name:<20}{elapsed:>10.3f}{trips:>10}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pools", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock node latency per HTTP request, seconds")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[25, 100])
+    parser.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Onboard a batch of goal messages the old way (one propose then one build_tx
+per goal, in sequence) and through the batch path, with a fake LLM of fixed
+latency, and compare wall time and LLM calls
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from abi_encoder import ABIEncoder
+from batch_propose import BatchProposer
+from fake_llm import FakeChatModel
+from langgraph_agent import DreamPoolReActAgent
+
+DEFAULT_CORPUS = "corpora/replay_conversations.json"
+
+
+def goal_messages(corpus_path: str, count: int):
+    """First turns of the replay corpus, repeated with a suffix so no two messages are identical"""
+    with open(corpus_path) as f:
+        openers = [conversation["turns"][0] for conversation in json.load(f)]
+    return [f"{openers[n % len(openers)]} (#{n})" for n in range(count)]
+
+
+async def sequential(messages, latency: float):
+    llm = FakeChatModel(latency=latency, call_tools=True)
+    agent = DreamPoolReActAgent(llm=llm)
+    encoder = ABIEncoder()
+    started = time.perf_counter()
+    for message in messages:
+        await encoder.encode_create_pool(await agent.parse_goal(message))
+    return time.perf_counter() - started, llm.calls
+
+
+async def batched(messages, latency: float, concurrency: int):
+    llm = FakeChatModel(latency=latency, call_tools=True)
+    proposer = BatchProposer(DreamPoolReActAgent(llm=llm), ABIEncoder(), concurrency=concurrency)
+    started = time.perf_counter()
+    items = [item async for item in proposer.run(messages, build_tx=True)]
+    rules = sum(item.get("resolved") == "rules" for item in items)
+    return time.perf_counter() - started, llm.calls, rules
+
+
+async def main(args):
+    messages = goal_messages(args.corpus, args.goals)
+    old_seconds, old_calls = await sequential(messages, args.latency)
+    new_seconds, new_calls, rules = await batched(messages, args.latency, args.concurrency)
+
+    print(f"📦 Batch proposal: {len(messages)} goals, LLM latency {args.latency * 1000:.0f} ms")
+    print("=" * 50)
+    print(f"Sequential propose + build_tx: {old_seconds:6.2f}s, {old_calls} LLM calls")
+    print(f"Batch (concurrency {args.concurrency}):      {new_seconds:6.2f}s, {new_calls} LLM calls")
+    print(f"Resolved by rules without the LLM: {rules}/{len(messages)}")
+    print(f"Speedup: {old_seconds / new_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--goals", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Measure the encode/decode cost of one /llm/chat/continue turn on long
+conversations: building the response payload and rendering it to JSON, and
+parsing the client-held state back into graph messages
+"""
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from bench_history import build_turn
+from json_codec import ENCODER, dumps, loads
+from langgraph_agent import DreamPoolReActAgent
+
+STATE = {"goal_description": "Studio recording session", "goal_amount_eth": 2.5, "deadline_days": 30,
+         "conversation_complete": True, "contract_payload": None}
+
+
+def encode_fastapi(agent, final_state) -> bytes:
+    """Returning the dict from the handler: jsonable_encoder, then the stdlib JSONResponse"""
+    payload = agent._turn_response(final_state, final_state["messages"])
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode()
+
+
+def encode_fast(agent, final_state) -> bytes:
+    """Returning FastJSONResponse: the payload goes straight to json_codec.dumps"""
+    return dumps(agent._turn_response(final_state, final_state["messages"]))
+
+
+def decode_stdlib(body: bytes):
+    return DreamPoolReActAgent._restore_state(json.loads(body)["state"], "next message")
+
+
+def decode_fast(body: bytes):
+    return DreamPoolReActAgent._restore_state(loads(body)["state"], "next message")
+
+
+def microseconds(fn, iterations: int, *args) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(*args)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    agent = DreamPoolReActAgent.__new__(DreamPoolReActAgent)  # the serializers need no LLM
+
+    print(f"📦 Per-turn encode/decode, µs (json_codec encoder: {ENCODER})")
+    print("=" * 50)
+    print(f"{'turns':>5} {'bytes':>8} {'encode old':>11} {'encode new':>11} {'decode old':>11} {'decode new':>11}")
+    for turns in args.turns:
+        messages = [message for turn in range(turns) for message in build_turn(turn)]
+        final_state = {**STATE, "messages": messages}
+        body = dumps({"state": agent._turn_response(final_state, messages), "message": "next message"})
+
+        print(f"{turns:>5} {len(body):>8} "
+              f"{microseconds(encode_fastapi, args.iterations, agent, final_state):>11.0f} "
+              f"{microseconds(encode_fast, args.iterations, agent, final_state):>11.0f} "
+              f"{microseconds(decode_stdlib, args.iterations, body):>11.0f} "
+              f"{microseconds(decode_fast, args.iterations, body):>11.0f}")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Offline load test of the DreamPool API: replays multi-turn conversation corpora
+through main.app over an in-process ASGI client, with a scriptable fake LLM in
+place of OpenAI, and reports latency percentiles, throughput, memory and LLM
+calls per conversation for each endpoint.
+
+    python benchmark.py --concurrency 20 --repeat 5 --latency 0.2 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import resource
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import httpx
+
+# main builds a ChatOpenAI at import; the fake model replaces it before any request
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+# Every simulated conversation comes from one client address; don't rate limit it
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+
+import main  # noqa: E402
+from fake_llm import FakeChatModel  # noqa: E402
+from langgraph_agent import DreamPoolReActAgent  # noqa: E402
+
+SCENARIOS = ("chat", "session", "propose")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class Recorder:
+    """Per-endpoint latencies and errors"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def post(self, client: httpx.AsyncClient, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        response = await client.post(path, json=body)
+        self.latencies[path].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            self.errors[path] += 1
+            return {}
+        return response.json()
+
+
+async def run_conversation(client, recorder: Recorder, scenario: str, turns: List[str]):
+    if scenario == "propose":
+        await recorder.post(client, "/llm/propose", {"message": " ".join(turns)})
+        return
+
+    if scenario == "chat":
+        state = await recorder.post(client, "/llm/chat/start", {"message": turns[0]})
+        for message in turns[1:]:
+            state = await recorder.post(client, "/llm/chat/continue", {"state": state, "message": message})
+        return
+
+    session = await recorder.post(client, "/llm/session/start", {"message": turns[0]})
+    for message in turns[1:]:
+        await recorder.post(client, "/llm/session/continue", {"session_id": session.get("session_id", ""), "message": message})
+
+
+async def run_scenario(scenario: str, corpus: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    llm = FakeChatModel(latency=(args.latency * 0.5, args.latency * 1.5), call_tools=True, seed=args.seed)
+    main.llm_agent.use(DreamPoolReActAgent(llm=llm, sessions=main.session_manager, admission=main.llm_admission))
+
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    conversations = [conversation["turns"] for conversation in corpus] * args.repeat
+
+    async def limited(client, turns):
+        async with semaphore:
+            await run_conversation(client, recorder, scenario, turns)
+
+    transport = httpx.ASGITransport(app=main.app)
+    tracemalloc.start()
+    started = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        await asyncio.gather(*[limited(client, turns) for turns in conversations])
+    wall_seconds = time.perf_counter() - started
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    endpoints = {}
+    for path, latencies in recorder.latencies.items():
+        endpoints[path] = {
+            "requests": len(latencies),
+            "errors": recorder.errors[path],
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "requests_per_sec": round(len(latencies) / wall_seconds, 2)
+        }
+
+    return {
+        "conversations": len(conversations),
+        "wall_seconds": round(wall_seconds, 3),
+        "llm_calls": llm.calls,
+        "llm_calls_per_conversation": round(llm.calls / len(conversations), 2),
+        "peak_traced_memory_mb": round(peak_bytes / 2**20, 2),
+        "endpoints": endpoints
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    with open(args.corpus) as f:
+        corpus = json.load(f)
+
+    results = {}
+    for scenario in args.scenarios:
+        results[scenario] = await run_scenario(scenario, corpus, args)
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_mb = max_rss / 2**20 if platform.system() == "Darwin" else max_rss / 2**10
+
+    return {
+        "config": {
+            "corpus": args.corpus,
+            "concurrency": args.concurrency,
+            "repeat": args.repeat,
+            "llm_latency_s": args.latency,
+            "seed": args.seed
+        },
+        "python": platform.python_version(),
+        "max_rss_mb": round(max_rss_mb, 1),
+        "scenarios": results
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    config = report["config"]
+    print("🏋️  DreamPool API benchmark")
+    print("=" * 78)
+    print(f"concurrency={config['concurrency']} repeat={config['repeat']} fake LLM latency≈{config['llm_latency_s']}s")
+    for scenario, result in report["scenarios"].items():
+        print(f"\n{scenario}: {result['conversations']} conversations in {result['wall_seconds']}s, "
+              f"{result['llm_calls_per_conversation']} LLM calls/conversation, "
+              f"peak {result['peak_traced_memory_mb']} MB traced")
+        print(f"  {'endpoint':<26}{'reqs':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+        for path, stats in result["endpoints"].items():
+            print(f"  {path:<26}{stats['requests']:>6}{stats['errors']:>5}{stats['p50_ms']:>10}"
+                  f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['requests_per_sec']:>9}")
+    print(f"\nmax RSS: {report['max_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default="corpora/replay_conversations.json")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="Replay the corpus this many times per scenario")
+    parser.add_argument("--latency", type=float, default=0.1, help="Mean fake LLM latency in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the results as JSON for comparing runs")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results written to {args.output}")
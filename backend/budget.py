@@ -0,0 +1,77 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+_current_budget: ContextVar[Optional["RequestBudget"]] = ContextVar("request_budget", default=None)
+
+
+class RequestBudget:
+    """Per-request limits on agent steps, tokens and wall-clock time, with the usage so far"""
+
+    def __init__(self, max_steps: Optional[int] = None, max_tokens: Optional[int] = None,
+                 timeout_seconds: Optional[float] = None):
+        self.max_steps = max_steps if max_steps is not None else int(os.getenv("AGENT_MAX_STEPS", "6"))
+        self.max_tokens = max_tokens if max_tokens is not None else int(os.getenv("AGENT_MAX_TOKENS", "12000"))
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else float(os.getenv("AGENT_TIMEOUT_SECONDS", "30"))
+
+        self.started_at = time.monotonic()
+        self.steps = 0
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        # Name of the first budget that ran out, if any
+        self.exhausted: Optional[str] = None
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def remaining_seconds(self) -> float:
+        return max(0.0, self.timeout_seconds - (time.monotonic() - self.started_at))
+
+    def check(self) -> Optional[str]:
+        """Return the exhausted budget ("steps", "tokens" or "time"), or None if the agent may continue"""
+        if self.exhausted is None:
+            if self.steps >= self.max_steps:
+                self.exhausted = "steps"
+            elif self.total_tokens >= self.max_tokens:
+                self.exhausted = "tokens"
+            elif self.remaining_seconds() <= 0:
+                self.exhausted = "time"
+        return self.exhausted
+
+    def record(self, response: Any):
+        """Account for one LLM response, using its token usage metadata when present"""
+        self.llm_calls += 1
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.prompt_tokens += usage.get("input_tokens", 0)
+        self.completion_tokens += usage.get("output_tokens", 0)
+
+    def usage(self) -> Dict[str, Any]:
+        return {
+            "agent_steps": self.steps,
+            "llm_calls": self.llm_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "elapsed_seconds": round(time.monotonic() - self.started_at, 3),
+            "budget_exhausted": self.exhausted
+        }
+
+
+@contextmanager
+def request_budget(budget: Optional[RequestBudget] = None) -> Iterator[RequestBudget]:
+    """Make a budget current for the graph run executed inside the block"""
+    budget = budget or RequestBudget()
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def current_budget() -> Optional[RequestBudget]:
+    """Budget of the request being served, if one was set"""
+    return _current_budget.get()
@@ -0,0 +1,122 @@
+"""
+Scriptable fake chat model for exercising the agent without an OpenAI API key
+"""
+import asyncio
+import random
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langgraph_agent import parse_deadline, parse_eth_amount
+
+# A script step: a reply string, an AIMessage-like dict ({"content", "tool_calls"})
+# or a callable building the response from the prompt messages
+ScriptStep = Union[str, dict, Callable[[List[Any]], AIMessage]]
+
+
+def _message_text(message: Any) -> str:
+    return str(message["content"] if isinstance(message, dict) else message.content)
+
+
+def _usage(messages: List[Any], response: AIMessage) -> dict:
+    """Token usage estimated at ~4 characters per token, like the real API would report"""
+    input_tokens = sum(len(_message_text(message)) for message in messages) // 4
+    output_tokens = max(1, len(str(response.content)) // 4)
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+class FakeStructuredModel:
+    """Structured-output view of a FakeChatModel, answering with a goal dict"""
+
+    def __init__(self, parent: "FakeChatModel"):
+        self.parent = parent
+
+    async def ainvoke(self, messages: List[Any], config: Optional[Any] = None, **kwargs) -> dict:
+        self.parent.calls += 1
+        await asyncio.sleep(self.parent.sample_latency())
+
+        text = _message_text(messages[-1])
+        deadline = parse_deadline(text)
+        return {
+            "title": text[:60],
+            "description": text,
+            "cost_eth": parse_eth_amount(text),
+            "deadline_days": deadline[0] if deadline else None,
+            "recipient": None
+        }
+
+
+class FakeChatModel:
+    """Stand-in for ChatOpenAI with configurable latency and scripted responses
+
+    latency is a fixed number of seconds or a (min, max) range sampled per call.
+    script is consumed one step per call and then repeats its last step; without
+    one the model replies with `reply`. With call_tools=True it instead behaves
+    like the concierge prompt asks: a user message is answered with extraction
+    tool calls, and the tool results with a conversational reply, i.e. two LLM
+    calls per turn.
+    """
+
+    def __init__(self, latency: Union[float, Tuple[float, float]] = 0.0,
+                 reply: str = "Great! How much ETH do you need, and by when?",
+                 call_tools: bool = False, script: Optional[Sequence[ScriptStep]] = None,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.reply = reply
+        self.call_tools = call_tools
+        self.script = list(script or [])
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        if isinstance(self.latency, (tuple, list)):
+            return self._random.uniform(*self.latency)
+        return self.latency
+
+    def bind_tools(self, tools: List[Any]) -> "FakeChatModel":
+        """Tool binding is a no-op for the fake model"""
+        return self
+
+    def with_structured_output(self, schema: Any, **kwargs) -> FakeStructuredModel:
+        """Structured output is answered from the regex parsers"""
+        return FakeStructuredModel(self)
+
+    async def ainvoke(self, messages: List[Any], config: Optional[Any] = None, **kwargs) -> AIMessage:
+        """Simulate a non-blocking LLM round-trip"""
+        self.calls += 1
+        await asyncio.sleep(self.sample_latency())
+
+        response = self._respond(messages)
+        response.usage_metadata = _usage(messages, response)
+        return response
+
+    def _respond(self, messages: List[Any]) -> AIMessage:
+        if self.script:
+            step = self.script[min(self.calls, len(self.script)) - 1]
+            if callable(step):
+                return step(messages)
+            if isinstance(step, dict):
+                return AIMessage(content=step.get("content", ""), tool_calls=[
+                    {**call, "id": call.get("id", f"call_{self.calls}_{index}")}
+                    for index, call in enumerate(step.get("tool_calls", []))
+                ])
+            return AIMessage(content=step)
+
+        last_message = messages[-1] if messages else None
+        if self.call_tools and isinstance(last_message, HumanMessage):
+            return AIMessage(content="", tool_calls=self._extraction_calls(str(last_message.content)))
+        return AIMessage(content=self.reply)
+
+    def _extraction_calls(self, text: str) -> List[dict]:
+        """Pick the extraction tools a well-behaved model would call for this text"""
+        calls = []
+        if parse_eth_amount(text) is not None:
+            calls.append({"name": "extract_eth_amount", "args": {"amount_text": text}})
+        if parse_deadline(text) is not None:
+            calls.append({"name": "extract_deadline", "args": {"deadline_text": text}})
+        if not calls:
+            calls.append({"name": "extract_goal_description", "args": {"user_message": text}})
+
+        for index, call in enumerate(calls):
+            call["id"] = f"call_{self.calls}_{index}"
+        return calls
@@ -0,0 +1,105 @@
+"""
+Local OpenAI-compatible chat completions server for transport tests and
+benchmarks: an ASGI app with scriptable latency and failures, reachable
+through httpx.ASGITransport or any ASGI server
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+
+class FakeOpenAIServer:
+    """Answers POST /v1/chat/completions with `reply`
+
+    latencies and failures are consumed one per request (the last latency
+    repeats); a failure is an HTTP status code, or "hang" to never answer.
+    """
+
+    def __init__(self, reply: str = "Great! How much ETH do you need, and by when?",
+                 latencies: Sequence[float] = (0.0,), failures: Optional[List[Union[int, str]]] = None,
+                 model: str = "gpt-4o-mini"):
+        self.reply = reply
+        self.latencies = list(latencies) or [0.0]
+        self.failures = list(failures or [])
+        self.model = model
+        self.requests = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.models: List[str] = []
+
+    def next_latency(self) -> float:
+        return self.latencies[min(self.requests, len(self.latencies)) - 1]
+
+    def completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        prompt_tokens = sum(len(str(message.get("content", ""))) // 4 + 1 for message in body.get("messages", []))
+        completion_tokens = len(self.reply) // 4 + 1
+        return {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", self.model),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": self.reply}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        }
+
+    def chunks(self, body: Dict[str, Any]) -> List[bytes]:
+        base = {"id": f"chatcmpl-{self.requests}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": body.get("model", self.model)}
+        words = self.reply.split(" ")
+        events = [
+            {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": word if i == 0 else " " + word},
+                                  "finish_reason": None}]}
+            for i, word in enumerate(words)
+        ]
+        events.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        return [f"data: {json.dumps(event)}\n\n".encode() for event in events] + [b"data: [DONE]\n\n"]
+
+    async def asgi_app(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        if scope["method"] != "POST" or not scope["path"].endswith("/chat/completions"):
+            await self._respond(send, 404, {"error": {"message": "Not found"}})
+            return
+
+        request = json.loads(body or b"{}")
+        self.requests += 1
+        self.models.append(request.get("model", ""))
+        failure = self.failures.pop(0) if self.failures else None
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if failure == "hang":
+                await asyncio.Event().wait()
+            await asyncio.sleep(self.next_latency())
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        if failure is not None:
+            await self._respond(send, int(failure), {"error": {"message": f"Fake failure {failure}", "type": "server_error"}})
+        elif request.get("stream"):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", b"text/event-stream")]})
+            for chunk in self.chunks(request):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        else:
+            await self._respond(send, 200, self.completion(request))
+
+    @staticmethod
+    async def _respond(send, status: int, payload: Dict[str, Any]):
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
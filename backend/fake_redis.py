@@ -0,0 +1,97 @@
+"""
+Local stand-in for a Redis server: the RESP subset RedisStateBackend uses
+(PING, AUTH, SELECT, GET, SET with PX/NX, PEXPIRE, DEL and the
+compare-and-delete EVAL script), served over TCP
+"""
+import asyncio
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from shared_state import DELETE_IF_EQUALS_SCRIPT
+
+
+class FakeRedisServer:
+    """In-memory RESP server on 127.0.0.1; `url` is set once started"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], str]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Set[asyncio.Task] = set()
+        self.url = ""
+        self.commands = 0
+
+    async def start(self) -> "FakeRedisServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"redis://127.0.0.1:{port}/0"
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for client in self._clients:
+                client.cancel()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self._server.wait_closed()
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[1] if entry else None
+
+    def _execute(self, name: str, args) -> bytes:
+        if name in ("PING",):
+            return b"+PONG\r\n"
+        if name in ("AUTH", "SELECT"):
+            return b"+OK\r\n"
+        if name == "GET":
+            value = self._live(args[0])
+            return b"$-1\r\n" if value is None else f"${len(value.encode())}\r\n".encode() + value.encode() + b"\r\n"
+        if name == "SET":
+            key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+            if "NX" in options and self._live(key) is not None:
+                return b"$-1\r\n"
+            expires_at = None
+            if "PX" in options:
+                expires_at = time.monotonic() + int(args[2 + options.index("PX") + 1]) / 1000
+            self._data[key] = (expires_at, value)
+            return b"+OK\r\n"
+        if name == "PEXPIRE":
+            value = self._live(args[0])
+            if value is None:
+                return b":0\r\n"
+            self._data[args[0]] = (time.monotonic() + int(args[1]) / 1000, value)
+            return b":1\r\n"
+        if name == "DEL":
+            removed = sum(1 for key in args if self._live(key) is not None and self._data.pop(key))
+            return f":{removed}\r\n".encode()
+        if name == "EVAL" and args[0] == DELETE_IF_EQUALS_SCRIPT:
+            key, value = args[2], args[3]
+            if self._live(key) != value:
+                return b":0\r\n"
+            del self._data[key]
+            return b":1\r\n"
+        return f"-ERR unknown command '{name}'\r\n".encode()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+                self.commands += 1
+                writer.write(self._execute(args[0].upper(), args[1:]))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
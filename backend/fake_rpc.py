@@ -0,0 +1,177 @@
+"""
+In-process stand-in for an Ethereum node serving the DreamPool contract, for
+exercising the pool indexer without a chain
+"""
+import asyncio
+import json
+from collections import Counter
+from typing import Any, Dict, List
+
+from abi_encoder import (
+    AGGREGATE3_SELECTOR, DEPOSIT_TOPIC, FINALIZED_TOPIC, GET_POOL_SELECTOR, MULTICALL3_ADDRESS,
+    POOL_COUNT_SELECTOR, POOL_CREATED_TOPIC, REFUNDED_TOPIC, decode_address, decode_uint256,
+    encode_address, encode_bytes, encode_dynamic_array, encode_uint256
+)
+from rpc_client import RPCError
+
+
+def _topic(value: int) -> str:
+    return "0x" + encode_uint256(value).hex()
+
+
+class FakePoolRPC:
+    """Answers eth_blockNumber, eth_call (poolCount, getPool, Multicall3 aggregate3)
+    and eth_getLogs from in-memory pools
+
+    Every state change mines a block and emits the matching contract event.
+    `calls` counts requests per method and `round_trips` HTTP-equivalent
+    requests (a batch is one); set `logs_supported=False` to make eth_getLogs
+    fail like a pruned node. `asgi_app` serves the same node over HTTP with
+    `latency` seconds per request, for use with httpx.ASGITransport.
+    """
+
+    def __init__(self, contract_address: str = "0x1234567890123456789012345678901234567890", latency: float = 0.0):
+        self.contract_address = contract_address.lower()
+        self.latency = latency
+        self.block = 1
+        self.pools: List[Dict[str, Any]] = []
+        self.logs: List[Dict[str, Any]] = []
+        self.calls: Counter = Counter()
+        self.round_trips = 0
+        self.logs_supported = True
+
+    def _emit(self, topic: str, pool_id: int):
+        self.block += 1
+        self.logs.append({
+            "address": self.contract_address,
+            "blockNumber": hex(self.block),
+            "topics": [topic, _topic(pool_id)],
+            "data": "0x"
+        })
+
+    def create_pool(self, creator: str, recipient: str, goal_wei: int, deadline: int) -> int:
+        self.pools.append({
+            "creator": creator, "recipient": recipient, "goal": goal_wei, "total": 0,
+            "deadline": deadline, "finalized": False, "failed": False
+        })
+        pool_id = len(self.pools)
+        self._emit(POOL_CREATED_TOPIC, pool_id)
+        return pool_id
+
+    def deposit(self, pool_id: int, amount_wei: int):
+        self.pools[pool_id - 1]["total"] += amount_wei
+        self._emit(DEPOSIT_TOPIC, pool_id)
+
+    def finalize(self, pool_id: int):
+        self.pools[pool_id - 1]["finalized"] = True
+        self._emit(FINALIZED_TOPIC, pool_id)
+
+    def fail(self, pool_id: int):
+        self.pools[pool_id - 1]["failed"] = True
+        self._emit(REFUNDED_TOPIC, pool_id)
+
+    def _encode_pool(self, pool_id: int) -> bytes:
+        if not 1 <= pool_id <= len(self.pools):
+            raise RPCError("execution reverted: no such pool", 3)
+        pool = self.pools[pool_id - 1]
+        return b"".join([
+            encode_address(pool["creator"]), encode_address(pool["recipient"]),
+            encode_uint256(pool["goal"]), encode_uint256(pool["total"]), encode_uint256(pool["deadline"]),
+            encode_uint256(int(pool["finalized"])), encode_uint256(int(pool["failed"]))
+        ])
+
+    def _execute(self, to: str, data: bytes) -> bytes:
+        if to.lower() == MULTICALL3_ADDRESS.lower() and data[:4] == AGGREGATE3_SELECTOR:
+            return self._aggregate3(data[4:])
+        if to.lower() != self.contract_address:
+            raise RPCError("execution reverted: no contract at address", 3)
+        if data[:4] == POOL_COUNT_SELECTOR:
+            return encode_uint256(len(self.pools))
+        if data[:4] == GET_POOL_SELECTOR:
+            return self._encode_pool(decode_uint256(data[4:]))
+        raise RPCError("execution reverted: unknown selector", 3)
+
+    def _aggregate3(self, args: bytes) -> bytes:
+        """Run each (target, allowFailure, callData) and encode the (success, returnData) results"""
+        array_start = decode_uint256(args[:32])
+        count = decode_uint256(args[array_start:array_start + 32])
+        heads = array_start + 32
+        results = []
+        for i in range(count):
+            start = heads + decode_uint256(args[heads + 32 * i:heads + 32 * i + 32])
+            target = decode_address(args[start:start + 32])
+            allow_failure = decode_uint256(args[start + 32:start + 64]) != 0
+            data_start = start + decode_uint256(args[start + 64:start + 96])
+            length = decode_uint256(args[data_start:data_start + 32])
+            try:
+                success, output = True, self._execute(target, args[data_start + 32:data_start + 32 + length])
+            except RPCError:
+                if not allow_failure:
+                    raise
+                success, output = False, b""
+            results.append(encode_uint256(int(success)) + encode_uint256(64) + encode_bytes(output))
+        return encode_uint256(32) + encode_dynamic_array(results)
+
+    def _eth_call(self, call: Dict[str, Any]) -> str:
+        return "0x" + self._execute(call["to"], bytes.fromhex(call["data"][2:])).hex()
+
+    def _get_logs(self, log_filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if not self.logs_supported:
+            raise RPCError("eth_getLogs is not available", -32601)
+        from_block, to_block = int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16)
+        topics = log_filter.get("topics", [None])[0]
+        return [
+            log for log in self.logs
+            if from_block <= int(log["blockNumber"], 16) <= to_block and (not topics or log["topics"][0] in topics)
+        ]
+
+    def _dispatch(self, method: str, params: List[Any]) -> Any:
+        self.calls[method] += 1
+        if method == "eth_blockNumber":
+            return hex(self.block)
+        if method == "eth_call":
+            return self._eth_call(params[0])
+        if method == "eth_getLogs":
+            return self._get_logs(params[0])
+        raise RPCError(f"Method not found: {method}", -32601)
+
+    async def call(self, method: str, params: List[Any]) -> Any:
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        return self._dispatch(method, params)
+
+    async def batch(self, calls: List[Any]) -> List[Any]:
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        results = []
+        for method, params in calls:
+            try:
+                results.append(self._dispatch(method, params))
+            except RPCError as e:
+                results.append(e)
+        return results
+
+    def _response(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": self._dispatch(request["method"], request.get("params", []))}
+        except RPCError as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": e.code, "message": str(e)}}
+
+    async def asgi_app(self, scope, receive, send):
+        """JSON-RPC over HTTP (single and batch requests)"""
+        body, more = b"", True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+        request = json.loads(body)
+        if isinstance(request, list):
+            payload = [self._response(item) for item in request]
+        else:
+            payload = self._response(request)
+
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
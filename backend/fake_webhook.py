@@ -0,0 +1,50 @@
+"""
+Local job callback receiver for tests: records every delivery and answers
+with scripted statuses. Pass it to JobManager as http_client directly, or
+serve asgi_app (e.g. with uvicorn) to receive real callbacks during development,
+with its host in JOB_CALLBACK_ALLOWED_HOSTS
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+class FakeWebhookReceiver:
+    """Answers each callback with the next status in `statuses` (then 200)"""
+
+    def __init__(self, statuses: Optional[List[int]] = None):
+        self.statuses = list(statuses or [])
+        self.deliveries: List[Dict[str, Any]] = []
+        self.attempts = 0
+
+    def _receive(self, url: str, body: bytes, headers: Dict[str, str]) -> int:
+        self.attempts += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status < 300:
+            self.deliveries.append({"url": url, "job": json.loads(body), "headers": headers})
+        return status
+
+    async def post(self, url: str, content: bytes = b"", headers: Optional[Dict[str, str]] = None) -> FakeResponse:
+        """The slice of httpx.AsyncClient that JobManager uses"""
+        return FakeResponse(self._receive(url, content, {k.lower(): v for k, v in (headers or {}).items()}))
+
+    async def aclose(self):
+        pass
+
+    async def asgi_app(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {key.decode().lower(): value.decode() for key, value in scope["headers"]}
+        status = self._receive(scope["path"], body, headers)
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b"{}"})
@@ -0,0 +1,58 @@
+import json
+from typing import Any, List
+
+from langchain_core.messages import AIMessage
+
+# Rough per-message overhead of the chat format, in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Default compaction limits; 0 disables a limit
+DEFAULT_MAX_MESSAGES = 12
+DEFAULT_MAX_TOKENS = 3000
+
+
+def estimate_tokens(message: Any) -> int:
+    """Cheap token estimate (~4 characters per token) for a message or system dict"""
+    content = message.get("content", "") if isinstance(message, dict) else message.content
+    chars = len(str(content))
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        chars += len(json.dumps([{"name": call["name"], "args": call["args"]} for call in tool_calls]))
+    return chars // 4 + MESSAGE_OVERHEAD_TOKENS
+
+
+def compact_history(messages: List[Any], max_messages: int = DEFAULT_MAX_MESSAGES,
+                    max_tokens: int = DEFAULT_MAX_TOKENS) -> List[Any]:
+    """Prompt view of the conversation with consumed tool traffic compacted
+
+    Roughly the last max_messages messages are kept verbatim: the window starts
+    at a user message so tool calls stay paired with their results, and the
+    current turn is always kept whole. Before that window only user messages and text
+    replies survive: tool calls and tool results are dropped, since the fields
+    they extracted are carried in the system prompt. If the prompt still
+    exceeds max_tokens, the oldest compacted messages are dropped.
+    """
+    human_indexes = [index for index, message in enumerate(messages) if message.type == "human"]
+    if not max_messages or not human_indexes or len(messages) <= max_messages:
+        window_start = 0
+    else:
+        # Start the window at a user message, never later than the current turn
+        candidate = len(messages) - max_messages
+        window_start = next((index for index in human_indexes if index >= candidate), human_indexes[-1])
+        window_start = min(window_start, human_indexes[-1])
+
+    older = []
+    for message in messages[:window_start]:
+        if message.type == "human":
+            older.append(message)
+        elif message.type == "ai" and message.content:
+            # Keep what the assistant said, not the tool calls it made
+            older.append(AIMessage(content=message.content) if message.tool_calls else message)
+
+    window = messages[window_start:]
+    if max_tokens:
+        total = sum(estimate_tokens(message) for message in older + window)
+        while older and total > max_tokens:
+            total -= estimate_tokens(older.pop(0))
+
+    return older + window
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import random
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from admission import AdmissionRejected
+from metrics import JOB_CALLBACKS, JOB_SECONDS, JOBS
+
+# A job kind's runner: takes the decoded request and returns a JSON-able result
+JobRunner = Callable[[Any], Awaitable[Dict[str, Any]]]
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class InvalidCallbackURL(ValueError):
+    """A callback URL is not http(s) or its host is not allowed"""
+
+
+class JobManager:
+    """Runs long agent requests in the background on a bounded pool of workers
+
+    Submitted jobs wait in a queue of at most JOB_MAX_QUEUE (beyond that they
+    are shed like any other overload) and JOB_WORKERS of them run at a time.
+    Each job's record, and then its result, is kept in the state backend for
+    JOB_TTL_SECONDS, so with a shared backend any worker can answer a poll. A
+    job with a callback URL is POSTed there when it finishes, signed with
+    JOB_CALLBACK_SECRET when one is set.
+    """
+
+    def __init__(self, state, workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None, timeout_seconds: Optional[float] = None,
+                 http_client=None):
+        self.state = state
+        self.workers = workers if workers is not None else int(os.getenv("JOB_WORKERS", "4"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("JOB_MAX_QUEUE", "100"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("JOB_TTL_SECONDS", "3600"))
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else float(os.getenv("JOB_TIMEOUT_SECONDS", "120"))
+        self.callback_retries = int(os.getenv("JOB_CALLBACK_RETRIES", "2"))
+        self.callback_timeout_seconds = float(os.getenv("JOB_CALLBACK_TIMEOUT_SECONDS", "10"))
+        self.callback_secret = os.getenv("JOB_CALLBACK_SECRET", "")
+        # Empty allows any host that resolves to public addresses only; set it to name
+        # the callback hosts outright (which may then be internal)
+        self.callback_hosts = {host.strip().lower() for host in os.getenv("JOB_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()}
+        self.http_client = http_client
+
+        self.runners: Dict[str, JobRunner] = {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.max_queue))
+        self._tasks: List[asyncio.Task] = []
+        self.running = 0
+        # Moving average of job run time, for Retry-After hints
+        self.avg_run_seconds = 5.0
+
+    @staticmethod
+    def key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def register(self, kind: str, runner: JobRunner):
+        self.runners[kind] = runner
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
+    async def check_callback_url(self, url: str):
+        """Reject callbacks that aren't http(s) or could reach internal services"""
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise InvalidCallbackURL("callback_url must be an http(s) URL")
+        host = parsed.hostname.lower()
+        if self.callback_hosts:
+            if host not in self.callback_hosts:
+                raise InvalidCallbackURL(f"callback_url host {parsed.hostname} is not allowed")
+            return
+
+        # Without an allowlist, anyone submitting a job picks where the server POSTs:
+        # keep that off loopback, private, link-local (cloud metadata) and reserved ranges
+        try:
+            addresses = await asyncio.get_running_loop().getaddrinfo(host, parsed.port or None, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            raise InvalidCallbackURL(f"callback_url host {parsed.hostname} cannot be resolved")
+        for *_, sockaddr in addresses:
+            address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+            if not address.is_global or address.is_multicast:
+                raise InvalidCallbackURL(f"callback_url host {parsed.hostname} resolves to a non-public address")
+
+    async def submit(self, kind: str, request: Any, callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a job and return its record; raises AdmissionRejected when the queue is full"""
+        if kind not in self.runners:
+            raise ValueError(f"kind must be one of {', '.join(sorted(self.runners))}")
+        if callback_url:
+            await self.check_callback_url(callback_url)
+        if self._queue.full():
+            JOBS.inc(kind=kind, status="rejected")
+            backlog = self._queue.qsize() + self.running
+            raise AdmissionRejected("job_queue_full", max(1, round(self.avg_run_seconds * backlog / max(1, self.workers))))
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "callback_url": callback_url or None,
+            "callback_status": None
+        }
+        await self._save(job)
+        self._queue.put_nowait((job, request))
+        JOBS.inc(kind=kind, status="queued")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        value = await self.state.get(self.key(job_id))
+        return json.loads(value) if value is not None else None
+
+    async def _save(self, job: Dict[str, Any]):
+        await self.state.set(self.key(job["job_id"]), json.dumps(job, default=str), self.ttl_seconds)
+
+    async def _worker(self):
+        while True:
+            job, request = await self._queue.get()
+            try:
+                await self._run(job, request)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any], request: Any):
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        await self._save(job)
+        self.running += 1
+        started = time.perf_counter()
+        try:
+            job["result"] = await asyncio.wait_for(self.runners[job["kind"]](request), self.timeout_seconds)
+            job["status"] = "succeeded"
+        except asyncio.CancelledError:
+            job["status"], job["error"] = "failed", "Job was interrupted by a shutdown"
+            raise
+        except asyncio.TimeoutError:
+            job["status"], job["error"] = "failed", f"Job timed out after {self.timeout_seconds}s"
+        except Exception as e:
+            job["status"], job["error"] = "failed", f"Failed to run job: {str(e)}"
+        finally:
+            self.running -= 1
+            elapsed = time.perf_counter() - started
+            self.avg_run_seconds = 0.9 * self.avg_run_seconds + 0.1 * elapsed
+            JOB_SECONDS.observe(elapsed, kind=job["kind"])
+            JOBS.inc(kind=job["kind"], status=job["status"])
+            job["finished_at"] = time.time()
+            await asyncio.shield(self._save(job))
+
+        if job["callback_url"]:
+            job["callback_status"] = await self._deliver(job)
+            await self._save(job)
+
+    def signature(self, body: bytes) -> str:
+        return "sha256=" + hmac.new(self.callback_secret.encode(), body, hashlib.sha256).hexdigest()
+
+    async def _deliver(self, job: Dict[str, Any]) -> str:
+        """POST the finished job to its callback URL, retrying failures; returns delivered, failed or rejected"""
+        # Checked again here: the host's DNS may have changed since the job was submitted
+        try:
+            await self.check_callback_url(job["callback_url"])
+        except InvalidCallbackURL:
+            JOB_CALLBACKS.inc(outcome="rejected")
+            return "rejected"
+
+        body = json.dumps(job, default=str).encode()
+        headers = {"Content-Type": "application/json", "X-DreamPool-Job": job["job_id"]}
+        if self.callback_secret:
+            headers["X-DreamPool-Signature"] = self.signature(body)
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(timeout=self.callback_timeout_seconds)
+
+        for attempt in range(self.callback_retries + 1):
+            try:
+                response = await self.http_client.post(job["callback_url"], content=body, headers=headers)
+                if response.status_code < 300:
+                    JOB_CALLBACKS.inc(outcome="delivered")
+                    return "delivered"
+                # The receiver rejected the payload itself; retrying won't change that
+                if 400 <= response.status_code < 500 and response.status_code not in (408, 429):
+                    break
+            except Exception:
+                pass
+            if attempt < self.callback_retries:
+                await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+        JOB_CALLBACKS.inc(outcome="failed")
+        return "failed"
@@ -0,0 +1,51 @@
+"""
+JSON encoding for API payloads: orjson when installed, the stdlib otherwise
+"""
+import json
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder gives the same JSON
+    orjson = None
+
+ENCODER = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    """Encode our schema records, and anything else (datetimes, Decimals) as a string"""
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. wei amounts above 64 bits, which only the stdlib encodes
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_str(value: Any) -> str:
+    return dumps(value).decode()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with dumps()
+
+    Handlers that return this directly also skip FastAPI's jsonable_encoder
+    pass over the payload, which dominates on long conversations.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
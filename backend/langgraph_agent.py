@@ -1,19 +1,37 @@
 import os
-from typing import Dict, Any, Optional, List, TypedDict, Annotated
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, Optional, List, Tuple, TypedDict, Annotated, AsyncIterator, Awaitable, Callable
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
 from langchain_core.tools import tool
+from langchain_core.runnables import RunnableConfig
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from langgraph.graph.message import add_messages
-from schemas import ProposedGoal
+from schemas import PROPOSE_ENGINES, ConversationMessage, ProposedGoal
+from budget import RequestBudget, current_budget, request_budget
+from history import DEFAULT_MAX_MESSAGES, DEFAULT_MAX_TOKENS, compact_history
+from llm_cache import CachedChatModel, create_llm_cache, hash_tool_schemas, is_cached_response
+from admission import AdmissionRejected, LLMAdmission
+from llm_transport import CircuitBreaker, LLMUnavailable, ResilientChatModel, create_chat_model
+from model_router import ModelRouter
+from tool_executor import ToolExecutor, ToolOutcome
+from session_store import SessionManager
+from shared_state import InMemoryStateBackend
+from metrics import (AGENT_NODE_ERRORS, AGENT_NODE_SECONDS, LLM_CALL_SECONDS, LLM_CALLS, LLM_TOKENS,
+                     SERIALIZE_SECONDS, timed)
+import asyncio
+import inspect
 import json
 from datetime import datetime, timedelta
 import re
+import uuid
 
 # Hardcoded recipient for now
 HARDCODED_RECIPIENT = "0xC895f03A4982E39bE52Bc686432724583aAF2d8D"
 
+# State fields pushed to streaming clients as soon as a tools step changes them
+STREAMED_STATE_FIELDS = ("goal_description", "goal_amount_eth", "deadline_days", "contract_payload", "conversation_complete")
+STATE_NODES = ("extract", "tools", "finalize")
+
 
 class AgentState(TypedDict):
     """State for the LangGraph agent"""
@@ -26,86 +44,66 @@ class AgentState(TypedDict):
     contract_payload: Optional[Dict[str, Any]]
 
 
-# Standalone tool functions
-@tool
-def extract_goal_description(user_message: str) -> str:
-    """Extract and store the goal description from user message. Use this tool whenever a user provides their goal or describes what they want to achieve."""
-    return f"Goal description extracted: {user_message}"
+# Parser patterns, compiled once per process
+ETH_PATTERNS = [
+    re.compile(r'(\d+\.?\d*)\s*eth'),
+    re.compile(r'(\d+\.?\d*)\s*ether'),
+    re.compile(r'^(\d+\.?\d*)$')
+]
 
+# Look for patterns like "30 days", "2 weeks", "1 month"
+DAY_PATTERNS = [re.compile(r'(\d+)\s*days?\b'), re.compile(r'(\d+)\s*d\b')]
+WEEK_PATTERNS = [re.compile(r'(\d+)\s*weeks?\b'), re.compile(r'(\d+)\s*w\b')]
+MONTH_PATTERNS = [re.compile(r'(\d+)\s*months?\b'), re.compile(r'(\d+)\s*m\b')]
+DEADLINE_PATTERNS = ((DAY_PATTERNS, "days", 1), (WEEK_PATTERNS, "weeks", 7), (MONTH_PATTERNS, "months", 30))
 
-@tool
-def extract_eth_amount(amount_text: str) -> str:
-    """Extract ETH amount from text and convert to Wei. Use this tool whenever a user mentions an ETH amount they need."""
-    patterns = [
-        r'(\d+\.?\d*)\s*eth',
-        r'(\d+\.?\d*)\s*ether',
-        r'^(\d+\.?\d*)$'
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, amount_text.lower())
+
+# Deterministic parsers shared by the tools and the fast-path extractor
+def parse_eth_amount(text: str) -> Optional[float]:
+    """Return the ETH amount mentioned in text, if any"""
+    text_lower = text.strip().lower()
+    for pattern in ETH_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             try:
-                amount_eth = float(match.group(1))
-                amount_wei = int(amount_eth * 10**18)
-                return f"Extracted {amount_eth} ETH ({amount_wei:,} Wei)"
+                return float(match.group(1))
             except ValueError:
                 continue
-    return "Could not extract ETH amount. Please provide a clear amount (e.g., '2.5 ETH')"
+    return None
 
 
-@tool
-def extract_deadline(deadline_text: str) -> str:
-    """Extract deadline in days from text. Use this tool whenever a user mentions a time period or deadline."""
-    text_lower = deadline_text.lower()
+def parse_deadline(text: str) -> Optional[tuple]:
+    """Return (days, number, unit) for a deadline mentioned in text, if any"""
+    text_lower = text.lower()
 
-    # Look for patterns like "30 days", "2 weeks", "1 month"
-    day_patterns = [r'(\d+)\s*days?', r'(\d+)\s*d']
-    week_patterns = [r'(\d+)\s*weeks?', r'(\d+)\s*w']
-    month_patterns = [r'(\d+)\s*months?', r'(\d+)\s*m']
+    for patterns, unit, multiplier in DEADLINE_PATTERNS:
+        for pattern in patterns:
+            match = pattern.search(text_lower)
+            if match:
+                number = int(match.group(1))
+                return number * multiplier, number, unit
+    return None
 
-    for pattern in day_patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            days = int(match.group(1))
-            return f"Extracted deadline: {days} days"
-
-    for pattern in week_patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            days = int(match.group(1)) * 7
-            return f"Extracted deadline: {days} days ({match.group(1)} weeks)"
 
-    for pattern in month_patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            days = int(match.group(1)) * 30
-            return f"Extracted deadline: {days} days ({match.group(1)} months)"
-
-    return "Could not extract deadline. Please specify in days, weeks, or months"
-
-
-@tool
-def validate_ethereum_address(address: str) -> str:
-    """Validate Ethereum address format. Use this tool to validate any Ethereum address provided by the user."""
+def parse_ethereum_address(address: str) -> Optional[str]:
+    """Return an error message for an invalid Ethereum address, or None if it is valid"""
     if not address.startswith('0x'):
-        return "Invalid address: must start with 0x"
+        return "must start with 0x"
     if len(address) != 42:
-        return "Invalid address: must be 42 characters long"
+        return "must be 42 characters long"
     try:
         int(address[2:], 16)
-        return f"Valid Ethereum address: {address}"
+        return None
     except ValueError:
-        return "Invalid address: contains non-hex characters"
+        return "contains non-hex characters"
 
 
-@tool
-def prepare_contract_payload(goal_description: str, amount_eth: float, deadline_days: int) -> str:
-    """Prepare the contract payload with all goal information. Use this tool ONLY when all required information has been collected and conversation is complete."""
+def build_contract_payload(goal_description: str, amount_eth: float, deadline_days: int) -> Dict[str, Any]:
+    """Build the contract payload for a fully specified goal"""
     amount_wei = int(amount_eth * 10**18)
     deadline_timestamp = int((datetime.now() + timedelta(days=deadline_days)).timestamp())
-    
-    payload = {
+
+    return {
         "goal_description": goal_description,
         "goal_amount_wei": amount_wei,
         "goal_amount_eth": amount_eth,
@@ -114,15 +112,60 @@ def prepare_contract_payload(goal_description: str, amount_eth: float, deadline_
         "recipient_address": HARDCODED_RECIPIENT,
         "created_at": datetime.now().isoformat()
     }
-    
-    return f"Contract payload prepared: {json.dumps(payload, indent=2)}"
+
+
+# Standalone tool functions; each returns the text the LLM sees and the state fields it sets
+@tool
+def extract_goal_description(user_message: str) -> ToolOutcome:
+    """Extract and store the goal description from user message. Use this tool whenever a user provides their goal or describes what they want to achieve."""
+    return ToolOutcome(f"Goal description extracted: {user_message}", {"goal_description": user_message})
+
+
+@tool
+def extract_eth_amount(amount_text: str) -> ToolOutcome:
+    """Extract ETH amount from text and convert to Wei. Use this tool whenever a user mentions an ETH amount they need."""
+    amount_eth = parse_eth_amount(amount_text)
+    if amount_eth is not None:
+        amount_wei = int(amount_eth * 10**18)
+        return ToolOutcome(f"Extracted {amount_eth} ETH ({amount_wei:,} Wei)", {"goal_amount_eth": amount_eth})
+    return ToolOutcome("Could not extract ETH amount. Please provide a clear amount (e.g., '2.5 ETH')")
+
+
+@tool
+def extract_deadline(deadline_text: str) -> ToolOutcome:
+    """Extract deadline in days from text. Use this tool whenever a user mentions a time period or deadline."""
+    deadline = parse_deadline(deadline_text)
+    if deadline is None:
+        return ToolOutcome("Could not extract deadline. Please specify in days, weeks, or months")
+
+    days, number, unit = deadline
+    if unit == "days":
+        return ToolOutcome(f"Extracted deadline: {days} days", {"deadline_days": days})
+    return ToolOutcome(f"Extracted deadline: {days} days ({number} {unit})", {"deadline_days": days})
+
+
+@tool
+def validate_ethereum_address(address: str) -> ToolOutcome:
+    """Validate Ethereum address format. Use this tool to validate any Ethereum address provided by the user."""
+    error = parse_ethereum_address(address)
+    if error:
+        return ToolOutcome(f"Invalid address: {error}")
+    return ToolOutcome(f"Valid Ethereum address: {address}", {"recipient_address": address})
+
+
+@tool
+def prepare_contract_payload(goal_description: str, amount_eth: float, deadline_days: int) -> ToolOutcome:
+    """Prepare the contract payload with all goal information. Use this tool ONLY when all required information has been collected and conversation is complete."""
+    payload = build_contract_payload(goal_description, amount_eth, deadline_days)
+    return ToolOutcome(f"Contract payload prepared: {json.dumps(payload, indent=2)}",
+                       {"contract_payload": payload, "conversation_complete": True})
 
 
 @tool
-def check_conversation_complete(goal_description: str, amount_eth: float, deadline_days: int) -> str:
+def check_conversation_complete(goal_description: str, amount_eth: float, deadline_days: int) -> ToolOutcome:
     """Check if all required information has been collected. Use this tool to determine if you have all needed information before proceeding."""
     if goal_description and amount_eth and deadline_days:
-        return "Conversation complete! All required information collected."
+        return ToolOutcome("Conversation complete! All required information collected.")
     else:
         missing = []
         if not goal_description:
@@ -131,21 +174,318 @@ def check_conversation_complete(goal_description: str, amount_eth: float, deadli
             missing.append("ETH amount")
         if not deadline_days:
             missing.append("deadline")
-        return f"Still missing: {', '.join(missing)}"
+        return ToolOutcome(f"Still missing: {', '.join(missing)}")
+
+
+# Fast path: words that carry no goal content on their own
+ADDRESS_PATTERN = re.compile(r'\b0x[0-9a-fA-F]{40}\b')
+WORD_PATTERN = re.compile(r"[a-z']+")
+FILLER_WORDS = {
+    "a", "an", "the", "i", "i'd", "i'm", "me", "my", "it", "to", "for", "in", "on", "of", "by", "and", "or",
+    "with", "within", "about", "around", "need", "want", "would", "like", "please", "hello", "hi", "hey",
+    "eth", "ether", "day", "days", "week", "weeks", "month", "months", "d", "w", "m", "next", "from", "now",
+    "raise", "money", "funds", "funding", "pool", "create", "goal", "so", "that", "this", "is", "be",
+}
+
+FAST_PATH_SUMMARY = """Perfect! Here's a summary of your pool:
+
+🎯 **Goal**: {goal_description}
+💰 **Amount**: {goal_amount_eth} ETH
+⏰ **Deadline**: {deadline_days} days
+
+Your pool is ready to be created!"""
+
+
+def extract_goal_fields(message: str, state: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the deterministic parsers over a raw user message and return the fields they found"""
+    fields = {}
+
+    address = ADDRESS_PATTERN.search(message)
+    if address and parse_ethereum_address(address.group(0)) is None:
+        fields["recipient_address"] = address.group(0)
+
+    # Hex digits in an address must not be read as amounts or deadlines
+    text = ADDRESS_PATTERN.sub(" ", message)
+
+    amount_eth = parse_eth_amount(text)
+    if amount_eth:
+        fields["goal_amount_eth"] = amount_eth
+
+    deadline = parse_deadline(text)
+    if deadline and deadline[0] > 0:
+        fields["deadline_days"] = deadline[0]
+
+    # Goal descriptions have no reliable pattern, so the message is only taken as
+    # the description when it carries content words and either states specifics
+    # alongside them or is the last missing piece
+    if not state.get("goal_description"):
+        content_words = [word for word in WORD_PATTERN.findall(text.lower()) if word not in FILLER_WORDS]
+        others_known = state.get("goal_amount_eth") and state.get("deadline_days")
+        if len(content_words) >= 2 and (fields.get("goal_amount_eth") or fields.get("deadline_days") or others_known):
+            fields["goal_description"] = message.strip()
+
+    return fields
+
+
+def rule_tool_calls(message: str, state: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float]:
+    """Pick the extraction tool calls the parsers can vouch for, with a confidence between 0 and 1
+
+    Structured matches (amount, deadline, address) are trusted, and so is the rest
+    of the message as the goal description alongside them. A description on its
+    own may be small talk ("sure sounds good"), so it scores below the default
+    ROUTER_MIN_CONFIDENCE and the chat model decides; questions are left to it too.
+    """
+    text = ADDRESS_PATTERN.sub(" ", message)
+    amount_eth = parse_eth_amount(text)
+    deadline = parse_deadline(text)
+    address = ADDRESS_PATTERN.search(message)
+
+    calls = []
+    if amount_eth and amount_eth != state.get("goal_amount_eth"):
+        calls.append(("extract_eth_amount", {"amount_text": text}))
+    if deadline and deadline[0] > 0 and deadline[0] != state.get("deadline_days"):
+        calls.append(("extract_deadline", {"deadline_text": text}))
+    if address and address.group(0) != state.get("recipient_address"):
+        calls.append(("validate_ethereum_address", {"address": address.group(0)}))
+    confidence = 0.9 if calls else 0.0
+
+    description = state.get("goal_description")
+    content_words = [word for word in WORD_PATTERN.findall(text.lower()) if word not in FILLER_WORDS]
+    if not description and len(content_words) >= 2:
+        description = message.strip()
+        calls.append(("extract_goal_description", {"user_message": description}))
+        confidence = confidence or 0.5
+
+    goal_amount_eth = amount_eth or state.get("goal_amount_eth")
+    deadline_days = deadline[0] if deadline and deadline[0] > 0 else state.get("deadline_days")
+    if description and goal_amount_eth and deadline_days:
+        calls.append(("prepare_contract_payload", {"goal_description": description,
+                                                   "amount_eth": goal_amount_eth, "deadline_days": deadline_days}))
+    elif not calls and (amount_eth or deadline):
+        # The fast path already stored what this message says; report what is still missing
+        calls.append(("check_conversation_complete", {"goal_description": description or "",
+                                                      "amount_eth": goal_amount_eth or 0.0,
+                                                      "deadline_days": deadline_days or 0}))
+        confidence = 0.8
+
+    if "?" in message:
+        confidence = min(confidence, 0.3)
+    return [{"name": name, "args": args, "id": f"call_rules_{uuid.uuid4().hex[:12]}", "type": "tool_call"}
+            for name, args in calls], confidence
+
+
+# Single-call structured-output engine for parse_goal
+MAX_DEADLINE_DAYS = 3650
+
+PROPOSED_GOAL_SCHEMA = {
+    "title": "ProposedGoal",
+    "description": "A crowdfunding goal extracted from the user's message",
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "description": "Short title for the goal, at most 60 characters"},
+        "description": {"type": "string", "description": "One or two sentences describing the goal"},
+        "cost_eth": {"type": ["number", "null"], "description": "Amount of ETH needed, null if not stated"},
+        "deadline_days": {"type": ["integer", "null"], "description": "Days until the funds are needed, null if not stated"},
+        "recipient": {"type": ["string", "null"], "description": "Recipient Ethereum address (0x...), null if not stated"}
+    },
+    "required": ["title", "description", "cost_eth", "deadline_days", "recipient"],
+    "additionalProperties": False
+}
+
+STRUCTURED_GOAL_PROMPT = """You extract DreamPool funding goals from user messages.
+Convert weeks to 7 days and months to 30 days. Never invent an amount, deadline or address:
+use null when the user did not state it."""
+
+
+def validate_proposed_goal(data: Dict[str, Any], message: str) -> ProposedGoal:
+    """Validate structured LLM output locally, falling back to the regex parsers and defaults"""
+    cost_eth = data.get("cost_eth")
+    if not isinstance(cost_eth, (int, float)) or isinstance(cost_eth, bool) or cost_eth <= 0:
+        cost_eth = parse_eth_amount(message) or 1.0
+
+    deadline_days = data.get("deadline_days")
+    if not isinstance(deadline_days, int) or isinstance(deadline_days, bool) or not 0 < deadline_days <= MAX_DEADLINE_DAYS:
+        deadline = parse_deadline(message)
+        deadline_days = deadline[0] if deadline and 0 < deadline[0] <= MAX_DEADLINE_DAYS else 30
+
+    recipient = data.get("recipient")
+    if not isinstance(recipient, str) or parse_ethereum_address(recipient) is not None:
+        recipient = HARDCODED_RECIPIENT
+
+    description = str(data.get("description") or "").strip() or message
+    title = str(data.get("title") or "").strip()[:100] or description[:50]
+
+    return ProposedGoal(
+        title=title,
+        cost_eth=float(cost_eth),
+        deadline_days=deadline_days,
+        recipient=recipient,
+        description=description
+    )
+
+
+def rule_proposed_goal(message: str) -> Optional[ProposedGoal]:
+    """The goal the parsers alone can read from one message, or None when it needs the LLM
+
+    Resolves only what the fast path would: a description with a stated amount
+    and deadline, shaped like the react engine's answer for the same message.
+    """
+    if "?" in message:
+        return None
+    fields = extract_goal_fields(message, {})
+    if not (fields.get("goal_description") and fields.get("goal_amount_eth") and fields.get("deadline_days")):
+        return None
+    if fields["deadline_days"] > MAX_DEADLINE_DAYS:
+        return None
+    return validate_proposed_goal({
+        "title": fields["goal_description"],
+        "description": fields["goal_description"],
+        "cost_eth": fields["goal_amount_eth"],
+        "deadline_days": fields["deadline_days"],
+        "recipient": fields.get("recipient_address")
+    }, message)
+
+
+# System prompt for the agent step: only the state block changes per call
+SYSTEM_PROMPT_HEAD = """You are a DreamPool concierge helping users create funding pools for their goals.
+
+Your task is to collect the following information:
+1. Goal description (what they want to achieve)
+2. ETH amount needed (how much they need to raise)
+3. Deadline in days (when they need the funds)
+
+You have access to tools to extract and validate this information. You MUST use the tools to process user input and extract the required data.
+
+CONVERSATION FLOW:
+1. When you receive a user message, FIRST use the extraction tools to parse the information
+2. Use extract_goal_description for the user's goal
+3. Use extract_eth_amount for any ETH amounts mentioned
+4. Use extract_deadline for any time periods mentioned
+5. Use check_conversation_complete to see if you have all required information
+6. If all information is collected, use prepare_contract_payload
+7. Only respond conversationally after using the appropriate tools
+
+Fields shown below were already extracted for you - don't extract them again.
+
+"""
+
+SYSTEM_PROMPT_STATE = """Current state:
+- Goal description: {goal_description}
+- ETH amount: {goal_amount_eth}
+- Deadline: {deadline_days}
+- Conversation complete: {conversation_complete}"""
+
+SYSTEM_PROMPT_TAIL = """
+
+ALWAYS use tools first to extract information from user messages, then provide a friendly response."""
+
+
+def render_system_prompt(state: Dict[str, Any]) -> str:
+    """Render the agent system prompt for the current state"""
+    return SYSTEM_PROMPT_HEAD + SYSTEM_PROMPT_STATE.format(
+        goal_description=state.get("goal_description", "Not provided"),
+        goal_amount_eth=state.get("goal_amount_eth", "Not provided"),
+        deadline_days=state.get("deadline_days", "Not provided"),
+        conversation_complete=state.get("conversation_complete", False)
+    ) + SYSTEM_PROMPT_TAIL
+
+
+def best_effort_reply(state: Dict[str, Any]) -> str:
+    """Reply built from the collected fields when the agent budget is exhausted"""
+    collected = []
+    missing = []
+    for field, label, unit in (("goal_description", "Goal", ""), ("goal_amount_eth", "Amount", " ETH"),
+                               ("deadline_days", "Deadline", " days")):
+        if state.get(field):
+            collected.append(f"- {label}: {state[field]}{unit}")
+        else:
+            missing.append(label.lower())
+
+    reply = "Here's what I have so far:\n" + "\n".join(collected) if collected else "Let's set up your pool."
+    if missing:
+        reply += f"\n\nCould you tell me the {', '.join(missing)}?"
+    return reply
 
 
 class DreamPoolReActAgent:
     """LangGraph ReAct agent for DreamPool goal creation"""
     
-    def __init__(self):
-        # Initialize the LLM
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.7,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+    def __init__(self, llm=None, sessions=None, fast_path: Optional[bool] = None, llm_cache=None,
+                 admission: Optional[LLMAdmission] = None, extraction_llm=None, routing_policy: Optional[str] = None):
+        # Initialize the LLM (an injected chat model is used as-is, e.g. in tests)
+        self.llm = llm or create_chat_model()
         
-        # Create the graph
+        # Tool schemas, the tool executor and the LLM bindings are static per
+        # process, so build them once instead of on every graph step
+        self.tools = self._get_tools()
+        self.tool_executor = ToolExecutor(self.tools)
+        # Calls are timed out, retried, hedged and short-circuited by one breaker
+        # shared by both bindings; every attempt and hedge waits for an admission
+        # slot, and cache hits below never take one
+        self.admission = admission if admission is not None else LLMAdmission()
+        self.breaker = CircuitBreaker()
+        self.bound_llm = ResilientChatModel(self.llm.bind_tools(self.tools), self.breaker, admission=self.admission)
+
+        # Server-side sessions (see session_store.py); their state is loaded
+        # before and saved after each turn, so the graph itself is stateless
+        self.sessions = sessions if sessions is not None else SessionManager(InMemoryStateBackend())
+
+        # Repeated prompts (e.g. identical opening messages) are served from the cache
+        self.llm_cache = llm_cache if llm_cache is not None else create_llm_cache(self.sessions.state)
+        if self.llm_cache is not None:
+            self.bound_llm = CachedChatModel(
+                self.bound_llm,
+                self.llm_cache,
+                tools_hash=hash_tool_schemas([convert_to_openai_tool(t) for t in self.tools]),
+                params={
+                    "model": getattr(self.llm, "model_name", None),
+                    "temperature": getattr(self.llm, "temperature", None)
+                }
+            )
+
+        # Tool-selection steps go to the rules or a cheap extraction model when
+        # confident; replies and low-confidence steps go to the chat model
+        if extraction_llm is None and os.getenv("ROUTER_EXTRACTION_MODEL"):
+            extraction_llm = create_chat_model(model=os.getenv("ROUTER_EXTRACTION_MODEL"), temperature=0,
+                                               base_url=os.getenv("ROUTER_EXTRACTION_BASE_URL") or None)
+        self.extraction_llm = extraction_llm
+        extraction_bound = None
+        if extraction_llm is not None:
+            # Its own breaker: a local model going down must not short-circuit the chat model
+            extraction_bound = ResilientChatModel(extraction_llm.bind_tools(self.tools), CircuitBreaker(),
+                                                  admission=self.admission)
+            if self.llm_cache is not None:
+                # Keyed apart from the chat model even when the model name matches: an
+                # extraction answer that escalated must not come back as a chat reply
+                extraction_bound = CachedChatModel(
+                    extraction_bound,
+                    self.llm_cache,
+                    tools_hash=hash_tool_schemas([convert_to_openai_tool(t) for t in self.tools]),
+                    params={
+                        "route": "extraction",
+                        "model": getattr(extraction_llm, "model_name", None),
+                        "temperature": getattr(extraction_llm, "temperature", None),
+                        "base_url": getattr(extraction_llm, "openai_api_base", None)
+                    }
+                )
+        self.router = ModelRouter(self.bound_llm, extraction_bound, rules=rule_tool_calls,
+                                  policy=routing_policy, escalate_on=(LLMUnavailable,))
+
+        self.structured_llm = ResilientChatModel(
+            self.llm.with_structured_output(PROPOSED_GOAL_SCHEMA, method="json_schema"), self.breaker,
+            admission=self.admission
+        )
+
+        # Prompt history compaction limits (0 disables a limit)
+        self.history_max_messages = int(os.getenv("HISTORY_MAX_MESSAGES", str(DEFAULT_MAX_MESSAGES)))
+        self.history_max_tokens = int(os.getenv("HISTORY_MAX_TOKENS", str(DEFAULT_MAX_TOKENS)))
+
+        # Deterministic extraction before the LLM; turns it fully resolves skip the LLM
+        if fast_path is None:
+            fast_path = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+        self.fast_path = fast_path
+        self.fast_path_stats = {"turns": 0, "prefilled": 0, "resolved": 0}
+
         self.graph = self._create_graph()
     
     def _create_graph(self) -> StateGraph:
@@ -153,11 +493,22 @@ class DreamPoolReActAgent:
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("agent", self._call_agent)
-        workflow.add_node("tools", self._process_tools)
+        workflow.add_node("extract", self._instrumented("extract", self._extract_fields))
+        workflow.add_node("finalize", self._instrumented("finalize", self._finalize_goal))
+        workflow.add_node("agent", self._instrumented("agent", self._call_agent))
+        workflow.add_node("tools", self._instrumented("tools", self._process_tools))
         
         # Add edges
-        workflow.set_entry_point("agent")
+        workflow.set_entry_point("extract")
+        workflow.add_conditional_edges(
+            "extract",
+            self._route_after_extract,
+            {
+                "finalize": "finalize",
+                "agent": "agent"
+            }
+        )
+        workflow.add_edge("finalize", END)
         workflow.add_conditional_edges(
             "agent",
             self._should_continue,
@@ -170,58 +521,64 @@ class DreamPoolReActAgent:
         
         return workflow.compile()
     
-    def _process_tools(self, state: AgentState) -> AgentState:
-        """Process tool calls, execute tools, and extract values to update state"""
+    @staticmethod
+    def _instrumented(name: str, node):
+        """Wrap a graph node with latency and error metrics"""
+        accepts_config = "config" in inspect.signature(node).parameters
+
+        async def run(state: AgentState, config: RunnableConfig) -> AgentState:
+            try:
+                with timed(AGENT_NODE_SECONDS, name, node=name):
+                    return await (node(state, config) if accepts_config else node(state))
+            except Exception:
+                AGENT_NODE_ERRORS.inc(node=name)
+                raise
+
+        return run
+
+    async def _extract_fields(self, state: AgentState) -> AgentState:
+        """Fill state fields straight from the latest user message with the regex parsers"""
+        last_message = state["messages"][-1]
+        if not self.fast_path or state.get("conversation_complete") or not isinstance(last_message, HumanMessage):
+            return {}
+
+        fields = extract_goal_fields(str(last_message.content), state)
+        self.fast_path_stats["turns"] += 1
+        if fields:
+            self.fast_path_stats["prefilled"] += 1
+        return fields
+
+    def _route_after_extract(self, state: AgentState) -> str:
+        """Skip the LLM when the parsers already completed the goal"""
+        if (self.fast_path and not state.get("conversation_complete")
+                and state.get("goal_description") and state.get("goal_amount_eth") and state.get("deadline_days")):
+            return "finalize"
+        return "agent"
+
+    async def _finalize_goal(self, state: AgentState) -> AgentState:
+        """Prepare the contract payload and a templated reply without an LLM hop"""
+        self.fast_path_stats["resolved"] += 1
+        payload = build_contract_payload(state["goal_description"], state["goal_amount_eth"], state["deadline_days"])
+        reply = FAST_PATH_SUMMARY.format(
+            goal_description=state["goal_description"],
+            goal_amount_eth=state["goal_amount_eth"],
+            deadline_days=state["deadline_days"]
+        )
+        return {
+            "messages": [AIMessage(content=reply)],
+            "contract_payload": payload,
+            "conversation_complete": True
+        }
+
+    async def _process_tools(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """Run the last message's tool calls concurrently and apply the state fields they declare"""
         last_message = state["messages"][-1]
 
         if not hasattr(last_message, 'tool_calls') or not last_message.tool_calls:
             return state
 
-        # Create a ToolNode to execute the tools
-        tool_node = ToolNode(self._get_tools())
-
-        # Execute tools - this will add ToolMessages to the state
-        result = tool_node.invoke(state)
-
-        # Extract values from tool results and update state
-        new_state = result.copy()
-
-        # Look through messages for tool results
-        for msg in result["messages"]:
-            if isinstance(msg, ToolMessage):
-                tool_result = msg.content
-                tool_name = msg.name if hasattr(msg, 'name') else ""
-
-                # Extract goal description
-                if tool_name == "extract_goal_description" and "Goal description extracted:" in tool_result:
-                    new_state["goal_description"] = tool_result.split("Goal description extracted: ", 1)[1]
-
-                # Extract ETH amount
-                elif tool_name == "extract_eth_amount":
-                    if "Extracted" in tool_result and "ETH" in tool_result:
-                        # Handle success case: "Extracted 2.5 ETH (2,500,000,000,000,000,000 Wei)"
-                        match = re.search(r'Extracted ([\d.]+) ETH', tool_result)
-                        if match:
-                            new_state["goal_amount_eth"] = float(match.group(1))
-
-                # Extract deadline
-                elif tool_name == "extract_deadline":
-                    if "Extracted deadline:" in tool_result:
-                        # Handle success case: "Extracted deadline: 30 days (2 weeks)"
-                        match = re.search(r'Extracted deadline: (\d+) days', tool_result)
-                        if match:
-                            new_state["deadline_days"] = int(match.group(1))
-
-                # Extract contract payload
-                elif tool_name == "prepare_contract_payload":
-                    if "Contract payload prepared:" in tool_result:
-                        payload_str = tool_result.split("Contract payload prepared: ", 1)[1]
-                        try:
-                            new_state["contract_payload"] = json.loads(payload_str)
-                            new_state["conversation_complete"] = True
-                        except json.JSONDecodeError:
-                            pass
-        return new_state
+        tool_messages, updates = await self.tool_executor.execute(last_message.tool_calls, config)
+        return {"messages": tool_messages, **updates}
 
     def _get_tools(self) -> List:
         """Define tools for the agent"""
@@ -234,47 +591,61 @@ class DreamPoolReActAgent:
             check_conversation_complete
         ]
     
-    def _call_agent(self, state: AgentState) -> AgentState:
+    async def _call_agent(self, state: AgentState, config: RunnableConfig) -> AgentState:
         """Call the LLM agent with current state"""
         # Add system message with context
-        system_message = """You are a DreamPool concierge helping users create funding pools for their goals.
-
-Your task is to collect the following information:
-1. Goal description (what they want to achieve)
-2. ETH amount needed (how much they need to raise)
-3. Deadline in days (when they need the funds)
-
-You have access to tools to extract and validate this information. You MUST use the tools to process user input and extract the required data.
-
-CONVERSATION FLOW:
-1. When you receive a user message, FIRST use the extraction tools to parse the information
-2. Use extract_goal_description for the user's goal
-3. Use extract_eth_amount for any ETH amounts mentioned
-4. Use extract_deadline for any time periods mentioned
-5. Use check_conversation_complete to see if you have all required information
-6. If all information is collected, use prepare_contract_payload
-7. Only respond conversationally after using the appropriate tools
+        system_message = render_system_prompt(state)
+        
+        # Older tool traffic is compacted; the fields it produced are in the system prompt
+        messages = [{"role": "system", "content": system_message}] + compact_history(
+            state["messages"], self.history_max_messages, self.history_max_tokens
+        )
 
-Current state:
-- Goal description: {goal_description}
-- ETH amount: {goal_amount_eth}
-- Deadline: {deadline_days}
-- Conversation complete: {conversation_complete}
+        # Enforce the request budget: once steps, tokens or time run out, answer
+        # with what has been collected instead of calling the LLM again
+        budget = current_budget() or RequestBudget()
+        if budget.check():
+            return {"messages": [AIMessage(content=best_effort_reply(state))]}
+        budget.steps += 1
 
-ALWAYS use tools first to extract information from user messages, then provide a friendly response.""".format(
-            goal_description=state.get("goal_description", "Not provided"),
-            goal_amount_eth=state.get("goal_amount_eth", "Not provided"),
-            deadline_days=state.get("deadline_days", "Not provided"),
-            conversation_complete=state.get("conversation_complete", False)
-        )
-        
-        messages = [{"role": "system", "content": system_message}] + state["messages"]
-        
         # Get response from LLM
-        response = self.llm.bind_tools(self._get_tools()).invoke(messages)
+        # Passing config through lets astream_events observe the LLM tokens
+        try:
+            with timed(LLM_CALL_SECONDS, "llm"):
+                response, route = await asyncio.wait_for(self.router.ainvoke(messages, state, config),
+                                                         budget.remaining_seconds())
+        except asyncio.TimeoutError:
+            LLM_CALLS.inc(outcome="timeout")
+            budget.exhausted = "time"
+            return {"messages": [AIMessage(content=best_effort_reply(state))]}
+        except AdmissionRejected:
+            LLM_CALLS.inc(outcome="shed")
+            raise
+        except LLMUnavailable:
+            LLM_CALLS.inc(outcome="unavailable")
+            return self._fallback_turn(state)
+        except Exception:
+            LLM_CALLS.inc(outcome="error")
+            raise
+        if route == "rules" or is_cached_response(response):
+            # Answered by the parsers or the response cache: no provider call, no tokens
+            return {"messages": [response]}
+        LLM_CALLS.inc(outcome="ok")
+        budget.record(response)
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        LLM_TOKENS.inc(usage.get("input_tokens", 0), kind="prompt")
+        LLM_TOKENS.inc(usage.get("output_tokens", 0), kind="completion")
         
         return {"messages": [response]}
     
+    @staticmethod
+    def _fallback_turn(state: AgentState) -> AgentState:
+        """Answer from the regex parsers while the LLM is unreachable"""
+        last_user = next((m for m in reversed(state["messages"]) if isinstance(m, HumanMessage)), None)
+        fields = extract_goal_fields(str(last_user.content), state) if last_user else {}
+        return {"messages": [AIMessage(content=best_effort_reply({**state, **fields}))], **fields}
+
     def _should_continue(self, state: AgentState) -> str:
         """Determine if the conversation should continue"""
         last_message = state["messages"][-1]
@@ -294,9 +665,10 @@ ALWAYS use tools first to extract information from user messages, then provide a
         # Otherwise, end to prevent infinite loop
         return "end"
     
-    async def start_conversation(self, initial_message: str = "") -> Dict[str, Any]:
-        """Start a new conversation with the agent"""
-        initial_state = {
+    @staticmethod
+    def _initial_state(initial_message: str = "") -> Dict[str, Any]:
+        """Build the state for a brand new conversation"""
+        return {
             "messages": [HumanMessage(content=initial_message or "Hello! I'd like to create a funding pool for my goal.")],
             "goal_description": None,
             "goal_amount_eth": None,
@@ -306,26 +678,29 @@ ALWAYS use tools first to extract information from user messages, then provide a
             "contract_payload": None
         }
 
-        # Run the graph
-        final_state = self.graph.invoke(initial_state)
-
-        # Convert messages to a format suitable for API response while preserving structure
-        messages = []
-        for msg in final_state["messages"]:
-            if isinstance(msg, BaseMessage):
-                message_dict = {
-                    "type": msg.__class__.__name__,
-                    "content": msg.content
-                }
-                # Add additional metadata if available
-                if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                    message_dict["tool_calls"] = msg.tool_calls
-                if hasattr(msg, 'tool_call_id') and msg.tool_call_id:
-                    message_dict["tool_call_id"] = msg.tool_call_id
-                messages.append(message_dict)
-
+    @staticmethod
+    def _serialize_messages(messages: List[BaseMessage]) -> List[Dict[str, Any]]:
+        """Convert messages to a format suitable for API response while preserving structure"""
+        with timed(SERIALIZE_SECONDS, "serialize"):
+            return [ConversationMessage.encode(msg) for msg in messages if isinstance(msg, BaseMessage)]
+
+    @staticmethod
+    def _deserialize_message(msg_dict: Dict[str, Any]) -> BaseMessage:
+        """The LangChain message for a serialized one, validated on the way in"""
+        record = ConversationMessage.from_dict(msg_dict)
+        if record.type == "HumanMessage":
+            return HumanMessage(content=record.content)
+        if record.type == "AIMessage":
+            return AIMessage(content=record.content, tool_calls=record.tool_calls or [])
+        if record.type == "ToolMessage":
+            return ToolMessage(content=record.content, tool_call_id=record.tool_call_id or "", name=record.name)
+        # Fallback for unknown message types
+        return HumanMessage(content=str(msg_dict))
+
+    @staticmethod
+    def _state_fields(final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Structured goal fields returned alongside the messages"""
         return {
-            "messages": messages,
             "goal_description": final_state.get("goal_description"),
             "goal_amount_eth": final_state.get("goal_amount_eth"),
             "deadline_days": final_state.get("deadline_days"),
@@ -333,43 +708,42 @@ ALWAYS use tools first to extract information from user messages, then provide a
             "conversation_complete": final_state.get("conversation_complete", False),
             "contract_payload": final_state.get("contract_payload")
         }
+
+    def _turn_response(self, final_state: Dict[str, Any], messages: List[BaseMessage],
+                       budget: Optional[RequestBudget] = None, **extra) -> Dict[str, Any]:
+        """The payload every conversation endpoint returns: messages, goal fields and usage"""
+        response = {**extra, "messages": self._serialize_messages(messages), **self._state_fields(final_state)}
+        if budget is not None:
+            response["usage"] = budget.usage()
+        return response
+
+    async def start_conversation(self, initial_message: str = "") -> Dict[str, Any]:
+        """Start a new conversation with the agent"""
+        # Run the graph
+        with request_budget() as budget:
+            final_state = await self.graph.ainvoke(self._initial_state(initial_message))
+
+        return self._turn_response(final_state, final_state["messages"], budget)
     
-    async def continue_conversation(self, state_dict: Dict[str, Any], user_message: str) -> Dict[str, Any]:
-        """Continue an existing conversation"""
+    @staticmethod
+    def _restore_state(state_dict: Dict[str, Any], user_message: str) -> Dict[str, Any]:
+        """Rebuild graph state from a client-held state dict plus the new user message"""
         # Reconstruct messages from the structured format
         messages = []
         for msg_dict in state_dict.get("messages", []):
             if isinstance(msg_dict, dict) and "type" in msg_dict:
-                content = msg_dict.get("content", "")
-                msg_type = msg_dict.get("type")
-
-                if msg_type == "HumanMessage":
-                    msg = HumanMessage(content=content)
-                elif msg_type == "AIMessage":
-                    msg = AIMessage(content=content)
-                    # Add tool calls if present
-                    if "tool_calls" in msg_dict:
-                        msg.tool_calls = msg_dict["tool_calls"]
-                elif msg_type == "ToolMessage":
-                    msg = ToolMessage(content=content, tool_call_id=msg_dict.get("tool_call_id", ""))
-                    if "name" in msg_dict:
-                        msg.name = msg_dict["name"]
-                else:
-                    # Fallback for unknown message types
-                    msg = HumanMessage(content=str(msg_dict))
-                messages.append(msg)
-            else:
+                messages.append(DreamPoolReActAgent._deserialize_message(msg_dict))
+            elif isinstance(msg_dict, str):
                 # Fallback for old string format
-                if isinstance(msg_dict, str):
-                    if len(messages) % 2 == 0:
-                        messages.append(HumanMessage(content=msg_dict))
-                    else:
-                        messages.append(AIMessage(content=msg_dict))
+                if len(messages) % 2 == 0:
+                    messages.append(HumanMessage(content=msg_dict))
+                else:
+                    messages.append(AIMessage(content=msg_dict))
 
         # Add the new user message
         messages.append(HumanMessage(content=user_message))
 
-        current_state = {
+        return {
             "messages": messages,
             "goal_description": state_dict.get("goal_description"),
             "goal_amount_eth": state_dict.get("goal_amount_eth"),
@@ -379,50 +753,154 @@ ALWAYS use tools first to extract information from user messages, then provide a
             "contract_payload": state_dict.get("contract_payload")
         }
 
+    async def continue_conversation(self, state_dict: Dict[str, Any], user_message: str) -> Dict[str, Any]:
+        """Continue an existing conversation"""
         # Run the graph
-        final_state = self.graph.invoke(current_state)
+        with request_budget() as budget:
+            final_state = await self.graph.ainvoke(self._restore_state(state_dict, user_message))
+
+        return self._turn_response(final_state, final_state["messages"], budget)
+
+    async def _session_input(self, session_id: str, user_message: str) -> Dict[str, Any]:
+        """Graph input for a session turn: the stored conversation plus the user message"""
+        previous = await self.sessions.load(session_id)
+        if not previous or not previous.get("messages"):
+            return self._initial_state(user_message)
+        return self._restore_state(previous, user_message)
+
+    async def _save_session(self, session_id: str, final_state: Dict[str, Any]):
+        await self.sessions.save(session_id, self._turn_response(final_state, final_state["messages"]))
+
+    async def _run_session_turn(self, session_id: str, graph_input: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one turn of a stored session and return only the new messages"""
+        with request_budget() as budget:
+            final_state = await self.graph.ainvoke(graph_input)
+        await self._save_session(session_id, final_state)
+
+        # Skip the history and the user message we were just sent; the client already has them
+        new_messages = final_state["messages"][len(graph_input["messages"]):]
+        return self._turn_response(final_state, new_messages, budget, session_id=session_id)
+
+    async def start_session(self, session_id: str, initial_message: str = "") -> Dict[str, Any]:
+        """Start a server-side conversation session"""
+        return await self._run_session_turn(session_id, self._initial_state(initial_message))
+
+    async def continue_session(self, session_id: str, user_message: str) -> Dict[str, Any]:
+        """Continue a server-side session; prior messages come from the session store"""
+        return await self._run_session_turn(session_id, await self._session_input(session_id, user_message))
+    
+    async def _stream_turn(self, graph, graph_input: Dict[str, Any], skip_messages: int = 0,
+                           on_final: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run one turn and yield token, tool and state events, ending with the full state
+
+        on_final is awaited with the final graph state before the done event, e.g. to save a session.
+        """
+        fields = {name: graph_input.get(name) for name in STREAMED_STATE_FIELDS}
+        final_state = None
+
+        with request_budget() as budget:
+            async for event in graph.astream_events(graph_input, version="v2"):
+                kind = event["event"]
+                data = event.get("data", {})
+
+                if kind == "on_chat_model_stream":
+                    content = data["chunk"].content
+                    if content:
+                        yield {"event": "token", "data": {"content": content}}
+
+                elif kind == "on_tool_start":
+                    yield {"event": "tool_start", "data": {"id": event["run_id"], "name": event["name"], "input": data.get("input")}}
+
+                elif kind == "on_tool_end":
+                    output = data.get("output")
+                    yield {"event": "tool_end", "data": {"id": event["run_id"], "name": event["name"],
+                                                         "output": str(getattr(output, "content", output))}}
+
+                elif kind == "on_chain_end" and event["name"] in STATE_NODES and isinstance(data.get("output"), dict):
+                    # Our nodes return the updated goal fields alongside their messages
+                    output = data["output"]
+                    changed = {name: output[name] for name in STREAMED_STATE_FIELDS
+                               if name in output and output[name] != fields[name]}
+                    if changed:
+                        fields.update(changed)
+                        yield {"event": "state", "data": changed}
+
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    # The root run's output is the final graph state
+                    final_state = data.get("output")
+
+        if on_final is not None:
+            await on_final(final_state)
+
+        yield {
+            "event": "done",
+            "data": self._turn_response(final_state, final_state["messages"][skip_messages:], budget)
+        }
 
-        # Convert messages to structured format for API response
-        messages = []
-        for msg in final_state["messages"]:
-            if isinstance(msg, BaseMessage):
-                message_dict = {
-                    "type": msg.__class__.__name__,
-                    "content": msg.content
-                }
-                # Add additional metadata if available
-                if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                    message_dict["tool_calls"] = msg.tool_calls
-                if hasattr(msg, 'tool_call_id') and msg.tool_call_id:
-                    message_dict["tool_call_id"] = msg.tool_call_id
-                if hasattr(msg, 'name') and msg.name:
-                    message_dict["name"] = msg.name
-                messages.append(message_dict)
+    async def stream_conversation(self, initial_message: str = "") -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of start_conversation"""
+        async for item in self._stream_turn(self.graph, self._initial_state(initial_message)):
+            yield item
+
+    async def stream_continue_conversation(self, state_dict: Dict[str, Any], user_message: str) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of continue_conversation"""
+        async for item in self._stream_turn(self.graph, self._restore_state(state_dict, user_message)):
+            yield item
+
+    async def _stream_session_turn(self, session_id: str, graph_input: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        async def save(final_state: Dict[str, Any]):
+            await self._save_session(session_id, final_state)
+
+        async for item in self._stream_turn(self.graph, graph_input, skip_messages=len(graph_input["messages"]),
+                                            on_final=save):
+            if item["event"] == "done":
+                item["data"]["session_id"] = session_id
+            yield item
+
+    async def stream_start_session(self, session_id: str, initial_message: str = "") -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of start_session"""
+        async for item in self._stream_session_turn(session_id, self._initial_state(initial_message)):
+            yield item
+
+    async def stream_continue_session(self, session_id: str, user_message: str) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming variant of continue_session"""
+        async for item in self._stream_session_turn(session_id, await self._session_input(session_id, user_message)):
+            yield item
 
-        return {
-            "messages": messages,
-            "goal_description": final_state.get("goal_description"),
-            "goal_amount_eth": final_state.get("goal_amount_eth"),
-            "deadline_days": final_state.get("deadline_days"),
-            "recipient_address": final_state.get("recipient_address"),
-            "conversation_complete": final_state.get("conversation_complete", False),
-            "contract_payload": final_state.get("contract_payload")
-        }
-    
     # Legacy method for backward compatibility
-    async def parse_goal(self, message: str) -> ProposedGoal:
-        """Parse user message and extract structured goal information"""
+    async def parse_goal(self, message: str, engine: Optional[str] = None) -> ProposedGoal:
+        """Parse user message and extract structured goal information
+
+        engine "react" runs the full tool-calling conversation; "structured"
+        asks for a ProposedGoal in a single structured-output LLM call.
+        """
+        engine = (engine or os.getenv("PROPOSE_ENGINE", "react")).lower()
+        if engine not in PROPOSE_ENGINES:
+            raise ValueError(f"Unknown propose engine: {engine}")
+
         try:
+            if engine == "structured":
+                try:
+                    return await self._parse_goal_structured(message)
+                except LLMUnavailable:
+                    # The regex parsers alone still give a usable goal
+                    return validate_proposed_goal({}, message)
+
             conversation = await self.start_conversation(message)
+
+            # Fields the conversation didn't collect come back as None: fill them in
+            # from the parsers and defaults so the goal can always be encoded
+            return validate_proposed_goal({
+                "title": conversation.get("goal_description"),
+                "description": conversation.get("goal_description"),
+                "cost_eth": conversation.get("goal_amount_eth"),
+                "deadline_days": conversation.get("deadline_days"),
+                "recipient": conversation.get("recipient_address")
+            }, message)
             
-            return ProposedGoal(
-                title=conversation.get("goal_description", "Unknown Goal"),
-                cost_eth=conversation.get("goal_amount_eth", 1.0),
-                deadline_days=conversation.get("deadline_days", 30),
-                recipient=conversation.get("recipient_address", HARDCODED_RECIPIENT),
-                description=conversation.get("goal_description", "")
-            )
-            
+        except AdmissionRejected:
+            # Shedding must reach the client as a 503, not a guessed goal
+            raise
         except Exception as e:
             print(f"Error in parse_goal: {e}")
             # Fallback to simple parsing
@@ -433,3 +911,16 @@ ALWAYS use tools first to extract information from user messages, then provide a
                 recipient=HARDCODED_RECIPIENT,
                 description=message
             )
+
+    def parse_goal_rules(self, message: str) -> Optional[ProposedGoal]:
+        """parse_goal without the LLM: the goal when the parsers resolve it, otherwise None"""
+        return rule_proposed_goal(message) if self.fast_path else None
+
+    async def _parse_goal_structured(self, message: str) -> ProposedGoal:
+        """Extract a ProposedGoal with one structured-output LLM call"""
+        budget = current_budget() or RequestBudget()
+        data = await asyncio.wait_for(self.structured_llm.ainvoke([
+            {"role": "system", "content": STRUCTURED_GOAL_PROMPT},
+            {"role": "user", "content": message}
+        ]), budget.remaining_seconds())
+        return validate_proposed_goal(data or {}, message)
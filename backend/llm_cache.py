@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from shared_state import create_state_backend
+
+# Which agent turns may be answered from the cache
+CACHE_MODES = ("off", "first_turn", "all")
+
+
+class InMemoryCacheBackend:
+    """LRU cache of serialized LLM responses held in process memory"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: float):
+        self._entries[key] = (time.time() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """LLM response cache in a SQLite file, shared by every process using it"""
+
+    def __init__(self, path: str = "llm_cache.db", max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+
+    def _set(self, key: str, value: Dict[str, Any], ttl_seconds: float):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl_seconds, now)
+            )
+            conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            # Keep only the most recently used entries
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key NOT IN "
+                "(SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: float):
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+
+class SharedStateCacheBackend:
+    """LLM response cache kept in the shared state backend (see shared_state.py)"""
+
+    def __init__(self, state, prefix: str = "llm_cache:"):
+        self.state = state
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.state.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: float):
+        await self.state.set(self.prefix + key, json.dumps(value), ttl_seconds)
+
+
+class LLMCache:
+    """LLM response cache keyed on normalized history, tool schemas and model params"""
+
+    def __init__(self, backend, mode: str = "first_turn", ttl_seconds: float = 3600):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        self.backend = backend
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def cacheable(self, messages: List[Any]) -> bool:
+        """Whether a prompt may be served from the cache under the configured mode"""
+        if self.mode == "all":
+            return True
+        if self.mode == "first_turn":
+            # The opening step of a conversation: one user message, nothing else yet
+            roles = [_role(message) for message in messages]
+            return roles.count("human") == 1 and "ai" not in roles and "tool" not in roles
+        return False
+
+    @staticmethod
+    def key(messages: List[Any], tools_hash: str, params: Dict[str, Any]) -> str:
+        """Stable cache key for a prompt"""
+        normalized = [_normalize(message) for message in messages]
+        blob = json.dumps({"messages": normalized, "tools": tools_hash, "params": params}, sort_keys=True)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        await self.backend.set(key, value, self.ttl_seconds)
+
+
+class CachedChatModel:
+    """Wraps a tool-bound chat model and answers repeated prompts from an LLMCache"""
+
+    def __init__(self, model, cache: LLMCache, tools_hash: str, params: Dict[str, Any]):
+        self.model = model
+        self.cache = cache
+        self.tools_hash = tools_hash
+        self.params = params
+
+    async def ainvoke(self, messages: List[Any], config: Optional[Any] = None, **kwargs) -> AIMessage:
+        if not self.cache.cacheable(messages):
+            return await self.model.ainvoke(messages, config, **kwargs)
+
+        key = self.cache.key(messages, self.tools_hash, self.params)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return _message_from_cache(cached)
+
+        response = await self.model.ainvoke(messages, config, **kwargs)
+        await self.cache.set(key, _message_to_cache(response))
+        return response
+
+
+def hash_tool_schemas(schemas: List[Dict[str, Any]]) -> str:
+    """Hash of the tool schemas bound to the model; changing a tool invalidates the cache"""
+    return hashlib.sha256(json.dumps(schemas, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def create_llm_cache(state=None) -> Optional[LLMCache]:
+    """Build the LLM cache configured by the environment, or None when disabled
+
+    The "shared" backend stores entries in `state` (or the configured state backend).
+    """
+    mode = os.getenv("LLM_CACHE_MODE", "first_turn").lower()
+    if mode == "off":
+        return None
+
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    backend_kind = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    if backend_kind == "memory":
+        backend = InMemoryCacheBackend(max_entries)
+    elif backend_kind == "sqlite":
+        backend = SQLiteCacheBackend(os.getenv("LLM_CACHE_DB_PATH", "llm_cache.db"), max_entries)
+    elif backend_kind == "shared":
+        backend = SharedStateCacheBackend(state if state is not None else create_state_backend())
+    else:
+        raise ValueError(f"Unknown LLM cache backend: {backend_kind}")
+
+    return LLMCache(backend, mode=mode, ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")))
+
+
+def _role(message: Any) -> str:
+    if isinstance(message, dict):
+        return {"user": "human", "assistant": "ai"}.get(message.get("role"), message.get("role", ""))
+    return getattr(message, "type", message.__class__.__name__)
+
+
+def _normalize(message: Any) -> Dict[str, Any]:
+    """Role, whitespace-collapsed lowercase content and tool calls without their random ids"""
+    content = message.get("content", "") if isinstance(message, dict) else message.content
+    normalized = {"role": _role(message), "content": " ".join(str(content).split()).lower()}
+
+    tool_calls = getattr(message, "tool_calls", None) if isinstance(message, BaseMessage) else None
+    if tool_calls:
+        normalized["tool_calls"] = [{"name": call["name"], "args": call["args"]} for call in tool_calls]
+    if isinstance(message, BaseMessage) and getattr(message, "name", None):
+        normalized["name"] = message.name
+    return normalized
+
+
+def _message_to_cache(message: AIMessage) -> Dict[str, Any]:
+    return {
+        "content": message.content,
+        "tool_calls": [{"name": call["name"], "args": call["args"]} for call in (message.tool_calls or [])]
+    }
+
+
+def _message_from_cache(value: Dict[str, Any]) -> AIMessage:
+    # Fresh tool call ids so a replayed response never clashes within a conversation
+    tool_calls = [{**call, "id": f"call_{uuid.uuid4().hex[:24]}"} for call in value.get("tool_calls", [])]
+    return AIMessage(content=value.get("content", ""), tool_calls=tool_calls, response_metadata={"cached": True})
+
+
+def is_cached_response(message: Any) -> bool:
+    """Whether a response was served from the cache rather than by the provider"""
+    return bool((getattr(message, "response_metadata", None) or {}).get("cached"))
@@ -0,0 +1,214 @@
+import asyncio
+import math
+import os
+import random
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from admission import LLMAdmission
+from metrics import LLM_TRANSPORT_EVENTS
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUSES = {408, 409, 429}
+
+
+class LLMUnavailable(Exception):
+    """The LLM could not be reached after retries; callers fall back to the regex parsers"""
+
+
+class CircuitOpen(LLMUnavailable):
+    """Calls are short-circuited while the breaker is open"""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed LLM call may succeed if retried"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUSES or status >= 500
+    # openai's APIConnectionError and APITimeoutError carry no status code
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single probe through every reset_seconds"""
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_seconds: Optional[float] = None):
+        self.failure_threshold = failure_threshold if failure_threshold is not None else int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+        self.reset_seconds = reset_seconds if reset_seconds is not None else float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        if self.state == "closed":
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            # One probe per period decides whether to close again; everyone else keeps falling back
+            self.state = "half_open"
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                LLM_TRANSPORT_EVENTS.inc(event="circuit_opened")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class ResilientChatModel:
+    """Wraps a chat model with per-call timeouts, jittered retries, hedging and a circuit breaker
+
+    A call still running after the recent p95 latency is hedged with one
+    duplicate and the first answer wins. The duplicate runs without callbacks,
+    so a streamed turn only emits the primary's tokens; the final state is
+    authoritative either way.
+
+    With an admission, each attempt holds one slot and backoff sleeps hold none;
+    a hedge needs a second slot that is free right now, else it is skipped, so
+    in-flight provider calls never exceed LLM_MAX_CONCURRENCY.
+    """
+
+    def __init__(self, model, breaker: Optional[CircuitBreaker] = None, timeout_seconds: Optional[float] = None,
+                 max_retries: Optional[int] = None, retry_base_seconds: Optional[float] = None,
+                 retry_max_seconds: Optional[float] = None, hedge: Optional[bool] = None,
+                 hedge_percentile: Optional[float] = None, hedge_min_samples: Optional[int] = None,
+                 hedge_min_delay_seconds: Optional[float] = None, admission: Optional[LLMAdmission] = None):
+        self.model = model
+        self.breaker = breaker or CircuitBreaker()
+        self.admission = admission
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "2"))
+        self.retry_base_seconds = retry_base_seconds if retry_base_seconds is not None else float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.25"))
+        self.retry_max_seconds = retry_max_seconds if retry_max_seconds is not None else float(os.getenv("LLM_RETRY_MAX_SECONDS", "4"))
+        if hedge is None:
+            hedge = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile if hedge_percentile is not None else float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+        self.hedge_min_samples = hedge_min_samples if hedge_min_samples is not None else int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds if hedge_min_delay_seconds is not None else float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "0.5"))
+        # Recent successful call latencies, for the hedge threshold
+        self.latencies: deque = deque(maxlen=200)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a call is hedged, or None while hedging is off or unwarmed"""
+        if not self.hedge or len(self.latencies) < max(1, self.hedge_min_samples):
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(0, math.ceil(self.hedge_percentile / 100 * len(ordered)) - 1)
+        return max(self.hedge_min_delay_seconds, ordered[rank])
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number attempt + 1"""
+        return random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt))
+
+    async def _call(self, messages: List[Any], config: Optional[Any], kwargs: Dict[str, Any]) -> Any:
+        started = time.monotonic()
+        response = await asyncio.wait_for(self.model.ainvoke(messages, config, **kwargs), self.timeout_seconds)
+        self.latencies.append(time.monotonic() - started)
+        return response
+
+    async def _hedged(self, messages: List[Any], config: Optional[Any], kwargs: Dict[str, Any]) -> Any:
+        tasks = [asyncio.ensure_future(self._call(messages, config, kwargs))]
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    hedge = await self._hedge(messages, config, kwargs)
+                    if hedge is not None:
+                        tasks.append(hedge)
+
+            error = None
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.remove(task)
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                # Let the loser stop before its slot is handed to the next call
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _hedge(self, messages: List[Any], config: Optional[Any], kwargs: Dict[str, Any]) -> Optional[asyncio.Future]:
+        """Start the duplicate call, or None when admission has no slot free for it"""
+        acquired = None
+        if self.admission is not None:
+            acquired = await self.admission.try_acquire()
+            if acquired is None:
+                LLM_TRANSPORT_EVENTS.inc(event="hedge_skipped")
+                return None
+        LLM_TRANSPORT_EVENTS.inc(event="hedge")
+        quiet = {**(config or {}), "callbacks": []}
+        task = asyncio.ensure_future(self._call(messages, quiet, kwargs))
+        if acquired is not None:
+            # A done callback runs even if the task is cancelled before it starts
+            task.add_done_callback(lambda _: self.admission.release(acquired))
+        return task
+
+    async def ainvoke(self, messages: List[Any], config: Optional[Any] = None, **kwargs) -> Any:
+        if not self.breaker.allow():
+            LLM_TRANSPORT_EVENTS.inc(event="short_circuit")
+            raise CircuitOpen("LLM circuit breaker is open")
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.admission.slot() if self.admission is not None else nullcontext():
+                    response = await self._hedged(messages, config, kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_retries or not self.breaker.allow():
+                    raise LLMUnavailable(f"LLM call failed after {attempt + 1} attempts: {e}") from e
+                LLM_TRANSPORT_EVENTS.inc(event="retry")
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            self.breaker.record_success()
+            return response
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP client shared by every LLM call in the process"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_SECONDS", "30"))
+        ),
+        timeout=httpx.Timeout(float(os.getenv("LLM_TIMEOUT_SECONDS", "20")),
+                              connect=float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5")))
+    )
+
+
+def create_chat_model(http_client: Optional[httpx.AsyncClient] = None, base_url: Optional[str] = None,
+                      **kwargs) -> ChatOpenAI:
+    """ChatOpenAI on the pooled client; retries are left to ResilientChatModel"""
+    return ChatOpenAI(
+        model=kwargs.pop("model", "gpt-4o-mini"),
+        temperature=kwargs.pop("temperature", 0.7),
+        api_key=kwargs.pop("api_key", os.getenv("OPENAI_API_KEY")),
+        base_url=base_url or os.getenv("OPENAI_BASE_URL") or None,
+        http_async_client=http_client or create_http_client(),
+        max_retries=0,
+        **kwargs
+    )
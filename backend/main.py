@@ -1,17 +1,32 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from typing import Optional
 import os
+import time
+import hashlib
+import asyncio
 from dotenv import load_dotenv
 
-from schemas import ChatInput, ProposedGoal, EncodedTx
-from langgraph_agent import DreamPoolReActAgent
+from schemas import PROPOSE_ENGINES, ChatInput, JobInput, ProposeBatchInput, ProposedGoal, SchemaError
+from json_codec import FastJSONResponse, dumps, dumps_str
 from abi_encoder import ABIEncoder
+from session_store import SessionLockTimeout, SessionManager
+from admission import AdmissionRejected, ClientRateLimiter, LLMAdmission
+from single_flight import SingleFlight, request_key
+from agent_loader import LazyAgent
+from jobs import JobManager
+from batch_propose import BatchProposer
+from shared_state import create_state_backend
+from pool_indexer import POOL_STATUSES, create_pool_indexer, create_pool_store
+from pool_reader import pool_to_dict
+from pool_stream import PoolBroadcaster
+from metrics import REGISTRY, HTTP_REQUEST_SECONDS, server_timing_header, start_request_timings
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="DreamPool API", version="1.0.0")
+app = FastAPI(title="DreamPool API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -22,9 +37,173 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Endpoints that may call the LLM, limited per client
+RATE_LIMITED_PREFIXES = ("/llm/propose", "/llm/chat/", "/llm/session/", "/llm/jobs")
+# Behind a proxy, identify clients by the first X-Forwarded-For address
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+rate_limiter = ClientRateLimiter()
+
+def client_key(request: Request) -> str:
+    forwarded = request.headers.get("x-forwarded-for") if RATE_LIMIT_TRUST_FORWARDED else None
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+# Endpoints served by the agent. Job endpoints are left out: submitting and polling
+# must answer right away (and from the shared backend even if the build fails); the
+# job runners wait for the agent themselves
+AGENT_PATH_PREFIXES = ("/llm/propose", "/llm/chat/", "/llm/session/", "/llm/cache/", "/llm/routing/")
+
+@app.middleware("http")
+async def build_agent_on_demand(request: Request, call_next):
+    """Build a not-yet-loaded agent in a thread instead of blocking the event loop in the handler"""
+    if not llm_agent.ready and request.url.path.startswith(AGENT_PATH_PREFIXES):
+        try:
+            await llm_agent.warm_up()
+        except Exception as e:
+            return JSONResponse(status_code=503, content={"detail": f"Agent unavailable: {str(e)}"})
+    return await call_next(request)
+
+@app.middleware("http")
+async def rate_limit_llm_requests(request: Request, call_next):
+    """Answer 429 with Retry-After once a client exceeds its token bucket on LLM endpoints"""
+    if request.method == "POST" and request.url.path.startswith(RATE_LIMITED_PREFIXES):
+        retry_after = rate_limiter.acquire(client_key(request))
+        if retry_after is not None:
+            return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"},
+                                headers={"Retry-After": str(retry_after)})
+    return await call_next(request)
+
+# Send a Server-Timing breakdown on every response, not only when a client asks
+TIMING_HEADER_ALWAYS = os.getenv("METRICS_TIMING_HEADER", "false").lower() == "true"
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    """Record request latency and optionally return a per-phase timing breakdown"""
+    timings = start_request_timings()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        # Label by route template to keep path cardinality bounded
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, path=path, status=status)
+
+    if TIMING_HEADER_ALWAYS or request.headers.get("x-debug-timing") == "1":
+        response.headers["Server-Timing"] = server_timing_header(timings, elapsed)
+    return response
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    """Shed load with 503 and a Retry-After hint instead of queueing without bound"""
+    return JSONResponse(status_code=503, content={"detail": str(exc), "reason": exc.reason},
+                        headers={"Retry-After": str(exc.retry_after)})
+
+def sse_response(events) -> StreamingResponse:
+    """Send agent events to the client as Server-Sent Events"""
+    async def event_stream():
+        try:
+            async for item in events:
+                yield f"event: {item['event']}\ndata: {dumps_str(item['data'])}\n\n"
+        except AdmissionRejected as e:
+            yield f"event: error\ndata: {dumps_str({'detail': str(e), 'retry_after': e.retry_after})}\n\n"
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-band
+            yield f"event: error\ndata: {dumps_str({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Initialize services
-llm_agent = DreamPoolReActAgent()
+# Sessions and shared caches live in the state backend, so with STATE_BACKEND=sqlite
+# or redis any worker can serve any turn
+state_backend = create_state_backend()
+session_manager = SessionManager(state_backend)
+llm_admission = LLMAdmission()
+
+# The agent pulls in langchain/langgraph and compiles its graph, so it is built
+# off the import path: "background" starts building it once the server is up
+# (/ready answers 503 until then), "eager" finishes before serving, "lazy"
+# waits for the first /llm request
+AGENT_STARTUP = os.getenv("AGENT_STARTUP", "background").lower()
+
+def build_agent():
+    from langgraph_agent import DreamPoolReActAgent
+    return DreamPoolReActAgent(sessions=session_manager, admission=llm_admission)
+
+def register_agent_gauges(agent):
+    REGISTRY.gauge("dreampool_llm_circuit_open", "1 while the LLM circuit breaker is short-circuiting calls",
+                   callback=lambda: 0 if llm_agent.breaker.state == "closed" else 1)
+    REGISTRY.gauge("dreampool_fast_path_resolved", "Turns completed by the fast path without an LLM call",
+                   callback=lambda: llm_agent.fast_path_stats["resolved"])
+    if agent.llm_cache is not None:
+        REGISTRY.gauge("dreampool_llm_cache_hits", "LLM response cache hits", callback=lambda: llm_agent.llm_cache.hits)
+        REGISTRY.gauge("dreampool_llm_cache_misses", "LLM response cache misses", callback=lambda: llm_agent.llm_cache.misses)
+
+llm_agent = LazyAgent(build_agent, on_load=register_agent_gauges)
+# Identical concurrent requests (double-submits, common opening messages) share one execution
+single_flight = SingleFlight()
+# Long agent requests can run in the background instead of holding the connection
+job_manager = JobManager(state_backend)
 abi_encoder = ABIEncoder()
+# Bulk proposals: rule-resolved messages skip the LLM, the rest share a bounded number of calls
+batch_proposer = BatchProposer(llm_agent, abi_encoder)
+pool_store = create_pool_store()
+pool_broadcaster = PoolBroadcaster()
+pool_indexer = create_pool_indexer(pool_store, pool_broadcaster)
+
+async def warm_up_agent_quietly():
+    try:
+        await llm_agent.warm_up()
+    except Exception:
+        pass  # kept in llm_agent.error and reported by /ready
+
+@app.on_event("startup")
+async def warm_up_agent():
+    if AGENT_STARTUP == "eager":
+        await llm_agent.warm_up()
+    elif AGENT_STARTUP == "background":
+        asyncio.create_task(warm_up_agent_quietly())
+
+@app.on_event("startup")
+async def start_pool_indexer():
+    if pool_indexer is not None:
+        pool_indexer.start()
+
+@app.on_event("shutdown")
+async def stop_pool_indexer():
+    if pool_indexer is not None:
+        await pool_indexer.stop()
+
+@app.on_event("startup")
+async def start_job_workers():
+    job_manager.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_manager.stop()
+
+@app.on_event("shutdown")
+async def close_state_backend():
+    await state_backend.close()
+
+# Scrape-time views of service state
+REGISTRY.gauge("dreampool_sessions", "Live server-side conversation sessions", callback=lambda: len(session_manager))
+REGISTRY.gauge("dreampool_llm_in_flight", "LLM calls holding an admission slot", callback=lambda: llm_admission.in_flight)
+REGISTRY.gauge("dreampool_llm_queue_depth", "LLM calls waiting for an admission slot", callback=lambda: llm_admission.waiting)
+REGISTRY.gauge("dreampool_jobs_queued", "Background jobs waiting for a worker", callback=lambda: job_manager.queued)
+REGISTRY.gauge("dreampool_jobs_running", "Background jobs being run", callback=lambda: job_manager.running)
+REGISTRY.gauge("dreampool_pool_stream_subscribers", "Clients subscribed to /pools/stream",
+               callback=lambda: len(pool_broadcaster))
+REGISTRY.gauge("dreampool_pool_stream_resyncs", "Pool stream clients told to resync after falling behind",
+               callback=lambda: pool_broadcaster.resyncs)
 
 @app.get("/")
 async def root():
@@ -32,65 +211,370 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up and serving"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: the agent is built (or will be on first use) and can take LLM traffic"""
+    if llm_agent.ready:
+        return {"status": "ready", "agent": "loaded", "agent_load_seconds": llm_agent.load_seconds}
+    if llm_agent.error is not None:
+        return JSONResponse(status_code=503, content={"status": "failed", "detail": llm_agent.error})
+    if AGENT_STARTUP == "lazy":
+        return {"status": "ready", "agent": "lazy"}
+    return JSONResponse(status_code=503, content={"status": "starting"})
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/llm/cache/stats")
+async def llm_cache_stats():
+    """Hit/miss counters of the LLM response cache"""
+    if llm_agent.llm_cache is None:
+        return {"mode": "off"}
+    return llm_agent.llm_cache.stats()
+
+@app.get("/llm/routing/stats")
+async def llm_routing_stats():
+    """Calls, escalations, latency and estimated cost of each model route"""
+    return llm_agent.router.stats_dict()
+
+def decode_body(schema, data: dict):
+    """Validate a request body against a schema, answering 400 when it doesn't fit"""
+    try:
+        return schema.from_dict(data)
+    except SchemaError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request: {str(e)}")
+
 @app.post("/llm/propose")
 async def propose_goal(chat_data: dict):
     """Parse user chat message and extract structured goal information"""
+    body = decode_body(ChatInput, chat_data)
     try:
-        message = chat_data.get("message", "")
-        goal = await llm_agent.parse_goal(message)
-        return {
-            "title": goal.title,
-            "cost_eth": goal.cost_eth,
-            "deadline_days": goal.deadline_days,
-            "recipient": goal.recipient,
-            "description": goal.description
-        }
+        goal = await single_flight.do(
+            "/llm/propose", request_key("/llm/propose", body.engine, body.message),
+            lambda: llm_agent.parse_goal(body.message, engine=body.engine)
+        )
+        return FastJSONResponse(goal.to_dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse goal: {str(e)}")
 
 @app.post("/llm/build_tx")
 async def build_transaction(goal_data: dict):
     """Build transaction data for creating a pool"""
+    goal = decode_body(ProposedGoal, goal_data)
     try:
-        goal = ProposedGoal(
-            title=goal_data.get("title", ""),
-            cost_eth=goal_data.get("cost_eth", 0),
-            deadline_days=goal_data.get("deadline_days", 30),
-            recipient=goal_data.get("recipient", ""),
-            description=goal_data.get("description", "")
-        )
+        # Not coalesced: encoding takes microseconds, less than hashing the body for a key
         tx_data = await abi_encoder.encode_create_pool(goal)
-        return {
-            "to": tx_data.to,
-            "data": tx_data.data,
-            "value": tx_data.value
-        }
+        return FastJSONResponse(tx_data.to_dict())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to build transaction: {str(e)}")
 
+# Largest number of goals accepted by one batch build request
+BUILD_TX_BATCH_MAX = int(os.getenv("BUILD_TX_BATCH_MAX", "500"))
+
+@app.post("/llm/build_tx/batch")
+async def build_transaction_batch(batch_data: dict):
+    """Build createPool transactions for many goals; invalid goals get an error entry in place"""
+    goals = batch_data.get("goals", [])
+    if not isinstance(goals, list):
+        raise HTTPException(status_code=400, detail="goals must be a list")
+    if len(goals) > BUILD_TX_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {BUILD_TX_BATCH_MAX} goals per batch")
+
+    decoded = []
+    for goal in goals:
+        try:
+            decoded.append(ProposedGoal.from_dict(goal))
+        except SchemaError as e:
+            decoded.append(e)
+
+    try:
+        encoded = iter(abi_encoder.encode_create_pool_batch(goal for goal in decoded if not isinstance(goal, SchemaError)))
+        results = [goal if isinstance(goal, SchemaError) else next(encoded) for goal in decoded]
+        return FastJSONResponse({
+            "transactions": [
+                {"error": f"Invalid goal: {str(result)}"} if isinstance(result, SchemaError)
+                else {"error": f"Failed to encode createPool transaction: {str(result)}"} if isinstance(result, Exception)
+                else result.to_dict()
+                for result in results
+            ]
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to build transactions: {str(e)}")
+
+# Largest number of messages accepted by one batch proposal request
+PROPOSE_BATCH_MAX = int(os.getenv("PROPOSE_BATCH_MAX", "500"))
+
+def ndjson_response(items) -> StreamingResponse:
+    """Stream one JSON object per line, ending with a summary line so clients can tell a complete stream"""
+    async def body():
+        counts = {"rules": 0, "llm": 0, "error": 0}
+        try:
+            async for item in items:
+                counts["error" if "error" in item else item["resolved"]] += 1
+                yield dumps(item) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-band
+            yield dumps({"done": False, "detail": f"Failed to propose goals: {str(e)}"}) + b"\n"
+            return
+        yield dumps({"done": True, **counts}) + b"\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+def propose_batch_response(batch_data: dict, build_tx: bool) -> StreamingResponse:
+    body = decode_body(ProposeBatchInput, batch_data)
+    if len(body.messages) > PROPOSE_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {PROPOSE_BATCH_MAX} messages per batch")
+    if body.engine is not None and body.engine.lower() not in PROPOSE_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown propose engine: {body.engine}")
+    return ndjson_response(batch_proposer.run(body.messages, engine=body.engine, build_tx=build_tx))
+
+@app.post("/llm/propose/batch")
+async def propose_goal_batch(batch_data: dict):
+    """Propose goals for many messages, streaming one NDJSON line per message as it resolves"""
+    return propose_batch_response(batch_data, build_tx=False)
+
+@app.post("/llm/propose/build_tx/batch")
+async def propose_and_build_batch(batch_data: dict):
+    """Propose goals for many messages and encode their createPool transactions, streamed as NDJSON"""
+    return propose_batch_response(batch_data, build_tx=True)
+
 @app.post("/llm/chat/start")
 async def start_chat(chat_data: dict):
     """Start a new conversation with the LLM agent"""
+    body = decode_body(ChatInput, chat_data)
     try:
-        initial_message = chat_data.get("message", "")
-        conversation = await llm_agent.start_conversation(initial_message)
-        return conversation
+        conversation = await single_flight.do(
+            "/llm/chat/start", request_key("/llm/chat/start", None, body.message),
+            lambda: llm_agent.start_conversation(body.message)
+        )
+        return FastJSONResponse(conversation)
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start conversation: {str(e)}")
 
 @app.post("/llm/chat/continue")
 async def continue_chat(chat_data: dict):
     """Continue an existing conversation with the LLM agent"""
+    body = decode_body(ChatInput, chat_data)
     try:
-        state = chat_data.get("state", {})
-        user_message = chat_data.get("message", "")
-        conversation = await llm_agent.continue_conversation(state, user_message)
-        return conversation
+        conversation = await llm_agent.continue_conversation(body.state or {}, body.message)
+        return FastJSONResponse(conversation)
+    except SchemaError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid conversation state: {str(e)}")
+    except AdmissionRejected:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to continue conversation: {str(e)}")
 
+@app.post("/llm/chat/start/stream")
+async def start_chat_stream(chat_data: dict):
+    """Streaming variant of /llm/chat/start (Server-Sent Events)"""
+    # Shed before the stream opens; once headers are sent errors can only go in-band
+    body = decode_body(ChatInput, chat_data)
+    llm_admission.check()
+    return sse_response(llm_agent.stream_conversation(body.message))
+
+@app.post("/llm/chat/continue/stream")
+async def continue_chat_stream(chat_data: dict):
+    """Streaming variant of /llm/chat/continue (Server-Sent Events)"""
+    body = decode_body(ChatInput, chat_data)
+    llm_admission.check()
+    return sse_response(llm_agent.stream_continue_conversation(body.state or {}, body.message))
+
+@app.post("/llm/session/start")
+async def start_session(chat_data: dict):
+    """Start a server-side conversation session; only new messages are returned"""
+    body = decode_body(ChatInput, chat_data)
+    try:
+        session_id = await session_manager.create()
+        async with session_manager.turn_lock(session_id):
+            return FastJSONResponse(await llm_agent.start_session(session_id, body.message))
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start session: {str(e)}")
+
+@app.post("/llm/session/continue")
+async def continue_session(chat_data: dict):
+    """Continue a server-side conversation session with just {session_id, message}"""
+    body = decode_body(ChatInput, chat_data)
+    session_id = body.session_id
+    if not session_id or not await session_manager.touch(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    try:
+        async with session_manager.turn_lock(session_id):
+            return FastJSONResponse(await llm_agent.continue_session(session_id, body.message))
+    except SessionLockTimeout as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to continue session: {str(e)}")
+
+@app.post("/llm/session/start/stream")
+async def start_session_stream(chat_data: dict):
+    """Streaming variant of /llm/session/start (Server-Sent Events)"""
+    body = decode_body(ChatInput, chat_data)
+    llm_admission.check()
+    session_id = await session_manager.create()
+
+    async def events():
+        async with session_manager.turn_lock(session_id):
+            async for item in llm_agent.stream_start_session(session_id, body.message):
+                yield item
+
+    return sse_response(events())
+
+@app.post("/llm/session/continue/stream")
+async def continue_session_stream(chat_data: dict):
+    """Streaming variant of /llm/session/continue (Server-Sent Events)"""
+    body = decode_body(ChatInput, chat_data)
+    llm_admission.check()
+    session_id = body.session_id
+    if not session_id or not await session_manager.touch(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    async def events():
+        async with session_manager.turn_lock(session_id):
+            async for item in llm_agent.stream_continue_session(session_id, body.message):
+                yield item
+
+    return sse_response(events())
+
+@app.delete("/llm/session/{session_id}")
+async def end_session(session_id: str):
+    """Discard a conversation session and its stored state"""
+    if not await session_manager.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return {"session_id": session_id, "deleted": True}
+
+async def run_propose_job(body: JobInput) -> dict:
+    agent = await llm_agent.warm_up()
+    return (await agent.parse_goal(body.message, engine=body.engine)).to_dict()
+
+async def run_chat_start_job(body: JobInput) -> dict:
+    agent = await llm_agent.warm_up()
+    return await agent.start_conversation(body.message)
+
+async def run_chat_continue_job(body: JobInput) -> dict:
+    agent = await llm_agent.warm_up()
+    return await agent.continue_conversation(body.state or {}, body.message)
+
+job_manager.register("propose", run_propose_job)
+job_manager.register("chat_start", run_chat_start_job)
+job_manager.register("chat_continue", run_chat_continue_job)
+
+@app.post("/llm/jobs", status_code=202)
+async def create_job(job_data: dict):
+    """Run a propose or chat request in the background; poll GET /llm/jobs/{job_id} or pass a callback_url"""
+    body = decode_body(JobInput, job_data)
+    try:
+        job = await job_manager.submit(body.kind, body, body.callback_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to queue job: {str(e)}")
+    return FastJSONResponse({"job_id": job["job_id"], "status": job["status"],
+                             "status_url": f"/llm/jobs/{job['job_id']}"}, status_code=202)
+
+@app.get("/llm/jobs/{job_id}")
+async def get_job(job_id: str):
+    """A background job's status, and its result once it has finished"""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return FastJSONResponse(job)
+
+# Largest page /pools will return
+POOLS_MAX_LIMIT = 100
+
+async def ensure_pool_index():
+    if pool_indexer is None:
+        raise HTTPException(status_code=503, detail="Pool indexer is not configured (set RPC_URL)")
+    if await pool_store.get_synced_block() is None:
+        raise HTTPException(status_code=503, detail="Pool index is still syncing")
+
+def etag_response(request: Request, body: dict) -> Response:
+    """JSON response with a content ETag; a matching If-None-Match gets 304 with no body"""
+    payload = dumps(body)
+    etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+    # Clients may reuse the body only after revalidating it
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(payload, media_type="application/json", headers=headers)
+
+@app.get("/pools")
+async def list_pools(request: Request, status: Optional[str] = None, offset: int = 0, limit: int = 20):
+    """Indexed pools, newest first, optionally filtered by status"""
+    if status is not None and status not in POOL_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of {', '.join(POOL_STATUSES)}")
+    if offset < 0 or not 1 <= limit <= POOLS_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"offset must be >= 0 and limit between 1 and {POOLS_MAX_LIMIT}")
+    await ensure_pool_index()
+
+    try:
+        total, pools = await pool_store.list(status, offset, limit)
+        return etag_response(request, {
+            "pools": [pool_to_dict(pool) for pool in pools],
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "synced_block": await pool_store.get_synced_block()
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list pools: {str(e)}")
+
+# Seconds of silence after which /pools/stream sends a ping
+POOL_STREAM_PING_SECONDS = float(os.getenv("POOL_STREAM_PING_SECONDS", "15"))
+
+@app.get("/pools/stream")
+async def stream_pools(pool_ids: Optional[str] = None):
+    """Push pool diffs (new pools, raised_amount and status changes) as Server-Sent Events
+
+    pool_ids is an optional comma-separated list limiting the stream to those pools.
+    """
+    if pool_indexer is None:
+        raise HTTPException(status_code=503, detail="Pool indexer is not configured (set RPC_URL)")
+    try:
+        wanted = {int(pool_id) for pool_id in pool_ids.split(",") if pool_id.strip()} if pool_ids else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="pool_ids must be comma-separated integers")
+
+    subscription = pool_broadcaster.subscribe(wanted)
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many pool stream subscribers", headers={"Retry-After": "30"})
+
+    async def events():
+        try:
+            async for item in subscription.events(POOL_STREAM_PING_SECONDS):
+                yield item
+        finally:
+            pool_broadcaster.unsubscribe(subscription)
+
+    return sse_response(events())
+
+@app.get("/pools/{pool_id}")
+async def get_pool(request: Request, pool_id: int):
+    """One indexed pool"""
+    await ensure_pool_index()
+    pool = await pool_store.get(pool_id)
+    if pool is None:
+        raise HTTPException(status_code=404, detail="Pool not found")
+    return etag_response(request, pool_to_dict(pool))
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
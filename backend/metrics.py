@@ -0,0 +1,215 @@
+"""
+Minimal in-process metrics registry with Prometheus text exposition
+"""
+import bisect
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from fast tool calls up to multi-call agent turns
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Per-request phase timings (seconds) for the debug timing header
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter, optionally labelled"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, or be read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def set(self, value: float, **labels):
+        self._values[tuple(str(labels[name]) for name in self.labelnames)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        if self.callback is not None:
+            return [f"{self.name} {self.callback()}"]
+        return super().samples()
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally labelled"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {self._sums[key]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        # Re-registering (e.g. a module reload) returns the existing metric
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+              callback: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames, callback))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Agent hot path
+AGENT_NODE_SECONDS = REGISTRY.histogram("dreampool_agent_node_seconds", "Time spent in each agent graph node", ["node"])
+AGENT_NODE_ERRORS = REGISTRY.counter("dreampool_agent_node_errors_total", "Agent graph node failures", ["node"])
+LLM_CALL_SECONDS = REGISTRY.histogram("dreampool_llm_call_seconds", "Latency of LLM calls made by the agent")
+LLM_CALLS = REGISTRY.counter("dreampool_llm_calls_total", "LLM calls made by the agent", ["outcome"])
+LLM_TOKENS = REGISTRY.counter("dreampool_llm_tokens_total", "LLM tokens used by the agent", ["kind"])
+TOOL_INVOCATIONS = REGISTRY.counter("dreampool_tool_invocations_total", "Tool calls executed by the agent", ["tool"])
+TOOL_SECONDS = REGISTRY.histogram("dreampool_tool_seconds", "Tool execution time", ["tool"])
+SERIALIZE_SECONDS = REGISTRY.histogram("dreampool_serialize_seconds", "Time spent serializing conversation responses")
+
+# Admission control
+ADMISSION_WAIT_SECONDS = REGISTRY.histogram("dreampool_llm_admission_wait_seconds", "Time LLM calls waited for a concurrency slot")
+ADMISSION_REJECTIONS = REGISTRY.counter("dreampool_llm_admission_rejections_total",
+                                        "Requests shed by admission control or rate limiting", ["reason"])
+LLM_TRANSPORT_EVENTS = REGISTRY.counter("dreampool_llm_transport_events_total",
+                                        "LLM retries, hedges, circuit breaker trips and short-circuited calls", ["event"])
+SINGLE_FLIGHT_REQUESTS = REGISTRY.counter("dreampool_single_flight_requests_total",
+                                          "Requests that ran or joined an identical in-flight execution",
+                                          ["endpoint", "outcome"])
+MODEL_ROUTE_CALLS = REGISTRY.counter("dreampool_model_route_calls_total",
+                                     "Agent steps answered per route (rules, extraction, chat) and step kind", ["route", "step"])
+MODEL_ROUTE_SECONDS = REGISTRY.histogram("dreampool_model_route_seconds", "Agent step latency per route", ["route"])
+MODEL_ROUTE_COST = REGISTRY.counter("dreampool_model_route_cost_usd_total",
+                                    "Estimated LLM spend per route in USD", ["route"])
+
+# Background jobs
+JOBS = REGISTRY.counter("dreampool_jobs_total", "Background jobs by kind and status (queued, rejected, succeeded, failed)",
+                        ["kind", "status"])
+JOB_SECONDS = REGISTRY.histogram("dreampool_job_seconds", "Background job run time", ["kind"])
+JOB_CALLBACKS = REGISTRY.counter("dreampool_job_callbacks_total", "Job completion callbacks by outcome", ["outcome"])
+
+# Batch proposals
+PROPOSE_BATCH_ITEMS = REGISTRY.counter("dreampool_propose_batch_items_total",
+                                       "Batch proposal items by how they were resolved (rules, llm, error)", ["resolved"])
+
+# HTTP layer
+HTTP_REQUEST_SECONDS = REGISTRY.histogram("dreampool_http_request_seconds", "HTTP request latency",
+                                          ["method", "path", "status"])
+
+
+def start_request_timings() -> Dict[str, float]:
+    """Begin collecting phase timings for the current request"""
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def add_timing(phase: str, seconds: float):
+    """Add time spent in a phase to the current request's breakdown, if one is being collected"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+def server_timing_header(timings: Dict[str, float], total_seconds: float) -> str:
+    """Format a phase breakdown as a Server-Timing header value (milliseconds)"""
+    parts = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in timings.items()]
+    parts.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class timed:
+    """Context manager observing elapsed time into a histogram and the request breakdown"""
+
+    def __init__(self, histogram: Histogram, phase: Optional[str] = None, **labels):
+        self.histogram = histogram
+        self.phase = phase
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        self.histogram.observe(elapsed, **self.labels)
+        if self.phase:
+            add_timing(self.phase, elapsed)
+        return False
@@ -0,0 +1,144 @@
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from metrics import MODEL_ROUTE_CALLS, MODEL_ROUTE_COST, MODEL_ROUTE_SECONDS
+
+# Where a step can be answered: the rule engine, the cheap extraction model or the chat model
+ROUTES = ("rules", "extraction", "chat")
+
+# Routing policies: the routes a tool-selection step tries, in order, before the chat model
+ROUTING_POLICIES = {
+    "chat": (),
+    "rules": ("rules",),
+    "extraction": ("extraction",),
+    "rules+extraction": ("rules", "extraction"),
+}
+
+# A rule engine maps (user message, state) to (tool calls, confidence between 0 and 1)
+RuleEngine = Callable[[str, Dict[str, Any]], Tuple[List[Dict[str, Any]], float]]
+
+
+def step_kind(messages: Sequence[Any]) -> str:
+    """Whether the step picks tools for a new user message ("extraction") or answers the user ("reply")"""
+    last = messages[-1] if messages else None
+    return "extraction" if isinstance(last, HumanMessage) else "reply"
+
+
+def parse_prices(value: str) -> Tuple[float, float]:
+    """Parse "input,output" prices in USD per million tokens"""
+    prompt, completion = (float(part) for part in value.split(","))
+    return prompt, completion
+
+
+class RouteStats:
+    """Calls, escalations, latency, tokens and estimated cost of one route"""
+
+    def __init__(self, prices: Tuple[float, float] = (0.0, 0.0)):
+        self.prices = prices
+        self.calls = 0
+        self.escalations = 0
+        self.seconds = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+
+    def record(self, route: str, step: str, seconds: float, response: Any):
+        usage = getattr(response, "usage_metadata", None) or {}
+        prompt, completion = usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+        cost = (prompt * self.prices[0] + completion * self.prices[1]) / 1_000_000
+
+        self.calls += 1
+        self.seconds += seconds
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+        self.cost_usd += cost
+        MODEL_ROUTE_CALLS.inc(route=route, step=step)
+        MODEL_ROUTE_SECONDS.observe(seconds, route=route)
+        MODEL_ROUTE_COST.inc(cost, route=route)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "escalations": self.escalations,
+            "avg_seconds": round(self.seconds / self.calls, 4) if self.calls else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6)
+        }
+
+
+class ModelRouter:
+    """Sends tool-selection steps to the rule engine or a cheap model, and replies to the chat model
+
+    A route that isn't confident escalates to the next one: the rules when
+    their confidence is below ROUTER_MIN_CONFIDENCE, the extraction model when
+    it answers without calling a tool or fails with one of `escalate_on`.
+    User-facing replies always come from the chat model.
+    """
+
+    def __init__(self, chat_model, extraction_model=None, rules: Optional[RuleEngine] = None,
+                 policy: Optional[str] = None, min_confidence: Optional[float] = None,
+                 escalate_on: Tuple[type, ...] = ()):
+        self.models = {"chat": chat_model, "extraction": extraction_model}
+        self.rules = rules
+        self.escalate_on = escalate_on
+        self.policy = (policy or os.getenv("ROUTER_POLICY", "rules")).lower()
+        if self.policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy: {self.policy}")
+        self.min_confidence = min_confidence if min_confidence is not None else float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.6"))
+        self.stats = {
+            "rules": RouteStats(),
+            "extraction": RouteStats(parse_prices(os.getenv("ROUTER_EXTRACTION_PRICE_PER_1M", "0.10,0.40"))),
+            "chat": RouteStats(parse_prices(os.getenv("ROUTER_CHAT_PRICE_PER_1M", "0.15,0.60"))),
+        }
+
+    def chain(self) -> List[str]:
+        """Routes a tool-selection step tries under the current policy, ending with the chat model"""
+        routes = [route for route in ROUTING_POLICIES[self.policy]
+                  if (route == "rules" and self.rules is not None)
+                  or (route == "extraction" and self.models["extraction"] is not None)]
+        return routes + ["chat"]
+
+    async def _invoke(self, route: str, step: str, messages: List[Any], config: Optional[Any]) -> Any:
+        started = time.perf_counter()
+        response = await self.models[route].ainvoke(messages, config)
+        self.stats[route].record(route, step, time.perf_counter() - started, response)
+        return response
+
+    async def ainvoke(self, messages: List[Any], state: Dict[str, Any], config: Optional[Any] = None) -> Tuple[Any, str]:
+        """The response for this agent step and the route that produced it"""
+        step = step_kind(messages)
+        if step == "reply":
+            return await self._invoke("chat", step, messages, config), "chat"
+
+        for route in self.chain():
+            if route == "rules":
+                started = time.perf_counter()
+                calls, confidence = self.rules(str(messages[-1].content), state)
+                if calls and confidence >= self.min_confidence:
+                    response = AIMessage(content="", tool_calls=calls)
+                    self.stats["rules"].record("rules", step, time.perf_counter() - started, response)
+                    return response, "rules"
+                self.stats["rules"].escalations += 1
+
+            elif route == "extraction":
+                try:
+                    response = await self._invoke("extraction", step, messages, config)
+                except self.escalate_on:
+                    response = None
+                if getattr(response, "tool_calls", None):
+                    return response, "extraction"
+                self.stats["extraction"].escalations += 1
+
+            else:
+                return await self._invoke("chat", step, messages, config), "chat"
+
+    def stats_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "routes": self.chain(),
+            **{route: stats.as_dict() for route, stats in self.stats.items()}
+        }
@@ -0,0 +1,270 @@
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from abi_encoder import POOL_EVENT_TOPICS
+from pool_reader import SequentialPoolReader, create_pool_reader, pool_from_chain, pool_status
+from pool_stream import pool_diff
+from rpc_client import JSONRPCClient, RPCError
+from schemas import PoolData
+
+POOL_STATUSES = ("active", "completed", "expired")
+
+
+def _refresh_status(pool: PoolData, now: float) -> PoolData:
+    # Status depends on the clock, so it is recomputed whenever a pool is read
+    pool.status = pool_status(pool.finalized, pool.failed, pool.deadline, now)
+    return pool
+
+
+class InMemoryPoolStore:
+    """Indexed pools held in process memory"""
+
+    def __init__(self):
+        self._pools: Dict[int, PoolData] = {}
+        self.synced_block: Optional[int] = None
+
+    async def upsert(self, pools: Iterable[PoolData]):
+        for pool in pools:
+            self._pools[pool.pool_id] = pool
+
+    async def get(self, pool_id: int) -> Optional[PoolData]:
+        pool = self._pools.get(pool_id)
+        return _refresh_status(pool, time.time()) if pool else None
+
+    async def list(self, status: Optional[str] = None, offset: int = 0, limit: int = 20) -> Tuple[int, List[PoolData]]:
+        """Total matching pools and one page of them, newest first"""
+        now = time.time()
+        pools = [_refresh_status(self._pools[pool_id], now) for pool_id in sorted(self._pools, reverse=True)]
+        if status:
+            pools = [pool for pool in pools if pool.status == status]
+        return len(pools), pools[offset:offset + limit]
+
+    async def max_pool_id(self) -> int:
+        return max(self._pools, default=0)
+
+    async def unsettled_ids(self) -> List[int]:
+        """Pools that can still change on chain (not finalized or failed)"""
+        return [pool.pool_id for pool in self._pools.values() if not pool.finalized and not pool.failed]
+
+    async def get_synced_block(self) -> Optional[int]:
+        return self.synced_block
+
+    async def set_synced_block(self, block: int):
+        self.synced_block = block
+
+
+class SQLitePoolStore:
+    """Indexed pools in a SQLite file, so a restart resumes from the last synced block"""
+
+    _COLUMNS = "pool_id, creator, recipient, goal_amount, raised_amount, deadline, finalized, failed"
+    # Mirrors pool_status(); ? is the current time
+    _STATUS_SQL = "CASE WHEN finalized THEN 'completed' WHEN failed OR deadline < ? THEN 'expired' ELSE 'active' END"
+
+    def __init__(self, path: str = "pools.db"):
+        self.path = path
+        with self._connect() as conn:
+            # Amounts in wei overflow SQLite integers, so they are stored as text
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pools ("
+                "pool_id INTEGER PRIMARY KEY, creator TEXT NOT NULL, recipient TEXT NOT NULL, "
+                "goal_amount TEXT NOT NULL, raised_amount TEXT NOT NULL, deadline INTEGER NOT NULL, "
+                "finalized INTEGER NOT NULL, failed INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS pool_sync (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    @staticmethod
+    def _row_to_pool(row: Tuple) -> PoolData:
+        pool_id, creator, recipient, goal_amount, raised_amount, deadline, finalized, failed = row
+        return pool_from_chain(pool_id, {
+            "creator": creator,
+            "recipient": recipient,
+            "goal_amount": int(goal_amount),
+            "raised_amount": int(raised_amount),
+            "deadline": deadline,
+            "finalized": bool(finalized),
+            "failed": bool(failed)
+        })
+
+    def _upsert(self, pools: List[PoolData]):
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO pools ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(pool.pool_id, pool.creator, pool.recipient, str(pool.goal_amount), str(pool.raised_amount),
+                  pool.deadline, int(pool.finalized), int(pool.failed)) for pool in pools]
+            )
+
+    def _get(self, pool_id: int) -> Optional[PoolData]:
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {self._COLUMNS} FROM pools WHERE pool_id = ?", (pool_id,)).fetchone()
+        return self._row_to_pool(row) if row else None
+
+    def _list(self, status: Optional[str], offset: int, limit: int) -> Tuple[int, List[PoolData]]:
+        where, params = "", []
+        if status:
+            where, params = f"WHERE {self._STATUS_SQL} = ?", [time.time(), status]
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM pools {where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {self._COLUMNS} FROM pools {where} ORDER BY pool_id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return total, [self._row_to_pool(row) for row in rows]
+
+    def _scalar(self, sql: str, params: Tuple = ()) -> Any:
+        with self._connect() as conn:
+            row = conn.execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    def _set_synced_block(self, block: int):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO pool_sync (key, value) VALUES ('synced_block', ?)", (block,))
+
+    def _unsettled_ids(self) -> List[int]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT pool_id FROM pools WHERE NOT finalized AND NOT failed")]
+
+    async def upsert(self, pools: Iterable[PoolData]):
+        await asyncio.to_thread(self._upsert, list(pools))
+
+    async def get(self, pool_id: int) -> Optional[PoolData]:
+        return await asyncio.to_thread(self._get, pool_id)
+
+    async def list(self, status: Optional[str] = None, offset: int = 0, limit: int = 20) -> Tuple[int, List[PoolData]]:
+        """Total matching pools and one page of them, newest first"""
+        return await asyncio.to_thread(self._list, status, offset, limit)
+
+    async def max_pool_id(self) -> int:
+        return await asyncio.to_thread(self._scalar, "SELECT COALESCE(MAX(pool_id), 0) FROM pools")
+
+    async def unsettled_ids(self) -> List[int]:
+        """Pools that can still change on chain (not finalized or failed)"""
+        return await asyncio.to_thread(self._unsettled_ids)
+
+    async def get_synced_block(self) -> Optional[int]:
+        return await asyncio.to_thread(self._scalar, "SELECT value FROM pool_sync WHERE key = 'synced_block'")
+
+    async def set_synced_block(self, block: int):
+        await asyncio.to_thread(self._set_synced_block, block)
+
+
+class PoolIndexer:
+    """Keeps a pool store in sync with the contract through any JSON-RPC client
+
+    The first sync reads every pool. Later syncs read only pools created since
+    the last one and pools named in contract events (deposits, finalization,
+    refunds) from the blocks in between, so a sync costs O(changes) RPC calls
+    rather than O(pools). The rpc object only needs `async call(method, params)`;
+    pools are read through `reader` (see pool_reader.py), sequentially by default.
+    """
+
+    def __init__(self, rpc, store, contract_address: str, poll_interval: Optional[float] = None,
+                 log_block_range: Optional[int] = None, reader=None, broadcaster=None):
+        self.rpc = rpc
+        self.store = store
+        self.contract_address = contract_address
+        self.reader = reader or SequentialPoolReader(rpc, contract_address)
+        # Receives the diff of every re-read pool (see pool_stream.py)
+        self.broadcaster = broadcaster
+        self.poll_interval = poll_interval if poll_interval is not None else float(os.getenv("POOL_INDEXER_POLL_SECONDS", "15"))
+        # Most blocks asked for in one eth_getLogs call; public nodes cap the range
+        self.log_block_range = log_block_range if log_block_range is not None else int(os.getenv("POOL_INDEXER_LOG_RANGE", "2000"))
+        self._task: Optional[asyncio.Task] = None
+
+    async def changed_pool_ids(self, from_block: int, to_block: int) -> set:
+        """Pool ids named in contract events between two blocks (inclusive)"""
+        pool_ids = set()
+        for start in range(from_block, to_block + 1, self.log_block_range):
+            end = min(start + self.log_block_range - 1, to_block)
+            logs = await self.rpc.call("eth_getLogs", [{
+                "address": self.contract_address,
+                "fromBlock": hex(start),
+                "toBlock": hex(end),
+                "topics": [list(POOL_EVENT_TOPICS)]
+            }])
+            pool_ids.update(int(log["topics"][1], 16) for log in logs if len(log.get("topics", [])) > 1)
+        return pool_ids
+
+    async def sync(self) -> List[int]:
+        """Bring the store up to the chain head; returns the ids of the pools that were re-read"""
+        # Head first: anything that happens after it is picked up by the next sync
+        head = int(await self.rpc.call("eth_blockNumber", []), 16)
+        count = await self.reader.pool_count()
+        synced_block = await self.store.get_synced_block()
+
+        dirty = set(range(await self.store.max_pool_id() + 1, count + 1))
+        if synced_block is not None and head > synced_block:
+            try:
+                dirty |= await self.changed_pool_ids(synced_block + 1, head)
+            except RPCError:
+                # No usable logs (pruned node, range limits): re-read every pool that can still change
+                dirty |= set(await self.store.unsettled_ids())
+
+        pool_ids = sorted(pool_id for pool_id in dirty if 1 <= pool_id <= count)
+        diffs = []
+        if pool_ids:
+            pools = await self.reader.read_pools(pool_ids)
+            # The initial backfill is not news to anyone, so only later syncs are broadcast
+            if self.broadcaster is not None and synced_block is not None:
+                diffs = await self._diffs(pools)
+            await self.store.upsert(pools)
+        await self.store.set_synced_block(head)
+        if diffs:
+            self.broadcaster.publish(diffs, head)
+        return pool_ids
+
+    async def _diffs(self, pools: List[PoolData]) -> List[Dict[str, Any]]:
+        diffs = []
+        for pool in pools:
+            diff = pool_diff(await self.store.get(pool.pool_id), pool)
+            if diff is not None:
+                diffs.append(diff)
+        return diffs
+
+    async def run(self):
+        """Sync forever, every poll_interval seconds"""
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"⚠️  Pool indexer sync failed: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def create_pool_store(kind: Optional[str] = None, db_path: Optional[str] = None):
+    """Create the store that holds indexed pools"""
+    kind = (kind or os.getenv("POOL_STORE", "memory")).lower()
+    if kind == "memory":
+        return InMemoryPoolStore()
+    if kind == "sqlite":
+        return SQLitePoolStore(db_path or os.getenv("POOL_DB_PATH", "pools.db"))
+    raise ValueError(f"Unknown pool store: {kind}")
+
+
+def create_pool_indexer(store, broadcaster=None) -> Optional[PoolIndexer]:
+    """Build the pool indexer configured by the environment, or None when no RPC_URL is set"""
+    rpc_url = os.getenv("RPC_URL")
+    if not rpc_url:
+        return None
+    contract_address = os.getenv("CONTRACT_ADDRESS", "0x1234567890123456789012345678901234567890")
+    rpc = JSONRPCClient(rpc_url)
+    return PoolIndexer(rpc, store, contract_address, reader=create_pool_reader(rpc, contract_address),
+                       broadcaster=broadcaster)
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from abi_encoder import (
+    MULTICALL3_ADDRESS, POOL_COUNT_SELECTOR, decode_aggregate3_results, decode_get_pool,
+    encode_aggregate3_calldata, encode_get_pool_calldata
+)
+from rpc_client import RPCError
+from schemas import PoolData
+
+# How pools are read: one eth_call each, JSON-RPC batches, or Multicall3 aggregate3 calls
+POOL_READER_MODES = ("sequential", "batch", "multicall")
+
+
+def pool_status(finalized: bool, failed: bool, deadline: int, now: Optional[float] = None) -> str:
+    """Same status rules as the frontend: finalized pools are completed, failed or past-deadline ones expired"""
+    now = time.time() if now is None else now
+    if finalized:
+        return "completed"
+    if failed or now > deadline:
+        return "expired"
+    return "active"
+
+
+def pool_from_chain(pool_id: int, fields: Dict[str, Any]) -> PoolData:
+    """PoolData for a decoded getPool result (the contract stores no title or description)"""
+    creator = fields["creator"]
+    return PoolData(
+        pool_id=pool_id,
+        recipient=fields["recipient"],
+        goal_amount=fields["goal_amount"],
+        deadline=fields["deadline"],
+        raised_amount=fields["raised_amount"],
+        status=pool_status(fields["finalized"], fields["failed"], fields["deadline"]),
+        title="DreamPool Goal",
+        description=f"Pool created by {creator[:6]}...{creator[-4:]}",
+        creator=creator,
+        finalized=fields["finalized"],
+        failed=fields["failed"]
+    )
+
+
+def pool_to_dict(pool: PoolData) -> Dict[str, Any]:
+    return pool.to_dict()
+
+
+def _decode_pool(pool_id: int, data: bytes) -> PoolData:
+    return pool_from_chain(pool_id, decode_get_pool(data))
+
+
+class SequentialPoolReader:
+    """Reads each pool with its own eth_call, one round-trip after another"""
+
+    def __init__(self, rpc, contract_address: str):
+        self.rpc = rpc
+        self.contract_address = contract_address
+
+    async def _eth_call(self, data: bytes, to: Optional[str] = None) -> bytes:
+        result = await self.rpc.call("eth_call", [{"to": to or self.contract_address, "data": "0x" + data.hex()}, "latest"])
+        return bytes.fromhex(result[2:])
+
+    async def pool_count(self) -> int:
+        return int.from_bytes(await self._eth_call(POOL_COUNT_SELECTOR), "big")
+
+    async def read_pools(self, pool_ids: List[int]) -> List[PoolData]:
+        pools = []
+        for pool_id in pool_ids:
+            pools.append(_decode_pool(pool_id, await self._eth_call(encode_get_pool_calldata(pool_id))))
+        return pools
+
+
+class BatchedPoolReader(SequentialPoolReader):
+    """Reads pools in chunks of batch_size, each chunk one HTTP round-trip
+
+    mode="batch" sends a chunk as a JSON-RPC batch of getPool eth_calls (the
+    rpc client needs `async batch(calls)`); mode="multicall" packs the chunk
+    into a single Multicall3 aggregate3 eth_call, which also works on nodes
+    that reject batches. Up to `concurrency` chunks are in flight at once.
+    """
+
+    def __init__(self, rpc, contract_address: str, mode: str = "batch", batch_size: int = 50,
+                 concurrency: int = 4, multicall_address: str = MULTICALL3_ADDRESS):
+        if mode not in ("batch", "multicall"):
+            raise ValueError(f"Unknown batched pool reader mode: {mode}")
+        super().__init__(rpc, contract_address)
+        self.mode = mode
+        self.batch_size = batch_size
+        self.multicall_address = multicall_address
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _read_json_rpc_batch(self, pool_ids: List[int]) -> List[bytes]:
+        results = await self.rpc.batch([
+            ("eth_call", [{"to": self.contract_address, "data": "0x" + encode_get_pool_calldata(pool_id).hex()}, "latest"])
+            for pool_id in pool_ids
+        ])
+        for pool_id, result in zip(pool_ids, results):
+            if isinstance(result, Exception):
+                raise RPCError(f"getPool({pool_id}) failed: {str(result)}")
+        return [bytes.fromhex(result[2:]) for result in results]
+
+    async def _read_multicall(self, pool_ids: List[int]) -> List[bytes]:
+        calldata = encode_aggregate3_calldata(self.contract_address, [encode_get_pool_calldata(pool_id) for pool_id in pool_ids])
+        results = decode_aggregate3_results(await self._eth_call(calldata, to=self.multicall_address))
+        if len(results) != len(pool_ids):
+            raise RPCError(f"aggregate3 returned {len(results)} results for {len(pool_ids)} calls")
+        for pool_id, (success, _) in zip(pool_ids, results):
+            if not success:
+                raise RPCError(f"getPool({pool_id}) reverted")
+        return [data for _, data in results]
+
+    async def _read_chunk(self, pool_ids: List[int]) -> List[PoolData]:
+        async with self._semaphore:
+            if self.mode == "batch":
+                encoded = await self._read_json_rpc_batch(pool_ids)
+            else:
+                encoded = await self._read_multicall(pool_ids)
+        return [_decode_pool(pool_id, data) for pool_id, data in zip(pool_ids, encoded)]
+
+    async def read_pools(self, pool_ids: List[int]) -> List[PoolData]:
+        chunks = [pool_ids[i:i + self.batch_size] for i in range(0, len(pool_ids), self.batch_size)]
+        pages = await asyncio.gather(*[self._read_chunk(chunk) for chunk in chunks])
+        return [pool for page in pages for pool in page]
+
+
+def create_pool_reader(rpc, contract_address: str, mode: Optional[str] = None):
+    """Build the pool reader configured by the environment"""
+    mode = (mode or os.getenv("POOL_READER_MODE", "batch")).lower()
+    if mode == "sequential":
+        return SequentialPoolReader(rpc, contract_address)
+    if mode in POOL_READER_MODES:
+        return BatchedPoolReader(
+            rpc, contract_address, mode=mode,
+            batch_size=int(os.getenv("POOL_READER_BATCH_SIZE", "50")),
+            concurrency=int(os.getenv("POOL_READER_CONCURRENCY", "4")),
+            multicall_address=os.getenv("MULTICALL3_ADDRESS", MULTICALL3_ADDRESS)
+        )
+    raise ValueError(f"Unknown pool reader mode: {mode}")
@@ -0,0 +1,90 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from pool_reader import pool_to_dict
+from schemas import PoolData
+
+# Fields a pool can change after creation
+MUTABLE_POOL_FIELDS = ("raised_amount", "status", "finalized", "failed")
+
+
+def pool_diff(old: Optional[PoolData], new: PoolData) -> Optional[Dict[str, Any]]:
+    """The change between two reads of a pool, or None if nothing a client shows changed"""
+    if old is None:
+        return {"pool_id": new.pool_id, "type": "created", "pool": pool_to_dict(new)}
+    changes = {field: getattr(new, field) for field in MUTABLE_POOL_FIELDS if getattr(old, field) != getattr(new, field)}
+    if not changes:
+        return None
+    return {"pool_id": new.pool_id, "type": "updated", "changes": changes}
+
+
+class PoolSubscription:
+    """One client's bounded queue of pool diffs, optionally limited to some pool ids"""
+
+    def __init__(self, pool_ids: Optional[Set[int]], queue_size: int):
+        self.pool_ids = pool_ids
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.resyncs = 0
+
+    def wants(self, pool_id: int) -> bool:
+        return self.pool_ids is None or pool_id in self.pool_ids
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        """Queue an event without waiting; a full queue is replaced by a single resync event"""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            # The client fell behind: its backlog is dropped and it is told to refetch /pools
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"event": "resync", "data": {"synced_block": event["data"].get("synced_block")}})
+            self.resyncs += 1
+            return False
+
+    async def events(self, ping_seconds: float) -> AsyncIterator[Dict[str, Any]]:
+        """Queued events, with a ping after ping_seconds of silence to keep proxies from closing the stream"""
+        while True:
+            try:
+                yield await asyncio.wait_for(self.queue.get(), timeout=ping_seconds)
+            except asyncio.TimeoutError:
+                yield {"event": "ping", "data": {}}
+
+
+class PoolBroadcaster:
+    """Fans pool diffs from the single indexer poller out to every subscribed client
+
+    Publishing never waits on a client: each subscriber has a bounded queue, and
+    one that stops reading is sent a resync instead of holding up the others.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None, max_subscribers: Optional[int] = None):
+        self.queue_size = queue_size if queue_size is not None else int(os.getenv("POOL_STREAM_QUEUE_SIZE", "100"))
+        self.max_subscribers = max_subscribers if max_subscribers is not None else int(os.getenv("POOL_STREAM_MAX_SUBSCRIBERS", "5000"))
+        self._subscriptions: Set[PoolSubscription] = set()
+        self.published = 0
+        self.resyncs = 0
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, pool_ids: Optional[Iterable[int]] = None) -> Optional[PoolSubscription]:
+        """New subscription, or None when the subscriber limit is reached"""
+        if len(self._subscriptions) >= self.max_subscribers:
+            return None
+        subscription = PoolSubscription(set(pool_ids) if pool_ids else None, self.queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: PoolSubscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, diffs: List[Dict[str, Any]], synced_block: int):
+        """Deliver diffs to the subscribers that want them"""
+        for diff in diffs:
+            event = {"event": "pool", "data": {**diff, "synced_block": synced_block}}
+            self.published += 1
+            for subscription in list(self._subscriptions):
+                if subscription.wants(diff["pool_id"]) and not subscription.offer(event):
+                    self.resyncs += 1
@@ -0,0 +1,81 @@
+import os
+from typing import Any, List, Optional, Sequence, Tuple
+
+import httpx
+
+
+class RPCError(Exception):
+    """Error returned by a JSON-RPC node, or a malformed response"""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class JSONRPCClient:
+    """Ethereum JSON-RPC over HTTP with a pooled keep-alive connection"""
+
+    def __init__(self, url: str, timeout: Optional[float] = None, http_client: Optional[httpx.AsyncClient] = None):
+        self.url = url
+        timeout = timeout if timeout is not None else float(os.getenv("RPC_TIMEOUT_SECONDS", "10"))
+        max_connections = int(os.getenv("RPC_MAX_CONNECTIONS", "10"))
+        # Connections are kept alive between calls instead of a new TLS handshake per request
+        self.http = http_client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self._next_id = 0
+
+    async def call(self, method: str, params: List[Any]) -> Any:
+        self._next_id += 1
+        response = await self.http.post(self.url, json={
+            "jsonrpc": "2.0",
+            "id": self._next_id,
+            "method": method,
+            "params": params
+        })
+        response.raise_for_status()
+        body = response.json()
+        if "error" in body:
+            error = body["error"] or {}
+            raise RPCError(f"{method} failed: {error.get('message', error)}", error.get("code"))
+        if "result" not in body:
+            raise RPCError(f"{method} returned no result")
+        return body["result"]
+
+    async def batch(self, calls: Sequence[Tuple[str, List[Any]]]) -> List[Any]:
+        """Send several calls as one JSON-RPC batch request
+
+        Returns one entry per call, in order: the result, or an RPCError for a
+        call the node rejected. A failed request as a whole raises.
+        """
+        if not calls:
+            return []
+        first_id = self._next_id + 1
+        self._next_id += len(calls)
+        response = await self.http.post(self.url, json=[
+            {"jsonrpc": "2.0", "id": first_id + i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ])
+        response.raise_for_status()
+        body = response.json()
+        if not isinstance(body, list):
+            error = (body.get("error") or {}) if isinstance(body, dict) else {}
+            raise RPCError(f"Batch request failed: {error.get('message', body)}", error.get("code"))
+
+        # Nodes may answer a batch in any order
+        by_id = {item.get("id"): item for item in body}
+        results = []
+        for i, (method, _) in enumerate(calls):
+            item = by_id.get(first_id + i)
+            if item is None:
+                results.append(RPCError(f"{method} missing from batch response"))
+            elif "error" in item:
+                error = item["error"] or {}
+                results.append(RPCError(f"{method} failed: {error.get('message', error)}", error.get("code")))
+            else:
+                results.append(item.get("result"))
+        return results
+
+    async def aclose(self):
+        await self.http.aclose()
@@ -1,12 +1,119 @@
-from typing import Optional
-from datetime import datetime
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
-# Basic data classes without Pydantic for now
-class ChatInput:
-    def __init__(self, message: str):
+# Compact slotted records without Pydantic: each lists its (name, types, default)
+# FIELDS once, which drives validation when decoding a payload and to_dict()
+# when encoding one. A default of REQUIRED makes the field mandatory; a default
+# of None also accepts null.
+REQUIRED = object()
+
+ADDRESS_PATTERN = re.compile(r"^0x[0-9a-fA-F]{40}$")
+
+
+class SchemaError(ValueError):
+    """A payload field is missing or has the wrong type"""
+
+
+class Schema:
+    __slots__ = ()
+    FIELDS: Tuple[Tuple[str, tuple, Any], ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name, _, _ in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Any):
+        """Decode and validate a JSON object; unknown keys are ignored"""
+        if not isinstance(data, dict):
+            raise SchemaError(f"{cls.__name__} must be an object")
+        values = {}
+        for name, types, default in cls.FIELDS:
+            value = data.get(name, default)
+            if value is REQUIRED:
+                raise SchemaError(f"{name} is required")
+            # bool is an int subclass, but true is not a valid amount
+            if value is not None or default is not None:
+                if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                    expected = " or ".join(t.__name__ for t in types)
+                    raise SchemaError(f"{name} must be {expected}, got {type(value).__name__}")
+            values[name] = value
+        record = cls(**values)
+        record.validate()
+        return record
+
+    def validate(self):
+        """Checks on decoded values beyond their types; raises SchemaError"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+
+# Values of the propose endpoints' "engine" field, checked before the agent is loaded
+PROPOSE_ENGINES = ("react", "structured")
+
+
+class ChatInput(Schema):
+    """Body of the /llm/propose, /llm/chat/* and /llm/session/* requests"""
+    __slots__ = ("message", "engine", "session_id", "state")
+    FIELDS = (
+        ("message", (str,), ""),
+        ("engine", (str,), None),
+        ("session_id", (str,), None),
+        ("state", (dict,), None),
+    )
+
+    def __init__(self, message: str = "", engine: Optional[str] = None, session_id: Optional[str] = None,
+                 state: Optional[Dict[str, Any]] = None):
+        self.message = message
+        self.engine = engine
+        self.session_id = session_id
+        self.state = state
+
+
+class JobInput(Schema):
+    """Body of POST /llm/jobs: the kind of request to run in the background and its inputs"""
+    __slots__ = ("kind", "message", "engine", "state", "callback_url")
+    FIELDS = (
+        ("kind", (str,), REQUIRED),
+        ("message", (str,), ""),
+        ("engine", (str,), None),
+        ("state", (dict,), None),
+        ("callback_url", (str,), None),
+    )
+
+    def __init__(self, kind: str, message: str = "", engine: Optional[str] = None,
+                 state: Optional[Dict[str, Any]] = None, callback_url: Optional[str] = None):
+        self.kind = kind
         self.message = message
+        self.engine = engine
+        self.state = state
+        self.callback_url = callback_url
+
+
+class ProposeBatchInput(Schema):
+    """Body of the /llm/propose/batch requests: one goal message per entry"""
+    __slots__ = ("messages", "engine")
+    FIELDS = (
+        ("messages", (list,), REQUIRED),
+        ("engine", (str,), None),
+    )
+
+    def __init__(self, messages: List[Any], engine: Optional[str] = None):
+        self.messages = messages
+        self.engine = engine
+
+
+class ProposedGoal(Schema):
+    __slots__ = ("title", "cost_eth", "deadline_days", "recipient", "description")
+    FIELDS = (
+        ("title", (str,), ""),
+        ("cost_eth", (int, float), 0),
+        ("deadline_days", (int,), 30),
+        ("recipient", (str,), REQUIRED),
+        ("description", (str, type(None)), ""),
+    )
 
-class ProposedGoal:
     def __init__(self, title: str, cost_eth: float, deadline_days: int, recipient: str, description: Optional[str] = None):
         self.title = title
         self.cost_eth = cost_eth
@@ -14,15 +121,48 @@ class ProposedGoal:
         self.recipient = recipient
         self.description = description
 
-class EncodedTx:
+    def validate(self):
+        # Caught here as a 400 instead of failing in the encoder as a 500
+        if not ADDRESS_PATTERN.match(self.recipient):
+            raise SchemaError(f"recipient must be a 0x-prefixed 40 hex digit address, got {self.recipient!r}")
+        if not math.isfinite(self.cost_eth) or self.cost_eth < 0:
+            raise SchemaError(f"cost_eth must be a non-negative number, got {self.cost_eth}")
+
+
+class EncodedTx(Schema):
+    __slots__ = ("to", "data", "value")
+    FIELDS = (
+        ("to", (str,), REQUIRED),
+        ("data", (str,), REQUIRED),
+        ("value", (int,), 0),
+    )
+
     def __init__(self, to: str, data: str, value: int = 0):
         self.to = to
         self.data = data
         self.value = value
 
-class PoolData:
-    def __init__(self, pool_id: int, recipient: str, goal_amount: int, deadline: int, 
-                 raised_amount: int, status: str, title: str, description: str):
+
+class PoolData(Schema):
+    __slots__ = ("pool_id", "recipient", "creator", "goal_amount", "deadline", "raised_amount", "status",
+                 "title", "description", "finalized", "failed")
+    FIELDS = (
+        ("pool_id", (int,), REQUIRED),
+        ("recipient", (str,), REQUIRED),
+        ("creator", (str,), ""),
+        ("goal_amount", (int,), REQUIRED),
+        ("deadline", (int,), REQUIRED),
+        ("raised_amount", (int,), REQUIRED),
+        ("status", (str,), REQUIRED),
+        ("title", (str,), REQUIRED),
+        ("description", (str,), REQUIRED),
+        ("finalized", (bool,), False),
+        ("failed", (bool,), False),
+    )
+
+    def __init__(self, pool_id: int, recipient: str, goal_amount: int, deadline: int,
+                 raised_amount: int, status: str, title: str, description: str,
+                 creator: str = "", finalized: bool = False, failed: bool = False):
         self.pool_id = pool_id
         self.recipient = recipient
         self.goal_amount = goal_amount
@@ -31,8 +171,61 @@ class PoolData:
         self.status = status
         self.title = title
         self.description = description
+        self.creator = creator
+        self.finalized = finalized
+        self.failed = failed
+
+
+class ConversationMessage(Schema):
+    """One message as exchanged with clients and stored in sessions; empty optional fields are omitted"""
+    __slots__ = ("type", "content", "tool_calls", "tool_call_id", "name")
+    FIELDS = (
+        ("type", (str,), REQUIRED),
+        ("content", (str, list), ""),
+        ("tool_calls", (list,), None),
+        ("tool_call_id", (str,), None),
+        ("name", (str,), None),
+    )
+
+    def __init__(self, type: str, content: Any = "", tool_calls: Optional[list] = None,
+                 tool_call_id: Optional[str] = None, name: Optional[str] = None):
+        self.type = type
+        self.content = content
+        self.tool_calls = tool_calls
+        self.tool_call_id = tool_call_id
+        self.name = name
+
+    @staticmethod
+    def encode(message: Any) -> Dict[str, Any]:
+        """Dict for a LangChain message, built directly on the per-turn hot path"""
+        data = {"type": message.__class__.__name__, "content": message.content}
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            data["tool_calls"] = tool_calls
+        tool_call_id = getattr(message, "tool_call_id", None)
+        if tool_call_id:
+            data["tool_call_id"] = tool_call_id
+        name = getattr(message, "name", None)
+        if name:
+            data["name"] = name
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"type": self.type, "content": self.content}
+        for name in ("tool_calls", "tool_call_id", "name"):
+            value = getattr(self, name)
+            if value:
+                data[name] = value
+        return data
+
+
+class ErrorResponse(Schema):
+    __slots__ = ("error", "detail")
+    FIELDS = (
+        ("error", (str,), REQUIRED),
+        ("detail", (str,), None),
+    )
 
-class ErrorResponse:
     def __init__(self, error: str, detail: Optional[str] = None):
         self.error = error
         self.detail = detail
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+class SessionLockTimeout(Exception):
+    """Another worker held a session's turn lock for too long"""
+
+
+class SessionManager:
+    """Conversation sessions kept in a state backend, so any worker can serve any turn
+
+    Each session is one key holding the serialized conversation state, expiring
+    after SESSION_TTL_SECONDS without a turn. The in-process LRU only tracks the
+    sessions this worker has served; with a process-local backend it also caps
+    how many are kept.
+    """
+
+    def __init__(self, state, ttl_seconds: Optional[float] = None, max_sessions: Optional[int] = None,
+                 lock_ttl_seconds: Optional[float] = None):
+        self.state = state
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+        self.max_sessions = max_sessions if max_sessions is not None else int(os.getenv("SESSION_MAX", "1000"))
+        # Longest a turn may hold the cross-worker lock before it is considered abandoned
+        self.lock_ttl_seconds = lock_ttl_seconds if lock_ttl_seconds is not None else float(os.getenv("SESSION_LOCK_TTL_SECONDS", "120"))
+
+        # session_id -> last access time, least recently used first
+        self._sessions: "OrderedDict[str, float]" = OrderedDict()
+        self._turn_locks: Dict[str, asyncio.Lock] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def key(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def create(self) -> str:
+        """Register a new session and return its id"""
+        session_id = uuid.uuid4().hex
+        await self.state.set(self.key(session_id), "{}", self.ttl_seconds)
+        async with self._lock:
+            self._sessions[session_id] = time.monotonic()
+            await self._evict_locked()
+        return session_id
+
+    async def touch(self, session_id: str) -> bool:
+        """Mark a session as used; returns False if it is unknown or expired"""
+        # Sessions started on another worker are found through the shared backend
+        if not await self.state.expire(self.key(session_id), self.ttl_seconds):
+            async with self._lock:
+                self._sessions.pop(session_id, None)
+            return False
+
+        async with self._lock:
+            self._sessions[session_id] = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            await self._evict_locked()
+            return self.state.shared or session_id in self._sessions
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """The stored conversation state, {} for a session with no turns yet, or None"""
+        value = await self.state.get(self.key(session_id))
+        return json.loads(value) if value is not None else None
+
+    async def save(self, session_id: str, state: Dict[str, Any]):
+        """Store the conversation state after a turn, restarting the TTL"""
+        await self.state.set(self.key(session_id), json.dumps(state), self.ttl_seconds)
+
+    @asynccontextmanager
+    async def turn_lock(self, session_id: str) -> AsyncIterator[None]:
+        """Serialize turns of the same session, across workers when the backend is shared"""
+        if session_id not in self._turn_locks:
+            self._turn_locks[session_id] = asyncio.Lock()
+
+        async with self._turn_locks[session_id]:
+            if not self.state.shared:
+                yield
+                return
+
+            lock_key = f"lock:{self.key(session_id)}"
+            token = uuid.uuid4().hex
+            deadline = time.monotonic() + self.lock_ttl_seconds
+            while not await self.state.set_if_absent(lock_key, token, self.lock_ttl_seconds):
+                if time.monotonic() > deadline:
+                    raise SessionLockTimeout(f"Session {session_id} is busy")
+                await asyncio.sleep(0.05)
+            try:
+                yield
+            finally:
+                # Only release our own lock; it may have expired and been taken over
+                await self.state.delete_if_equals(lock_key, token)
+
+    async def delete(self, session_id: str) -> bool:
+        """Drop a session and its stored state"""
+        async with self._lock:
+            self._sessions.pop(session_id, None)
+            self._turn_locks.pop(session_id, None)
+        return await self.state.delete(self.key(session_id))
+
+    async def _evict_locked(self) -> List[str]:
+        """Remove expired sessions, then least recently used ones over the limit"""
+        evicted = []
+        cutoff = time.monotonic() - self.ttl_seconds
+
+        while self._sessions:
+            session_id, last_used = next(iter(self._sessions.items()))
+            if last_used >= cutoff and len(self._sessions) <= self.max_sessions:
+                break
+            self._sessions.popitem(last=False)
+            evicted.append(session_id)
+
+        for session_id in evicted:
+            self._turn_locks.pop(session_id, None)
+            # A shared backend expires sessions by TTL; other workers may still be using them
+            if not self.state.shared:
+                await self.state.delete(self.key(session_id))
+        return evicted
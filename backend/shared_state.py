@@ -0,0 +1,291 @@
+import asyncio
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import List, Optional
+from urllib.parse import urlparse
+
+
+class InMemoryStateBackend:
+    """Key/value state with TTLs in process memory; only visible to one worker"""
+
+    # Whether other processes see the same keys
+    shared = False
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        # key -> (expires_at or None, value), least recently written first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _live(self, key: str) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._live(key)
+        return entry[1] if entry else None
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[float] = None):
+        self._entries[key] = (time.monotonic() + ttl_seconds if ttl_seconds else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        if self._live(key) is not None:
+            return False
+        await self.set(key, value, ttl_seconds)
+        return True
+
+    async def expire(self, key: str, ttl_seconds: float) -> bool:
+        """Reset a key's TTL; False if it does not exist"""
+        entry = self._live(key)
+        if entry is None:
+            return False
+        self._entries[key] = (time.monotonic() + ttl_seconds, entry[1])
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        """Delete a key only while it still holds value; False if it expired or changed"""
+        entry = self._live(key)
+        if entry is None or entry[1] != value:
+            return False
+        del self._entries[key]
+        return True
+
+    async def close(self):
+        pass
+
+
+class SQLiteStateBackend:
+    """Key/value state in a SQLite file in WAL mode, shared by every worker on the host"""
+
+    shared = True
+
+    def __init__(self, path: str = "state.db"):
+        self.path = path
+        with self._connect() as conn:
+            # WAL lets readers proceed while another worker writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS state_expires_at ON state (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _expires_at(ttl_seconds: Optional[float]) -> Optional[float]:
+        return time.time() + ttl_seconds if ttl_seconds else None
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str, ttl_seconds: Optional[float]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._expires_at(ttl_seconds))
+            )
+            conn.execute("DELETE FROM state WHERE expires_at <= ?", (time.time(),))
+
+    def _set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float]) -> bool:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM state WHERE key = ? AND expires_at <= ?", (key, time.time()))
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._expires_at(ttl_seconds))
+            )
+            return cursor.rowcount == 1
+
+    def _expire(self, key: str, ttl_seconds: float) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE state SET expires_at = ? WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (self._expires_at(ttl_seconds), key, time.time())
+            )
+            return cursor.rowcount == 1
+
+    def _delete(self, key: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM state WHERE key = ?", (key,)).rowcount == 1
+
+    def _delete_if_equals(self, key: str, value: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM state WHERE key = ? AND value = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, value, time.time())
+            ).rowcount == 1
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[float] = None):
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+    async def set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        return await asyncio.to_thread(self._set_if_absent, key, value, ttl_seconds)
+
+    async def expire(self, key: str, ttl_seconds: float) -> bool:
+        """Reset a key's TTL; False if it does not exist"""
+        return await asyncio.to_thread(self._expire, key, ttl_seconds)
+
+    async def delete(self, key: str) -> bool:
+        return await asyncio.to_thread(self._delete, key)
+
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        """Delete a key only while it still holds value; False if it expired or changed"""
+        return await asyncio.to_thread(self._delete_if_equals, key, value)
+
+    async def close(self):
+        pass
+
+
+# Compare-and-delete, run atomically by the server
+DELETE_IF_EQUALS_SCRIPT = 'if redis.call("GET", KEYS[1]) == ARGV[1] then return redis.call("DEL", KEYS[1]) else return 0 end'
+
+
+class RedisError(Exception):
+    """Error reply from a Redis server"""
+
+
+class RedisStateBackend:
+    """Key/value state in Redis (or anything speaking RESP), shared by every worker and host
+
+    Talks RESP2 directly over asyncio streams with a small connection pool, so
+    no Redis client library is required.
+    """
+
+    shared = True
+
+    def __init__(self, url: str = "redis://localhost:6379/0", pool_size: int = 10):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.pool_size = pool_size
+        self._idle: List[tuple] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def _open(self) -> tuple:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = (reader, writer)
+        if self.password:
+            await self._roundtrip(connection, "AUTH", self.password)
+        if self.db:
+            await self._roundtrip(connection, "SELECT", str(self.db))
+        return connection
+
+    @staticmethod
+    def _encode(*args: str) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode() if isinstance(arg, str) else arg
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    @classmethod
+    async def _read_reply(cls, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await reader.readexactly(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [await cls._read_reply(reader) for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    async def _roundtrip(self, connection: tuple, *args: str):
+        reader, writer = connection
+        writer.write(self._encode(*args))
+        await writer.drain()
+        return await self._read_reply(reader)
+
+    async def command(self, *args: str):
+        """Send one command on a pooled connection and return its reply"""
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else await self._open()
+            try:
+                reply = await self._roundtrip(connection, *args)
+            except RedisError:
+                self._idle.append(connection)
+                raise
+            except BaseException:
+                # Connection errors and cancellation both leave a reply unread on it
+                connection[1].close()
+                raise
+            self._idle.append(connection)
+            return reply
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.command("GET", key)
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[float] = None):
+        if ttl_seconds:
+            await self.command("SET", key, value, "PX", str(int(ttl_seconds * 1000)))
+        else:
+            await self.command("SET", key, value)
+
+    async def set_if_absent(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> bool:
+        args = ["SET", key, value, "NX"]
+        if ttl_seconds:
+            args += ["PX", str(int(ttl_seconds * 1000))]
+        return await self.command(*args) == "OK"
+
+    async def expire(self, key: str, ttl_seconds: float) -> bool:
+        """Reset a key's TTL; False if it does not exist"""
+        return await self.command("PEXPIRE", key, str(int(ttl_seconds * 1000))) == 1
+
+    async def delete(self, key: str) -> bool:
+        return await self.command("DEL", key) == 1
+
+    async def delete_if_equals(self, key: str, value: str) -> bool:
+        """Delete a key only while it still holds value; False if it expired or changed"""
+        return await self.command("EVAL", DELETE_IF_EQUALS_SCRIPT, "1", key, value) == 1
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+def create_state_backend(kind: Optional[str] = None):
+    """Create the state backend for sessions and shared caches configured by the environment"""
+    kind = (kind or os.getenv("STATE_BACKEND", "memory")).lower()
+    if kind == "memory":
+        return InMemoryStateBackend()
+    if kind == "sqlite":
+        return SQLiteStateBackend(os.getenv("STATE_DB_PATH", "state.db"))
+    if kind == "redis":
+        return RedisStateBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                                 int(os.getenv("REDIS_POOL_SIZE", "10")))
+    raise ValueError(f"Unknown state backend: {kind}")
@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from metrics import SINGLE_FLIGHT_REQUESTS
+
+T = TypeVar("T")
+
+
+def normalize_message(message: str) -> str:
+    """Collapse whitespace so double-submits that differ only in spacing coalesce
+
+    Case is kept: coalesced requests share one result verbatim, and the goal
+    title echoes the user's wording.
+    """
+    return " ".join((message or "").split())
+
+
+def request_key(endpoint: str, state: Any = None, message: str = "") -> str:
+    """Coalescing key for (endpoint, state hash, normalized message)"""
+    state_hash = hashlib.sha256(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()
+    return hashlib.sha256(f"{endpoint}\0{state_hash}\0{normalize_message(message)}".encode()).hexdigest()
+
+
+class SingleFlight:
+    """Runs one execution per key at a time; concurrent callers with the same key share its result
+
+    The execution runs in its own task, so a caller that disconnects doesn't
+    cancel it for the others. Results are not kept once the flight lands; that
+    is the LLM cache's job.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+        self._flights: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, endpoint: str, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn(), or the in-flight execution already started for key"""
+        if not self.enabled:
+            return await fn()
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            SINGLE_FLIGHT_REQUESTS.inc(endpoint=endpoint, outcome="coalesced")
+        else:
+            SINGLE_FLIGHT_REQUESTS.inc(endpoint=endpoint, outcome="executed")
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+        return await asyncio.shield(flight)
+
+    def _land(self, key: str, flight: asyncio.Future):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark a failure as retrieved even if every caller has gone away
+        if not flight.cancelled():
+            flight.exception()
@@ -2,10 +2,16 @@
 """
 Start the DreamPool backend server
 """
+import argparse
 import os
 import sys
 from dotenv import load_dotenv
 
+parser = argparse.ArgumentParser(description="Start the DreamPool backend server")
+parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                    help="Worker processes; more than one needs STATE_BACKEND=sqlite or redis")
+args = parser.parse_args()
+
 # Load environment variables
 load_dotenv()
 
@@ -16,20 +22,35 @@ if not os.getenv("OPENAI_API_KEY"):
     print("Example: OPENAI_API_KEY=your_openai_api_key_here")
     sys.exit(1)
 
+# Workers don't share memory: a session started on one must be readable by the others
+if args.workers > 1 and os.getenv("STATE_BACKEND", "memory").lower() == "memory":
+    print("❌ Error: --workers > 1 needs a shared state backend")
+    print("Set STATE_BACKEND=sqlite or STATE_BACKEND=redis in the .env file")
+    sys.exit(1)
+
 print("🚀 Starting DreamPool Backend Server...")
 print("=" * 50)
 
 try:
     import uvicorn
-    from main import app
-    
+    # Importing main is cheap: the agent and its LLM dependencies are built after startup
+    # (AGENT_STARTUP), and each worker or reloaded process imports the app itself
+    import main  # noqa: F401
+
     print("✅ All dependencies loaded successfully")
+    if args.workers > 1:
+        print(f"👷 {args.workers} workers sharing state via STATE_BACKEND={os.getenv('STATE_BACKEND')}")
     print("🌐 Server will be available at: http://localhost:8000")
     print("📚 API documentation at: http://localhost:8000/docs")
     print("\nPress Ctrl+C to stop the server")
     print("-" * 50)
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    if args.workers > 1:
+        # Each worker imports the app itself; reload is not available with workers
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=args.workers)
+    else:
+        # Reload needs the app as an import string
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
     
 except ImportError as e:
     print(f"❌ Missing dependency: {e}")
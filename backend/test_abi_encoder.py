@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Known-vector tests for the ABI encoder (no network or web3 needed)
+"""
+import json
+
+from abi_encoder import (
+    ABIEncoder, CREATE_POOL_SELECTOR, DEPOSIT_SELECTOR, encode_create_pool_calldata,
+    eth_to_wei, function_selector, keccak256
+)
+from schemas import ProposedGoal
+
+RECIPIENT = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+def word(value: int) -> str:
+    return f"{value:064x}"
+
+
+def test_keccak256_vectors():
+    assert keccak256(b"").hex() == "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+    assert keccak256(b"abc").hex() == "4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45"
+
+
+def test_function_selectors():
+    assert function_selector("transfer(address,uint256)").hex() == "a9059cbb"
+    assert function_selector("balanceOf(address)").hex() == "70a08231"
+    assert DEPOSIT_SELECTOR.hex() == "b6b55f25"
+    assert CREATE_POOL_SELECTOR == function_selector("createPool(address,uint256,uint256,string)")
+
+
+def test_create_pool_layout():
+    calldata = encode_create_pool_calldata(RECIPIENT, 3 * 10**17, 1_700_000_000, "hi").hex()
+    expected = (
+        CREATE_POOL_SELECTOR.hex()
+        + "000000000000000000000000742d35cc6634c0532925a3b844bc454e4438f44e"
+        + word(3 * 10**17)
+        + word(1_700_000_000)
+        + word(0x80)  # offset of the string, after the four head words
+        + word(2)
+        + "6869" + "00" * 30
+    )
+    assert calldata == expected
+
+
+def test_string_padding_at_word_boundary():
+    for length, padded in ((0, 0), (31, 32), (32, 32), (33, 64)):
+        calldata = encode_create_pool_calldata(RECIPIENT, 1, 1, "a" * length)
+        assert len(calldata) == 4 + 5 * 32 + padded
+
+
+def test_build_create_pool():
+    encoder = ABIEncoder()
+    goal = ProposedGoal(title="Laptöp", cost_eth=0.3, deadline_days=30, recipient=RECIPIENT, description="For school")
+    tx = encoder.build_create_pool(goal, now=1_700_000_000)
+
+    data = bytes.fromhex(tx.data[2:])
+    assert data[:4] == CREATE_POOL_SELECTOR
+    assert int.from_bytes(data[36:68], "big") == 3 * 10**17
+    assert int.from_bytes(data[68:100], "big") == 1_700_000_000 + 30 * 86400
+    length = int.from_bytes(data[132:164], "big")
+    metadata = json.loads(data[164:164 + length].decode())
+    assert metadata == {"title": "Laptöp", "description": "For school", "created_at": 1_700_000_000}
+    assert tx.value == 0
+
+
+def test_eth_to_wei_is_exact():
+    assert eth_to_wei(0.3) == 3 * 10**17
+    assert eth_to_wei(1.1) == 11 * 10**17
+    assert eth_to_wei(2) == 2 * 10**18
+
+
+def test_invalid_inputs_are_rejected():
+    encoder = ABIEncoder()
+    bad_goals = [
+        ProposedGoal(title="x", cost_eth=1, deadline_days=1, recipient="0x1234"),
+        ProposedGoal(title="x", cost_eth=-1, deadline_days=1, recipient=RECIPIENT),
+    ]
+    results = encoder.encode_create_pool_batch(bad_goals)
+    assert all(isinstance(result, Exception) for result in results)
+
+
+def test_deposit():
+    assert ABIEncoder().encode_deposit(7, 10**18) == "0xb6b55f25" + word(7)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
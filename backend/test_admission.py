@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Admission control and rate limiting tests (no LLM or server needed)
+"""
+import asyncio
+import time
+
+from admission import AdmissionRejected, ClientRateLimiter, LLMAdmission
+
+
+async def _hold(admission: LLMAdmission, seconds: float, peak: list):
+    async with admission.slot():
+        peak.append(admission.in_flight)
+        await asyncio.sleep(seconds)
+
+
+def test_bounds_in_flight_calls():
+    async def scenario():
+        admission = LLMAdmission(max_concurrency=3, max_queue=10, queue_timeout_seconds=5)
+        peak = []
+        await asyncio.gather(*(_hold(admission, 0.02, peak) for _ in range(9)))
+        return admission, peak
+
+    admission, peak = asyncio.run(scenario())
+    assert len(peak) == 9 and max(peak) == 3
+    assert admission.in_flight == 0 and admission.waiting == 0
+
+
+def test_sheds_when_queue_is_full():
+    async def scenario():
+        admission = LLMAdmission(max_concurrency=2, max_queue=2, queue_timeout_seconds=5)
+        peak = []
+        busy = [asyncio.create_task(_hold(admission, 0.2, peak)) for _ in range(4)]
+        await asyncio.sleep(0.01)  # two running, two queued
+
+        started = time.perf_counter()
+        try:
+            async with admission.slot():
+                pass
+            rejected = None
+        except AdmissionRejected as e:
+            rejected = e
+        shed_seconds = time.perf_counter() - started
+        await asyncio.gather(*busy)
+        return rejected, shed_seconds
+
+    rejected, shed_seconds = asyncio.run(scenario())
+    assert rejected is not None and rejected.reason == "queue_full"
+    assert rejected.retry_after >= 1
+    assert shed_seconds < 0.05  # shed at once, not after waiting
+
+
+def test_queue_timeout():
+    async def scenario():
+        admission = LLMAdmission(max_concurrency=1, max_queue=5, queue_timeout_seconds=0.05)
+        busy = asyncio.create_task(_hold(admission, 0.3, []))
+        await asyncio.sleep(0.01)
+        try:
+            async with admission.slot():
+                return None
+        except AdmissionRejected as e:
+            return e.reason
+        finally:
+            await busy
+
+    assert asyncio.run(scenario()) == "queue_timeout"
+
+
+def test_token_bucket_per_client():
+    limiter = ClientRateLimiter(per_minute=60, burst=3)
+    assert [limiter.acquire("a") for _ in range(3)] == [None, None, None]
+    assert limiter.acquire("a") == 1  # one token per second
+    assert limiter.acquire("b") is None  # other clients have their own bucket
+    assert ClientRateLimiter(per_minute=0).acquire("a") is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
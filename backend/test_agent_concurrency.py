@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Concurrency test for the async LangGraph agent path (no OpenAI key needed)
+"""
+import asyncio
+import time
+
+from fake_llm import FakeChatModel
+from langgraph_agent import DreamPoolReActAgent
+
+LLM_LATENCY = 0.5
+CONCURRENT_CHATS = 20
+
+
+async def _run_concurrent_chats():
+    llm = FakeChatModel(latency=LLM_LATENCY)
+    agent = DreamPoolReActAgent(llm=llm)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        agent.start_conversation(f"I want to raise money for goal #{i}")
+        for i in range(CONCURRENT_CHATS)
+    ])
+    elapsed = time.perf_counter() - started
+    return llm, results, elapsed
+
+
+def test_concurrent_chats_finish_in_one_llm_latency():
+    """N concurrent chats should take about one LLM latency, not N"""
+    llm, results, elapsed = asyncio.run(_run_concurrent_chats())
+
+    assert len(results) == CONCURRENT_CHATS
+    assert llm.calls == CONCURRENT_CHATS
+    # A blocking agent would need CONCURRENT_CHATS * LLM_LATENCY seconds
+    assert elapsed < LLM_LATENCY * 3, f"{CONCURRENT_CHATS} chats took {elapsed:.2f}s"
+    for result in results:
+        assert result["messages"][-1]["type"] == "AIMessage"
+
+
+if __name__ == "__main__":
+    llm, results, elapsed = asyncio.run(_run_concurrent_chats())
+    print(f"🤖 {CONCURRENT_CHATS} concurrent chats, {LLM_LATENCY}s fake LLM latency")
+    print(f"⏱️  Finished in {elapsed:.2f}s ({llm.calls} LLM calls)")
+    print(f"   Serial estimate: {CONCURRENT_CHATS * LLM_LATENCY:.2f}s")
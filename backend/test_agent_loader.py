@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Lazy agent tests: the agent is built once, off the event loop, and a failed
+build is reported and retried (stdlib only, no LLM dependencies needed)
+"""
+import asyncio
+import threading
+import time
+
+from agent_loader import LazyAgent
+
+
+class SlowAgent:
+    def __init__(self):
+        time.sleep(0.1)  # stands in for importing langchain and compiling the graph
+        self.built_on = threading.current_thread().name
+
+    def greet(self):
+        return "hello"
+
+
+def test_concurrent_warm_ups_share_one_build():
+    builds = []
+
+    def factory():
+        builds.append(1)
+        return SlowAgent()
+
+    async def scenario():
+        agent = LazyAgent(factory)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while not agent.ready:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(ticker(), *(agent.warm_up() for _ in range(5)))
+        return agent, ticks
+
+    agent, ticks = asyncio.run(scenario())
+    assert len(builds) == 1
+    assert agent.ready and agent.load_seconds >= 0.1
+    assert agent.built_on != threading.main_thread().name
+    assert ticks >= 5, "the event loop was blocked during the build"
+
+
+def test_attribute_access_builds_on_first_use():
+    loaded = []
+    agent = LazyAgent(SlowAgent, on_load=loaded.append)
+    assert not agent.ready
+    assert agent.greet() == "hello"
+    assert agent.ready and len(loaded) == 1
+
+
+def test_failed_build_is_reported_and_retried():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ImportError("No module named 'langgraph'")
+        return SlowAgent()
+
+    async def scenario():
+        agent = LazyAgent(factory)
+        try:
+            await agent.warm_up()
+        except ImportError:
+            pass
+        error = agent.error
+        await agent.warm_up()
+        return agent, error
+
+    agent, error = asyncio.run(scenario())
+    assert "langgraph" in error
+    assert agent.ready and agent.error is None and len(attempts) == 2
+
+
+def test_use_serves_a_prebuilt_agent():
+    agent = LazyAgent(lambda: None)
+    prebuilt = SlowAgent()
+    agent.use(prebuilt)
+    assert agent.ready and agent.built_on == prebuilt.built_on
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
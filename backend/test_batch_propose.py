@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Batch proposal tests: rule-resolved messages skip the LLM, the rest run with
+bounded concurrency, and every message gets exactly one result or error
+"""
+import asyncio
+
+from abi_encoder import ABIEncoder
+from admission import AdmissionRejected
+from batch_propose import BatchProposer
+from schemas import ProposedGoal
+
+RECIPIENT = "0xC895f03A4982E39bE52Bc686432724583aAF2d8D"
+
+
+class FakeAgent:
+    """Resolves messages mentioning ETH by rules; everything else takes an LLM call"""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.llm_calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def parse_goal_rules(self, message: str):
+        if "ETH" not in message:
+            return None
+        return ProposedGoal(title=message, cost_eth=2.0, deadline_days=30, recipient=RECIPIENT, description=message)
+
+    async def parse_goal(self, message: str, engine=None) -> ProposedGoal:
+        self.llm_calls.append(message)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if message == "overloaded":
+                raise AdmissionRejected("queue_full", 3)
+            if message == "broken":
+                raise RuntimeError("provider error")
+            cost_eth = -1.0 if message == "negative" else 1.0
+            return ProposedGoal(title=message, cost_eth=cost_eth, deadline_days=30, recipient=RECIPIENT, description=message)
+        finally:
+            self.in_flight -= 1
+
+
+async def collect(proposer: BatchProposer, messages, build_tx: bool = False):
+    return [item async for item in proposer.run(messages, build_tx=build_tx)]
+
+
+def test_rules_skip_the_llm_and_come_first():
+    agent = FakeAgent()
+    messages = ["a laptop", "2 ETH for a laptop", "studio time", "1 ETH for a bike"]
+    items = asyncio.run(collect(BatchProposer(agent, concurrency=4), messages))
+
+    assert [item["index"] for item in items[:2]] == [1, 3]
+    assert all(item["resolved"] == "rules" for item in items[:2])
+    assert sorted(item["index"] for item in items[2:]) == [0, 2]
+    assert all(item["resolved"] == "llm" for item in items[2:])
+    assert sorted(agent.llm_calls) == ["a laptop", "studio time"]
+
+
+def test_llm_calls_are_bounded_and_deduplicated():
+    agent = FakeAgent()
+    messages = [f"goal {n % 10}" for n in range(40)] + ["goal  1"]
+    items = asyncio.run(collect(BatchProposer(agent, concurrency=3), messages))
+
+    assert sorted(item["index"] for item in items) == list(range(41))
+    assert len(agent.llm_calls) == 10
+    assert agent.peak == 3
+
+
+def test_errors_stay_per_item():
+    agent = FakeAgent()
+    items = asyncio.run(collect(BatchProposer(agent, concurrency=4), ["overloaded", "broken", "", 7, "fine"]))
+    by_index = {item["index"]: item for item in items}
+
+    assert "retry after 3s" in by_index[0]["error"]
+    assert "provider error" in by_index[1]["error"]
+    assert by_index[2]["error"].startswith("Invalid message") and by_index[3]["error"].startswith("Invalid message")
+    assert by_index[4]["goal"]["title"] == "fine"
+
+
+def test_build_tx_encodes_each_goal():
+    agent = FakeAgent()
+    proposer = BatchProposer(agent, ABIEncoder(), concurrency=4)
+    items = asyncio.run(collect(proposer, ["2 ETH for a laptop", "a bike", "negative"], build_tx=True))
+    by_index = {item["index"]: item for item in items}
+
+    assert by_index[0]["transaction"]["data"].startswith("0x") and by_index[0]["goal"]["cost_eth"] == 2.0
+    assert by_index[1]["transaction"]["to"] == by_index[0]["transaction"]["to"]
+    assert "error" in by_index[2] and "transaction" not in by_index[2]
+
+
+def test_llm_goals_from_the_real_agent_can_be_encoded():
+    # Needs langchain/langgraph; the tests above run with the standard library alone
+    from fake_llm import FakeChatModel
+    from langgraph_agent import HARDCODED_RECIPIENT, DreamPoolReActAgent
+
+    agent = DreamPoolReActAgent(llm=FakeChatModel(call_tools=True))
+    messages = ["Help me fund a trip to Japan", "A new laptop for college, 2 ETH within 3 weeks"]
+    items = asyncio.run(collect(BatchProposer(agent, ABIEncoder()), messages, build_tx=True))
+    by_index = {item["index"]: item for item in items}
+
+    llm_item, rules_item = by_index[0], by_index[1]
+    assert llm_item["resolved"] == "llm" and "error" not in llm_item
+    assert llm_item["goal"]["recipient"] == HARDCODED_RECIPIENT
+    assert llm_item["goal"]["cost_eth"] == 1.0 and llm_item["goal"]["deadline_days"] == 30
+    assert llm_item["transaction"]["data"].startswith("0x")
+    assert rules_item["resolved"] == "rules" and rules_item["goal"]["cost_eth"] == 2.0
+    assert rules_item["transaction"]["data"].startswith("0x")
+
+
+def test_closing_the_stream_cancels_llm_calls():
+    async def scenario():
+        agent = FakeAgent(delay=10)
+        stream = BatchProposer(agent, concurrency=2).run(["1 ETH for a bike", "slow one", "slow two", "slow three"])
+        first = await stream.__anext__()
+        # The client disconnects while the stream waits on the LLM calls
+        waiting = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return first, agent
+
+    first, agent = asyncio.run(scenario())
+    assert first["resolved"] == "rules"
+    assert len(agent.llm_calls) == 2 and agent.in_flight == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
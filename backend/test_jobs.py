@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Background job tests: bounded workers, polling, TTL'd results and callbacks
+delivered to the local receiver (fake_webhook.py), no LLM needed
+"""
+import asyncio
+import json
+
+from admission import AdmissionRejected
+from fake_webhook import FakeWebhookReceiver
+from jobs import InvalidCallbackURL, JobManager
+from shared_state import InMemoryStateBackend
+
+
+def manager(**options) -> JobManager:
+    options = {"workers": 2, "max_queue": 10, "ttl_seconds": 60, "timeout_seconds": 1, **options}
+    return JobManager(InMemoryStateBackend(), **options)
+
+
+async def wait_for_status(jobs: JobManager, job_id: str, statuses=("succeeded", "failed")) -> dict:
+    for _ in range(200):
+        job = await jobs.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} stuck in {job['status']}")
+
+
+def test_jobs_run_on_bounded_workers():
+    async def scenario():
+        jobs = manager(workers=2)
+        running = peak = 0
+
+        async def slow(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return {"echo": request}
+
+        jobs.register("echo", slow)
+        jobs.start()
+        submitted = [await jobs.submit("echo", index) for index in range(6)]
+        assert all(job["status"] == "queued" for job in submitted)
+        finished = [await wait_for_status(jobs, job["job_id"]) for job in submitted]
+        await jobs.stop()
+        return finished, peak
+
+    finished, peak = asyncio.run(scenario())
+    assert peak == 2
+    assert [job["result"] for job in finished] == [{"echo": index} for index in range(6)]
+    assert all(job["status"] == "succeeded" and job["finished_at"] >= job["started_at"] for job in finished)
+
+
+def test_full_queue_is_shed():
+    async def scenario():
+        jobs = manager(max_queue=2)
+        jobs.register("echo", lambda request: asyncio.sleep(0, {"ok": True}))
+        # Workers not started: the queue only fills up
+        await jobs.submit("echo", 1)
+        await jobs.submit("echo", 2)
+        try:
+            await jobs.submit("echo", 3)
+        except AdmissionRejected as e:
+            return e
+        return None
+
+    rejected = asyncio.run(scenario())
+    assert rejected is not None and rejected.reason == "job_queue_full" and rejected.retry_after >= 1
+
+
+def test_failures_and_timeouts_are_recorded():
+    async def scenario():
+        jobs = manager(timeout_seconds=0.05)
+
+        async def broken(request):
+            raise RuntimeError("provider error")
+
+        jobs.register("broken", broken)
+        jobs.register("hang", lambda request: asyncio.Event().wait())
+        jobs.start()
+        failed = await wait_for_status(jobs, (await jobs.submit("broken", None))["job_id"])
+        timed_out = await wait_for_status(jobs, (await jobs.submit("hang", None))["job_id"])
+        await jobs.stop()
+        return failed, timed_out
+
+    failed, timed_out = asyncio.run(scenario())
+    assert failed["status"] == "failed" and "provider error" in failed["error"]
+    assert timed_out["status"] == "failed" and "timed out" in timed_out["error"]
+
+
+def test_results_expire():
+    async def scenario():
+        jobs = manager(ttl_seconds=0.05)
+        jobs.register("echo", lambda request: asyncio.sleep(0, {"ok": True}))
+        jobs.start()
+        job = await wait_for_status(jobs, (await jobs.submit("echo", None))["job_id"])
+        await asyncio.sleep(0.1)
+        expired = await jobs.get(job["job_id"])
+        await jobs.stop()
+        return job, expired
+
+    job, expired = asyncio.run(scenario())
+    assert job["status"] == "succeeded" and expired is None
+
+
+def test_callback_is_retried_and_signed():
+    async def scenario():
+        receiver = FakeWebhookReceiver(statuses=[503])
+        jobs = manager(http_client=receiver)
+        jobs.callback_secret = "s3cret"
+        jobs.callback_hosts = {"example.com"}
+        jobs.register("echo", lambda request: asyncio.sleep(0, {"ok": True}))
+        jobs.start()
+        job = await jobs.submit("echo", None, callback_url="https://example.com/hooks/dreampool")
+        final = await wait_for_status(jobs, job["job_id"])
+        for _ in range(100):
+            final = await jobs.get(job["job_id"])
+            if final["callback_status"]:
+                break
+            await asyncio.sleep(0.02)
+        await jobs.stop()
+        return jobs, receiver, final
+
+    jobs, receiver, final = asyncio.run(scenario())
+    assert final["callback_status"] == "delivered"
+    assert receiver.attempts == 2 and len(receiver.deliveries) == 1
+    delivery = receiver.deliveries[0]
+    assert delivery["job"]["result"] == {"ok": True} and delivery["job"]["status"] == "succeeded"
+    assert delivery["headers"]["x-dreampool-signature"] == jobs.signature(json.dumps(delivery["job"]).encode())
+
+
+def test_callback_urls_are_checked():
+    jobs = manager()
+    jobs.register("echo", lambda request: asyncio.sleep(0, {}))
+    jobs.callback_hosts = {"hooks.example.com"}
+    for url in ("ftp://hooks.example.com/x", "https://169.254.169.254/latest", "not a url"):
+        try:
+            asyncio.run(jobs.submit("echo", None, callback_url=url))
+            rejected = False
+        except InvalidCallbackURL:
+            rejected = True
+        assert rejected, url
+    assert asyncio.run(jobs.submit("echo", None, callback_url="https://hooks.example.com/x"))["status"] == "queued"
+
+
+def test_callbacks_to_internal_addresses_are_refused_by_default():
+    jobs = manager()
+    jobs.register("echo", lambda request: asyncio.sleep(0, {}))
+    assert not jobs.callback_hosts
+    internal = ("http://169.254.169.254/latest/meta-data", "http://127.0.0.1:8000/admin", "http://localhost/x",
+                "http://10.0.0.5/hook", "http://192.168.1.1/hook", "http://[::1]/hook", "http://0.0.0.0/hook")
+    for url in internal:
+        try:
+            asyncio.run(jobs.submit("echo", None, callback_url=url))
+            rejected = False
+        except InvalidCallbackURL:
+            rejected = True
+        assert rejected, url
+    assert asyncio.run(jobs.submit("echo", None, callback_url="https://93.184.215.14/hook"))["status"] == "queued"
+
+
+def test_callback_host_is_checked_again_before_delivery():
+    async def scenario():
+        receiver = FakeWebhookReceiver()
+        jobs = manager(http_client=receiver)
+        jobs.register("echo", lambda request: asyncio.sleep(0, {"ok": True}))
+        job = await jobs.submit("echo", None, callback_url="https://93.184.215.14/hook")
+        # The job record now points somewhere internal, as after a DNS change
+        job["callback_url"] = "http://127.0.0.1/hook"
+        status = await jobs._deliver(job)
+        await jobs.stop()
+        return status, receiver
+
+    status, receiver = asyncio.run(scenario())
+    assert status == "rejected" and receiver.attempts == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+LLM transport tests: the real ChatOpenAI client against the local fake
+OpenAI-compatible server (fake_openai.py), no network or API key needed
+"""
+import asyncio
+import time
+
+import httpx
+
+from admission import LLMAdmission
+from fake_openai import FakeOpenAIServer
+from langgraph_agent import DreamPoolReActAgent
+from llm_transport import CircuitBreaker, LLMUnavailable, ResilientChatModel, create_chat_model
+
+
+def chat_model(server: FakeOpenAIServer):
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.asgi_app))
+    return create_chat_model(http_client=http, base_url="http://fake-openai/v1", api_key="test")
+
+
+def resilient(server: FakeOpenAIServer, **options) -> ResilientChatModel:
+    options = {"retry_base_seconds": 0.01, "hedge": False, **options}
+    return ResilientChatModel(chat_model(server), **options)
+
+
+def test_retries_transient_failures():
+    server = FakeOpenAIServer(failures=[503, 429])
+    response = asyncio.run(resilient(server, max_retries=2).ainvoke([{"role": "user", "content": "hi"}]))
+    assert response.content == server.reply
+    assert server.requests == 3
+
+
+def test_client_errors_are_not_retried():
+    server = FakeOpenAIServer(failures=[400])
+    try:
+        asyncio.run(resilient(server, max_retries=2).ainvoke([{"role": "user", "content": "hi"}]))
+        raised = None
+    except Exception as e:
+        raised = e
+    assert raised is not None and not isinstance(raised, LLMUnavailable)
+    assert server.requests == 1
+
+
+def test_hung_call_times_out_and_is_retried():
+    server = FakeOpenAIServer(failures=["hang"])
+    model = resilient(server, timeout_seconds=0.1, max_retries=1)
+    response = asyncio.run(model.ainvoke([{"role": "user", "content": "hi"}]))
+    assert response.content == server.reply and server.requests == 2
+
+
+def test_slow_call_is_hedged_past_p95():
+    server = FakeOpenAIServer(latencies=[1.0, 0.01])
+    model = resilient(server, hedge=True, hedge_min_samples=5, hedge_min_delay_seconds=0.05)
+    model.latencies.extend([0.02] * 20)  # warmed up: p95 is 20 ms, so hedge after 50 ms
+
+    started = time.perf_counter()
+    response = asyncio.run(model.ainvoke([{"role": "user", "content": "hi"}]))
+    elapsed = time.perf_counter() - started
+
+    assert response.content == server.reply
+    assert server.requests == 2
+    assert elapsed < 0.5, f"hedged call took {elapsed:.2f}s"
+
+
+def test_hedges_stay_within_the_admission_limit():
+    async def scenario():
+        server = FakeOpenAIServer(latencies=[0.2])
+        admission = LLMAdmission(max_concurrency=3, max_queue=10, queue_timeout_seconds=5)
+        model = resilient(server, hedge=True, hedge_min_samples=5, hedge_min_delay_seconds=0.05, admission=admission)
+        model.latencies.extend([0.02] * 20)
+
+        # Alone, a slow call has a spare slot for its hedge
+        await model.ainvoke([{"role": "user", "content": "hi"}])
+        alone = server.requests
+        # Saturated, the hedges have none and are skipped
+        await asyncio.gather(*(model.ainvoke([{"role": "user", "content": f"hi {n}"}]) for n in range(6)))
+        return server, admission, alone
+
+    server, admission, alone = asyncio.run(scenario())
+    assert alone == 2
+    assert server.peak_in_flight <= 3
+    assert admission.in_flight == 0 and server.in_flight == 0
+
+
+def test_breaker_opens_and_agent_falls_back_to_regex():
+    async def scenario():
+        server = FakeOpenAIServer(failures=[500] * 10)
+        agent = DreamPoolReActAgent(llm=chat_model(server), fast_path=False)
+        agent.breaker.failure_threshold = 2
+
+        first = await agent.start_conversation("I want to raise 2 ETH for a new laptop in 30 days")
+        requests_after_trip = server.requests
+        second = await agent.start_conversation("Help me fund a bike, 1 ETH within 2 weeks")
+        return first, second, requests_after_trip, server.requests, agent.breaker.state
+
+    first, second, tripped_at, total, state = asyncio.run(scenario())
+    assert state == "open"
+    assert tripped_at == 2 and total == 2  # the second conversation never reached the server
+    assert first["goal_amount_eth"] == 2.0 and first["deadline_days"] == 30
+    assert second["goal_amount_eth"] == 1.0 and second["deadline_days"] == 14
+    assert "Here's what I have so far" in second["messages"][-1]["content"]
+
+
+def test_breaker_lets_one_probe_through_after_reset():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()  # only the probe
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
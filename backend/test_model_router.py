@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Model routing tests: tool-selection steps go to the rules or the extraction
+model, replies to the chat model (fake LLMs, no OpenAI key needed)
+"""
+import asyncio
+
+from fake_llm import FakeChatModel
+from langgraph_agent import DreamPoolReActAgent, rule_proposed_goal, rule_tool_calls
+from llm_cache import LLMCache
+from metrics import LLM_CALLS, LLM_TOKENS
+from shared_state import InMemoryStateBackend
+
+COMPLETE_MESSAGE = "I want to raise 2 ETH for a new laptop in 30 days"
+
+
+def run_turn(message: str, **options):
+    llm = FakeChatModel(call_tools=True)
+    agent = DreamPoolReActAgent(llm=llm, fast_path=False, **options)
+    result = asyncio.run(agent.start_conversation(message))
+    return llm, agent, result
+
+
+def test_chat_policy_uses_the_chat_model_for_every_step():
+    llm, agent, result = run_turn(COMPLETE_MESSAGE, routing_policy="chat")
+    assert llm.calls == 2
+    assert agent.router.stats["chat"].calls == 2
+
+
+def test_rules_answer_the_tool_step():
+    llm, agent, result = run_turn(COMPLETE_MESSAGE, routing_policy="rules")
+    assert llm.calls == 1  # only the reply
+    assert agent.router.stats["rules"].calls == 1
+    assert result["goal_amount_eth"] == 2.0 and result["deadline_days"] == 30
+    assert result["conversation_complete"]
+
+
+def test_low_confidence_escalates_to_the_chat_model():
+    llm, agent, _ = run_turn("hello, how does this work?", routing_policy="rules")
+    assert llm.calls == 2
+    assert agent.router.stats["rules"].escalations == 1
+
+
+def test_extraction_model_picks_tools():
+    extraction = FakeChatModel(call_tools=True)
+    llm, agent, result = run_turn(COMPLETE_MESSAGE, routing_policy="extraction", extraction_llm=extraction)
+    assert extraction.calls == 1 and llm.calls == 1
+    assert result["goal_amount_eth"] == 2.0
+    assert agent.router.stats_dict()["extraction"]["calls"] == 1
+
+
+def test_extraction_without_tool_calls_escalates():
+    extraction = FakeChatModel()  # answers in prose
+    llm, agent, _ = run_turn(COMPLETE_MESSAGE, routing_policy="extraction", extraction_llm=extraction)
+    assert extraction.calls == 1 and llm.calls == 2
+    assert agent.router.stats["extraction"].escalations == 1
+
+
+def test_escalated_extraction_answers_are_not_served_as_chat_replies():
+    extraction = FakeChatModel(reply="Sure, tell me more.")  # prose, same model name as the chat model
+    llm, agent, result = run_turn(COMPLETE_MESSAGE, routing_policy="extraction", extraction_llm=extraction,
+                                  llm_cache=LLMCache(InMemoryStateBackend()))
+    assert extraction.calls == 1 and llm.calls == 2
+    assert result["goal_amount_eth"] == 2.0
+
+
+def test_cache_hits_are_not_counted_as_llm_calls():
+    llm = FakeChatModel(call_tools=True)
+    agent = DreamPoolReActAgent(llm=llm, fast_path=False, routing_policy="chat",
+                                llm_cache=LLMCache(InMemoryStateBackend()))
+    asyncio.run(agent.start_conversation(COMPLETE_MESSAGE))
+    calls_before, prompt_before = LLM_CALLS.value(outcome="ok"), LLM_TOKENS.value(kind="prompt")
+    provider_calls_before = llm.calls
+
+    # The opening step is now a cache hit; only the reply reaches the provider
+    asyncio.run(agent.start_conversation(COMPLETE_MESSAGE))
+    assert agent.llm_cache.hits == 1 and llm.calls - provider_calls_before == 1
+    assert LLM_CALLS.value(outcome="ok") - calls_before == 1
+    assert LLM_TOKENS.value(kind="prompt") - prompt_before > 0
+
+
+def test_rule_confidence():
+    calls, confidence = rule_tool_calls("2 ETH within 3 weeks", {})
+    assert {call["name"] for call in calls} == {"extract_eth_amount", "extract_deadline"}
+    assert confidence >= 0.9
+
+    calls, confidence = rule_tool_calls("A new laptop for college", {"goal_amount_eth": 2.0})
+    assert [call["name"] for call in calls] == ["extract_goal_description"]
+    assert 0.5 <= confidence < 0.9
+
+    calls, confidence = rule_tool_calls("can I raise 2 ETH?", {})
+    assert confidence <= 0.3
+
+    assert rule_tool_calls("hi", {}) == ([], 0.0)
+
+
+def test_small_talk_is_not_taken_as_the_goal():
+    for message in ("Can you help me", "sure sounds good", "Hello there, how are you"):
+        calls, confidence = rule_tool_calls(message, {})
+        assert confidence < 0.6, message
+
+        # Escalated to the chat model, which only chats
+        llm = FakeChatModel()
+        agent = DreamPoolReActAgent(llm=llm, fast_path=False, routing_policy="rules")
+        first = asyncio.run(agent.start_conversation(message))
+        assert first["goal_description"] is None, message
+        assert agent.router.stats["rules"].escalations == 1
+
+        # Amount and deadline later do not complete a pool around the small talk
+        second = asyncio.run(agent.continue_conversation(first, "2 ETH within 3 weeks"))
+        assert second["goal_description"] is None and not second["conversation_complete"], message
+
+
+def test_rules_resolve_complete_proposals_only():
+    goal = rule_proposed_goal("A new laptop for college, 2 ETH within 3 weeks")
+    assert goal.cost_eth == 2.0 and goal.deadline_days == 21
+    assert goal.title == goal.description == "A new laptop for college, 2 ETH within 3 weeks"
+
+    assert rule_proposed_goal("A new laptop for college") is None
+    assert rule_proposed_goal("can I raise 2 ETH for a laptop in 3 weeks?") is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Pool indexer tests against the in-process fake RPC (no chain or network needed)
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from fake_rpc import FakePoolRPC
+from pool_indexer import InMemoryPoolStore, PoolIndexer, SQLitePoolStore
+from pool_reader import BatchedPoolReader, SequentialPoolReader
+from pool_stream import PoolBroadcaster
+
+CREATOR = "0x742d35cc6634c0532925a3b844bc454e4438f44e"
+RECIPIENT = "0x1111111111111111111111111111111111111111"
+FUTURE = int(time.time()) + 30 * 86400
+
+
+def make_chain(pools: int) -> FakePoolRPC:
+    rpc = FakePoolRPC()
+    for _ in range(pools):
+        rpc.create_pool(CREATOR, RECIPIENT, 10**18, FUTURE)
+    return rpc
+
+
+async def _incremental_sync(store):
+    rpc = make_chain(50)
+    indexer = PoolIndexer(rpc, store, rpc.contract_address, log_block_range=10)
+
+    first = await indexer.sync()
+    first_reads = rpc.calls["eth_call"]
+
+    rpc.deposit(7, 5 * 10**17)
+    rpc.finalize(3)
+    rpc.create_pool(CREATOR, RECIPIENT, 2 * 10**18, FUTURE)
+    rpc.calls.clear()
+    second = await indexer.sync()
+    return store, first, first_reads, second, rpc.calls
+
+
+def test_incremental_sync_reads_only_changed_pools():
+    store, first, first_reads, second, calls = asyncio.run(_incremental_sync(InMemoryPoolStore()))
+
+    assert first == list(range(1, 51))
+    assert first_reads == 51  # poolCount + one getPool per pool
+    assert second == [3, 7, 51]
+    assert calls["eth_call"] == 4  # poolCount + the three changed pools
+
+    total, page = asyncio.run(store.list(offset=0, limit=5))
+    assert total == 51
+    assert [pool.pool_id for pool in page] == [51, 50, 49, 48, 47]
+
+
+def test_sqlite_store_filters_by_status():
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLitePoolStore(os.path.join(directory, "pools.db"))
+        asyncio.run(_incremental_sync(store))
+
+        total, completed = asyncio.run(store.list(status="completed"))
+        assert total == 1 and completed[0].pool_id == 3
+        pool = asyncio.run(store.get(7))
+        assert pool.raised_amount == 5 * 10**17 and pool.status == "active"
+        assert asyncio.run(store.list(status="active"))[0] == 50
+
+
+def test_falls_back_to_unsettled_pools_without_logs():
+    async def scenario():
+        rpc = make_chain(5)
+        store = InMemoryPoolStore()
+        indexer = PoolIndexer(rpc, store, rpc.contract_address)
+        await indexer.sync()
+        rpc.finalize(2)
+        await indexer.sync()
+
+        rpc.logs_supported = False
+        rpc.deposit(4, 10**17)
+        changed = await indexer.sync()
+        return changed, await store.get(4)
+
+    changed, pool = asyncio.run(scenario())
+    assert changed == [1, 3, 4, 5]  # pool 2 is finalized and can't change
+    assert pool.raised_amount == 10**17
+
+
+def test_batched_readers_match_sequential_in_fewer_round_trips():
+    async def read(reader_factory):
+        rpc = make_chain(120)
+        rpc.deposit(42, 3 * 10**17)
+        pools = await reader_factory(rpc).read_pools(list(range(1, 121)))
+        return [pool.to_dict() for pool in pools], rpc.round_trips
+
+    expected, sequential_trips = asyncio.run(read(lambda rpc: SequentialPoolReader(rpc, rpc.contract_address)))
+    for mode in ("batch", "multicall"):
+        pools, trips = asyncio.run(read(lambda rpc: BatchedPoolReader(rpc, rpc.contract_address, mode=mode, batch_size=50)))
+        assert pools == expected, mode
+        assert trips == 3, mode  # 120 pools in chunks of 50
+    assert sequential_trips == 120
+
+
+def test_broadcasts_filtered_diffs_and_resyncs_slow_clients():
+    async def scenario():
+        rpc = make_chain(3)
+        broadcaster = PoolBroadcaster(queue_size=2)
+        indexer = PoolIndexer(rpc, InMemoryPoolStore(), rpc.contract_address, broadcaster=broadcaster)
+        await indexer.sync()
+
+        everything = broadcaster.subscribe()
+        only_pool_2 = broadcaster.subscribe([2])
+        rpc.deposit(2, 10**17)
+        rpc.finalize(3)
+        await indexer.sync()
+        received = [only_pool_2.queue.get_nowait() for _ in range(only_pool_2.queue.qsize())]
+
+        # A third change overflows the unread subscriber's queue of two
+        rpc.create_pool(CREATOR, RECIPIENT, 10**18, FUTURE)
+        await indexer.sync()
+        backlog = [everything.queue.get_nowait() for _ in range(everything.queue.qsize())]
+        return received, backlog, broadcaster
+
+    received, backlog, broadcaster = asyncio.run(scenario())
+    assert [event["data"]["changes"] for event in received] == [{"raised_amount": 10**17}]
+    assert [event["event"] for event in backlog] == ["resync"]
+    assert broadcaster.resyncs == 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
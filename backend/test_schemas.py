@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Schema tests: payloads are validated when decoded and records encode back
+to the same JSON shape the API has always returned
+"""
+from schemas import ChatInput, ConversationMessage, EncodedTx, PoolData, ProposedGoal, SchemaError
+
+RECIPIENT = "0xC895f03A4982E39bE52Bc686432724583aAF2d8D"
+
+
+def raises_schema_error(schema, data) -> str:
+    try:
+        schema.from_dict(data)
+    except SchemaError as e:
+        return str(e)
+    raise AssertionError(f"{schema.__name__}.from_dict({data!r}) did not raise")
+
+
+def test_goal_defaults_match_the_old_handler():
+    goal = ProposedGoal.from_dict({"title": "Laptop", "cost_eth": 2, "recipient": RECIPIENT})
+    assert goal.to_dict() == {"title": "Laptop", "cost_eth": 2, "deadline_days": 30, "recipient": RECIPIENT,
+                              "description": ""}
+    assert ProposedGoal.from_dict({"recipient": RECIPIENT, "description": None}).description is None
+
+
+def test_goal_recipient_and_cost_are_validated():
+    assert "recipient is required" in raises_schema_error(ProposedGoal, {"title": "Laptop", "cost_eth": 2})
+    for recipient in ("", "0x123", "C895f03A4982E39bE52Bc686432724583aAF2d8D", RECIPIENT[:-1] + "g"):
+        assert "recipient" in raises_schema_error(ProposedGoal, {"cost_eth": 2, "recipient": recipient})
+    for cost_eth in (-1, -0.5, float("nan"), float("inf")):
+        assert "cost_eth" in raises_schema_error(ProposedGoal, {"cost_eth": cost_eth, "recipient": RECIPIENT})
+    assert ProposedGoal.from_dict({"cost_eth": 0, "recipient": RECIPIENT.lower()}).cost_eth == 0
+
+
+def test_wrong_types_are_rejected_at_decode_time():
+    assert "cost_eth" in raises_schema_error(ProposedGoal, {"cost_eth": "2 ETH", "recipient": RECIPIENT})
+    assert "cost_eth" in raises_schema_error(ProposedGoal, {"cost_eth": True, "recipient": RECIPIENT})
+    assert "deadline_days" in raises_schema_error(ProposedGoal, {"deadline_days": 3.5, "recipient": RECIPIENT})
+    assert "message" in raises_schema_error(ChatInput, {"message": None})
+    assert "state" in raises_schema_error(ChatInput, {"state": []})
+    assert "must be an object" in raises_schema_error(ChatInput, ["hi"])
+
+
+def test_required_fields():
+    assert "type" in raises_schema_error(ConversationMessage, {"content": "hi"})
+    assert EncodedTx.from_dict({"to": RECIPIENT, "data": "0x"}).value == 0
+
+
+def test_records_are_slotted():
+    goal = ProposedGoal("Laptop", 2.0, 30, RECIPIENT)
+    assert not hasattr(goal, "__dict__")
+    try:
+        goal.colour = "red"
+        assigned = True
+    except AttributeError:
+        assigned = False
+    assert not assigned
+
+
+def test_pool_dict_keeps_its_shape():
+    pool = PoolData(pool_id=1, recipient=RECIPIENT, goal_amount=10**19, deadline=1_700_000_000,
+                    raised_amount=0, status="active", title="DreamPool Goal", description="d", creator=RECIPIENT)
+    assert list(pool.to_dict()) == ["pool_id", "recipient", "creator", "goal_amount", "deadline", "raised_amount",
+                                    "status", "title", "description", "finalized", "failed"]
+    assert PoolData.from_dict(pool.to_dict()).to_dict() == pool.to_dict()
+
+
+def test_message_records_omit_empty_fields():
+    data = {"type": "AIMessage", "content": "", "tool_calls": [{"name": "extract_deadline", "args": {}, "id": "1"}]}
+    assert ConversationMessage.from_dict(data).to_dict() == data
+    assert ConversationMessage.from_dict({"type": "HumanMessage", "content": "hi", "name": None}).to_dict() == \
+        {"type": "HumanMessage", "content": "hi"}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Shared state backend and cross-worker session tests (SQLite in a temp dir,
+Redis against the local fake_redis server; no external services needed)
+"""
+import asyncio
+import os
+import tempfile
+
+from fake_redis import FakeRedisServer
+from session_store import SessionManager
+from shared_state import InMemoryStateBackend, RedisStateBackend, SQLiteStateBackend
+
+
+async def _with_backends(scenario):
+    """Run scenario(make_backend) for each backend; make_backend() opens another handle on the same store"""
+    results = {}
+    memory = InMemoryStateBackend()
+    results["memory"] = await scenario(lambda: memory)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.db")
+        results["sqlite"] = await scenario(lambda: SQLiteStateBackend(path))
+
+    server = await FakeRedisServer().start()
+    try:
+        results["redis"] = await scenario(lambda: RedisStateBackend(server.url, pool_size=2))
+    finally:
+        await server.stop()
+    return results
+
+
+def test_backends_share_one_contract():
+    async def scenario(make_backend):
+        state = make_backend()
+        await state.set("a", "1")
+        await state.set("short", "2", ttl_seconds=0.05)
+        first_claim = await state.set_if_absent("lock", "x", ttl_seconds=0.05)
+        second_claim = await state.set_if_absent("lock", "y", ttl_seconds=0.05)
+        extended = await state.expire("a", 10)
+        await asyncio.sleep(0.1)
+        result = {
+            "a": await state.get("a"),
+            "short": await state.get("short"),
+            "claims": (first_claim, second_claim, await state.set_if_absent("lock", "z")),
+            "extended": (extended, await state.expire("missing", 10)),
+            "deleted": (await state.delete("a"), await state.delete("a"), await state.get("a")),
+        }
+        await state.close()
+        return result
+
+    for name, result in asyncio.run(_with_backends(scenario)).items():
+        assert result == {
+            "a": "1",
+            "short": None,
+            "claims": (True, False, True),  # the expired lock can be claimed again
+            "extended": (True, False),
+            "deleted": (True, False, None),
+        }, name
+
+
+def test_any_worker_serves_any_turn():
+    """Two SessionManagers (one per worker) over the same store see each other's sessions"""
+    async def scenario(make_backend):
+        worker_a = SessionManager(make_backend(), ttl_seconds=60)
+        worker_b = SessionManager(make_backend(), ttl_seconds=60)
+
+        session_id = await worker_a.create()
+        await worker_a.save(session_id, {"messages": [{"type": "HumanMessage", "content": "hi"}]})
+        seen_by_b = await worker_b.touch(session_id) and await worker_b.load(session_id)
+        await worker_b.delete(session_id)
+        return seen_by_b, await worker_a.touch(session_id), await worker_a.load(session_id)
+
+    for name, (seen_by_b, still_there, state) in asyncio.run(_with_backends(scenario)).items():
+        assert seen_by_b == {"messages": [{"type": "HumanMessage", "content": "hi"}]}, name
+        assert still_there is False and state is None, name
+
+
+def test_delete_if_equals_only_removes_the_holders_value():
+    async def scenario(make_backend):
+        state = make_backend()
+        await state.set("lock", "mine", ttl_seconds=0.05)
+        wrong = await state.delete_if_equals("lock", "theirs")
+        await asyncio.sleep(0.1)
+        # Expired, then taken over by another worker
+        await state.set("lock", "theirs", ttl_seconds=10)
+        stale = await state.delete_if_equals("lock", "mine")
+        result = (wrong, stale, await state.get("lock"), await state.delete_if_equals("lock", "theirs"),
+                  await state.get("lock"))
+        await state.close()
+        return result
+
+    for name, result in asyncio.run(_with_backends(scenario)).items():
+        assert result == (False, False, "theirs", True, None), name
+
+
+def test_expired_turn_lock_is_not_released_by_its_old_holder():
+    async def scenario(make_backend):
+        workers = [SessionManager(make_backend(), lock_ttl_seconds=0.05) for _ in range(2)]
+        session_id = await workers[0].create()
+        lock_key = f"lock:{workers[0].key(session_id)}"
+        async with workers[0].turn_lock(session_id):
+            await asyncio.sleep(0.1)
+            # The first worker's lock expired mid-turn and the second one took it
+            taken = await workers[1].state.set_if_absent(lock_key, "other", 10)
+        return taken, await workers[1].state.get(lock_key)
+
+    results = asyncio.run(_with_backends(scenario))
+    for name in ("sqlite", "redis"):
+        assert results[name] == (True, "other"), name
+
+
+def test_cancelled_redis_command_drops_its_connection():
+    async def scenario():
+        server = await FakeRedisServer().start()
+        state = RedisStateBackend(server.url, pool_size=1)
+        try:
+            await state.set("a", "1")
+            connection = state._idle[0]
+            pending = asyncio.ensure_future(state.get("a"))
+            await asyncio.sleep(0)
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+            dropped = connection not in state._idle and connection[1].is_closing()
+            return dropped, await state.get("a")
+        finally:
+            await state.close()
+            await server.stop()
+
+    dropped, value = asyncio.run(scenario())
+    assert dropped and value == "1"
+
+
+def test_turn_lock_serializes_workers():
+    """Turns of one session on two workers never overlap"""
+    async def scenario(make_backend):
+        workers = [SessionManager(make_backend(), lock_ttl_seconds=5) for _ in range(2)]
+        session_id = await workers[0].create()
+        timeline = []
+
+        async def turn(worker, name):
+            async with worker.turn_lock(session_id):
+                timeline.append(f"{name} start")
+                await asyncio.sleep(0.05)
+                timeline.append(f"{name} end")
+
+        await asyncio.gather(*(turn(workers[i % 2], f"turn{i}") for i in range(4)))
+        return timeline
+
+    results = asyncio.run(_with_backends(scenario))
+    for name in ("sqlite", "redis"):
+        timeline = results[name]
+        assert len(timeline) == 8, name
+        for start, end in zip(timeline[::2], timeline[1::2]):
+            assert start.split()[0] == end.split()[0], (name, timeline)
+
+
+def test_memory_backend_evicts_over_limit():
+    async def scenario():
+        sessions = SessionManager(InMemoryStateBackend(), max_sessions=2)
+        ids = [await sessions.create() for _ in range(3)]
+        return [await sessions.touch(session_id) for session_id in ids], len(sessions)
+
+    touched, live = asyncio.run(scenario())
+    assert touched == [False, True, True]
+    assert live == 2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Request coalescing tests: identical concurrent requests share one execution
+(the agent test uses the fake LLM, no OpenAI key needed)
+"""
+import asyncio
+
+from fake_llm import FakeChatModel
+from langgraph_agent import DreamPoolReActAgent
+from single_flight import SingleFlight, request_key
+
+CONCURRENT_REQUESTS = 10
+
+
+def test_identical_chat_starts_make_one_llm_call():
+    async def scenario():
+        llm = FakeChatModel(latency=0.1)
+        # Without coalescing every request would miss the response cache together
+        agent = DreamPoolReActAgent(llm=llm, fast_path=False)
+        flights = SingleFlight(enabled=True)
+        messages = ["I want to raise money for a new laptop", "  I want to raise money for a new  laptop "]
+
+        results = await asyncio.gather(*(
+            flights.do("/llm/chat/start", request_key("/llm/chat/start", None, messages[i % 2]),
+                       lambda message=messages[i % 2]: agent.start_conversation(message))
+            for i in range(CONCURRENT_REQUESTS)
+        ))
+        return llm, results
+
+    llm, results = asyncio.run(scenario())
+    assert llm.calls == 1
+    assert len(results) == CONCURRENT_REQUESTS
+    assert all(result == results[0] for result in results)
+
+
+def test_distinct_requests_run_separately():
+    async def scenario():
+        calls = []
+        flights = SingleFlight(enabled=True)
+
+        async def work(name):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return name
+
+        results = await asyncio.gather(*(
+            flights.do("/llm/propose", request_key("/llm/propose", engine, message),
+                       lambda engine=engine, message=message: work(f"{engine}:{message}"))
+            for engine in ("react", "structured") for message in ("laptop", "laptop", "bike")
+        ))
+        return calls, results, len(flights)
+
+    calls, results, in_flight = asyncio.run(scenario())
+    assert sorted(calls) == ["react:bike", "react:laptop", "structured:bike", "structured:laptop"]
+    assert results[0] == results[1] == "react:laptop"
+    assert in_flight == 0
+
+
+def test_failure_reaches_every_caller_and_is_not_kept():
+    async def scenario():
+        flights = SingleFlight(enabled=True)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise RuntimeError("provider error")
+            return "ok"
+
+        key = request_key("/llm/build_tx", {"title": "Laptop"})
+        first = await asyncio.gather(*(flights.do("/llm/build_tx", key, flaky) for _ in range(3)),
+                                     return_exceptions=True)
+        retry = await flights.do("/llm/build_tx", key, flaky)
+        return first, retry, len(attempts)
+
+    first, retry, attempts = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in first)
+    assert retry == "ok" and attempts == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_flight():
+    async def scenario():
+        flights = SingleFlight(enabled=True)
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        key = request_key("/llm/chat/start", None, "hi")
+        leader = asyncio.create_task(flights.do("/llm/chat/start", key, slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("/llm/chat/start", key, slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "done"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
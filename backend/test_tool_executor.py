@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tool executor tests: independent tool calls run concurrently and their
+declared state updates are merged in call order (no OpenAI key needed)
+"""
+import asyncio
+import time
+
+from langchain_core.tools import tool
+
+from fake_llm import FakeChatModel
+from langgraph_agent import DreamPoolReActAgent
+from tool_executor import ToolExecutor, ToolOutcome
+
+TOOL_LATENCY = 0.1
+
+
+@tool
+async def lookup_pool(pool_id: int) -> ToolOutcome:
+    """Look up a pool (slow I/O)"""
+    await asyncio.sleep(TOOL_LATENCY)
+    return ToolOutcome(f"Pool {pool_id} found", {"pool_id": pool_id})
+
+
+@tool
+def check_balance(address: str) -> ToolOutcome:
+    """Check a balance (blocking I/O, runs on the thread pool)"""
+    time.sleep(TOOL_LATENCY)
+    return ToolOutcome(f"Balance of {address}: 1 ETH", {"balance_eth": 1.0})
+
+
+@tool
+def broken(value: str) -> str:
+    """Always fails"""
+    raise RuntimeError("rpc unreachable")
+
+
+def call(name: str, index: int, **args) -> dict:
+    return {"name": name, "args": args, "id": f"call_{index}", "type": "tool_call"}
+
+
+def test_independent_calls_run_concurrently():
+    executor = ToolExecutor([lookup_pool, check_balance])
+    calls = [call("lookup_pool", 0, pool_id=1), call("check_balance", 1, address="0xabc"),
+             call("lookup_pool", 2, pool_id=2)]
+
+    started = time.perf_counter()
+    messages, updates = asyncio.run(executor.execute(calls))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < TOOL_LATENCY * 2, f"tools ran serially: {elapsed:.2f}s"
+    assert [message.tool_call_id for message in messages] == ["call_0", "call_1", "call_2"]
+    assert updates == {"pool_id": 2, "balance_eth": 1.0}  # later calls win
+
+
+def test_concurrency_limit():
+    executor = ToolExecutor([lookup_pool], max_concurrency=1)
+    calls = [call("lookup_pool", index, pool_id=index) for index in range(3)]
+
+    started = time.perf_counter()
+    asyncio.run(executor.execute(calls))
+    assert time.perf_counter() - started >= TOOL_LATENCY * 3
+
+
+def test_failures_become_error_messages():
+    executor = ToolExecutor([lookup_pool, broken], timeout_seconds=1)
+    messages, updates = asyncio.run(executor.execute([
+        call("broken", 0, value="x"), call("missing_tool", 1), call("lookup_pool", 2, pool_id=7)
+    ]))
+    assert [message.status for message in messages] == ["error", "error", "success"]
+    assert "rpc unreachable" in messages[0].content
+    assert updates == {"pool_id": 7}
+
+
+def test_agent_applies_declared_updates():
+    llm = FakeChatModel(call_tools=True)
+    agent = DreamPoolReActAgent(llm=llm, fast_path=False, routing_policy="chat")
+    result = asyncio.run(agent.start_conversation("I want to raise 2.5 ETH in 3 weeks"))
+    assert result["goal_amount_eth"] == 2.5
+    assert result["deadline_days"] == 21
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,72 @@
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import ToolMessage
+
+from metrics import TOOL_INVOCATIONS, TOOL_SECONDS
+
+
+class ToolOutcome:
+    """What a tool returns: the text the LLM sees and the state fields the tool sets"""
+
+    def __init__(self, content: str, updates: Optional[Dict[str, Any]] = None):
+        self.content = content
+        self.updates = updates or {}
+
+    def __str__(self) -> str:
+        return self.content
+
+
+class ToolExecutor:
+    """Runs the tool calls of one AI message concurrently and merges their declared state updates
+
+    Async tools run on the event loop and sync tools on the default thread
+    pool, at most max_concurrency at a time. Results and updates are applied
+    in call order, so a later call wins when two set the same field. A failing
+    or unknown tool becomes an error ToolMessage for the LLM to react to, like
+    ToolNode's default error handling.
+    """
+
+    def __init__(self, tools: Sequence[Any], max_concurrency: Optional[int] = None,
+                 timeout_seconds: Optional[float] = None):
+        self.tools = {tool.name: tool for tool in tools}
+        self.max_concurrency = max_concurrency if max_concurrency is not None else int(os.getenv("TOOL_MAX_CONCURRENCY", "8"))
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else float(os.getenv("TOOL_TIMEOUT_SECONDS", "10"))
+
+    async def _run(self, call: Dict[str, Any], slots: asyncio.Semaphore, config: Optional[Any]) -> Tuple[ToolMessage, Dict[str, Any]]:
+        name = call["name"]
+        TOOL_INVOCATIONS.inc(tool=name)
+        tool = self.tools.get(name)
+        if tool is None:
+            return ToolMessage(content=f"Error: {name} is not a valid tool, try one of {sorted(self.tools)}.",
+                               tool_call_id=call["id"], name=name, status="error"), {}
+
+        loop = asyncio.get_running_loop()
+        try:
+            async with slots:
+                started = loop.time()
+                # Plain args (not the tool call) make the tool return its ToolOutcome as-is
+                outcome = await asyncio.wait_for(tool.ainvoke(call["args"], config), self.timeout_seconds)
+                TOOL_SECONDS.observe(loop.time() - started, tool=name)
+        except asyncio.TimeoutError:
+            return ToolMessage(content=f"Error: {name} timed out after {self.timeout_seconds}s",
+                               tool_call_id=call["id"], name=name, status="error"), {}
+        except Exception as e:
+            return ToolMessage(content=f"Error: {repr(e)}\n Please fix your mistakes.",
+                               tool_call_id=call["id"], name=name, status="error"), {}
+
+        if not isinstance(outcome, ToolOutcome):
+            outcome = ToolOutcome(str(outcome))
+        return ToolMessage(content=outcome.content, tool_call_id=call["id"], name=name,
+                           artifact=outcome.updates), outcome.updates
+
+    async def execute(self, tool_calls: List[Dict[str, Any]], config: Optional[Any] = None) -> Tuple[List[ToolMessage], Dict[str, Any]]:
+        """The ToolMessages for tool_calls, in order, and the merged state updates"""
+        slots = asyncio.Semaphore(max(1, self.max_concurrency))
+        results = await asyncio.gather(*(self._run(call, slots, config) for call in tool_calls))
+
+        updates: Dict[str, Any] = {}
+        for _, update in results:
+            updates.update(update)
+        return [message for message, _ in results], updates
@@ -2,12 +2,12 @@ import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { ChatBox } from '../components/ChatBox';
 import { ProposedGoal } from '../types';
-import { ApiService, ConversationState, ConversationResponse } from '../services/api';
+import { ApiService, SessionResponse } from '../services/api';
 
 export const ChatConcierge: React.FC = () => {
   const [isLoading, setIsLoading] = useState(false);
   const [proposedGoal, setProposedGoal] = useState<ProposedGoal | null>(null);
-  const [conversationState, setConversationState] = useState<ConversationState | null>(null);
+  const [sessionId, setSessionId] = useState<string | null>(null);
   const [messages, setMessages] = useState<Array<{ type: 'user' | 'ai'; content: string }>>([
     { type: 'ai', content: "Hi! I'm your AI concierge. What do you want to own? I can help you create a funding goal to make it happen!" }
   ]);
@@ -20,29 +20,28 @@ export const ChatConcierge: React.FC = () => {
     setIsLoading(true);
 
     try {
-      let response: ConversationResponse;
-
-      if (!conversationState) {
-        // Start new conversation
-        response = await ApiService.startConversation(message);
-      } else {
-        // Continue existing conversation
-        response = await ApiService.continueConversation(conversationState, message);
-      }
-
-      // Update conversation state
-      setConversationState({
-        messages: response.messages,
-        goal_description: response.goal_description,
-        goal_amount_eth: response.goal_amount_eth,
-        deadline_days: response.deadline_days,
-        recipient_address: response.recipient_address,
-        conversation_complete: response.conversation_complete,
-        contract_payload: response.contract_payload
+      // Stream the reply token by token into a placeholder AI message
+      let streamed = '';
+      const response: SessionResponse = await ApiService.streamSession(sessionId, message, (event) => {
+        if (event.event === 'token') {
+          streamed += event.data.content;
+        } else if (event.event === 'tool_start') {
+          // Text before a tool call is superseded by the reply after it
+          streamed = '';
+          setIsLoading(true);
+          setMessages(newMessages);
+          return;
+        } else {
+          return;
+        }
+        setIsLoading(false);
+        setMessages([...newMessages, { type: 'ai', content: streamed }]);
       });
 
-      // Find the AI response (last AI message in the response)
-      const aiMessages = response.messages.filter(msg => msg.type === 'AIMessage');
+      setSessionId(response.session_id);
+
+      // Find the AI response (last AI message among this turn's messages)
+      const aiMessages = response.messages.filter(msg => msg.type === 'AIMessage' && msg.content);
       const lastAiMessage = aiMessages[aiMessages.length - 1];
 
       if (lastAiMessage) {
@@ -166,7 +165,7 @@ export const ChatConcierge: React.FC = () => {
               <button
                 onClick={() => {
                   setProposedGoal(null);
-                  setConversationState(null);
+                  setSessionId(null);
                   setMessages([{ type: 'ai', content: "Let's try again. What do you want to own?" }]);
                 }}
                 className="px-6 py-3 border border-gray-400 text-gray-600 rounded-lg hover:bg-gray-200 transition-colors"
@@ -1,5 +1,6 @@
 import { useEffect, useState } from "react";
 import { useAccount } from "wagmi";
+import { ApiService } from "../services/api";
 import { ContractService } from "../services/contract";
 import { useContribute } from "../services/useContribute";
 import { PoolData } from "../types";
@@ -13,13 +14,21 @@ export function ViewPools() {
   const { address } = useAccount();
   const { contribute, isPending: isContributing, isConfirming: isConfirmingContribution, error: contributionError } = useContribute();
 
+  async function fetchPools(): Promise<PoolData[]> {
+    try {
+      return await ApiService.getAllPools();
+    } catch (indexerError) {
+      // Backend indexer unavailable: read the pools from the chain directly
+      console.warn("Pool indexer unavailable, reading from chain:", indexerError);
+      return ContractService.getInstance().getAllPools();
+    }
+  }
+
   async function loadPools() {
     setLoading(true);
     setError(null);
     try {
-      const contractService = ContractService.getInstance();
-      const allPools = await contractService.getAllPools();
-      setPools(allPools);
+      setPools(await fetchPools());
     } catch (err) {
       console.error("loadPools error:", err);
       setError(err instanceof Error ? err.message : "Failed to load pools");
@@ -32,6 +41,25 @@ export function ViewPools() {
     loadPools();
   }, []);
 
+  // Apply pushed diffs instead of re-fetching every pool
+  useEffect(() => {
+    return ApiService.subscribePools((update) => {
+      if (update.event === 'resync') {
+        loadPools();
+        return;
+      }
+      const diff = update.data;
+      setPools(prev => {
+        if (diff.type === 'created') {
+          return prev.some(pool => pool.pool_id === diff.pool_id)
+            ? prev
+            : [diff.pool, ...prev].sort((a, b) => b.pool_id - a.pool_id);
+        }
+        return prev.map(pool => pool.pool_id === diff.pool_id ? { ...pool, ...diff.changes } : pool);
+      });
+    });
+  }, []);
+
   // Handle successful contribution confirmation
   useEffect(() => {
     if (isConfirmingContribution === false && contributionError === null) {
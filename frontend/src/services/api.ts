@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { ProposedGoal, EncodedTx } from '../types';
+import { ProposedGoal, EncodedTx, PoolData } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -43,6 +43,35 @@ export interface ConversationResponse {
   contract_payload?: any;
 }
 
+// Server-side session responses carry only the messages produced this turn
+export interface SessionResponse extends ConversationResponse {
+  session_id: string;
+}
+
+// Events pushed by the /stream chat endpoints
+export type ChatStreamEvent =
+  | { event: 'token'; data: { content: string } }
+  | { event: 'tool_start'; data: { id: string; name: string; input: any } }
+  | { event: 'tool_end'; data: { id: string; name: string; output: string } }
+  | { event: 'state'; data: Partial<ConversationResponse> }
+  | { event: 'done'; data: SessionResponse }
+  | { event: 'error'; data: { detail: string } };
+
+// One page of pools from the backend indexer, newest first
+export interface PoolPage {
+  pools: PoolData[];
+  total: number;
+  offset: number;
+  limit: number;
+  synced_block: number;
+}
+
+// Events pushed by /pools/stream
+export type PoolStreamEvent =
+  | { event: 'pool'; data: { pool_id: number; type: 'created'; pool: PoolData; synced_block: number } }
+  | { event: 'pool'; data: { pool_id: number; type: 'updated'; changes: Partial<PoolData>; synced_block: number } }
+  | { event: 'resync'; data: { synced_block: number } };
+
 export class ApiService {
   // Legacy method for backward compatibility
   static async proposeGoal(message: string): Promise<ProposedGoal> {
@@ -65,6 +94,40 @@ export class ApiService {
     }
   }
 
+  // Indexed pools; the browser revalidates with the ETag instead of re-reading the chain
+  static async getPools(params: { status?: PoolData['status']; offset?: number; limit?: number } = {}): Promise<PoolPage> {
+    const response = await api.get<PoolPage>('/pools', { params });
+    return response.data;
+  }
+
+  // Every indexed pool, requested page by page (the API caps a page at 100)
+  static async getAllPools(status?: PoolData['status']): Promise<PoolData[]> {
+    const pageSize = 100;
+    const pools = new Map<number, PoolData>();
+    for (let offset = 0; ; offset += pageSize) {
+      const page = await ApiService.getPools({ status, offset, limit: pageSize });
+      // Pools created while paging shift the offsets; keep each pool once
+      page.pools.forEach(pool => pools.set(pool.pool_id, pool));
+      if (page.pools.length < pageSize || offset + pageSize >= page.total) {
+        break;
+      }
+    }
+    return [...pools.values()].sort((a, b) => b.pool_id - a.pool_id);
+  }
+
+  // Live pool diffs; returns a function that closes the stream
+  static subscribePools(onEvent: (event: PoolStreamEvent) => void, poolIds?: number[]): () => void {
+    const query = poolIds?.length ? `?pool_ids=${poolIds.join(',')}` : '';
+    const source = new EventSource(`${API_BASE_URL}/pools/stream${query}`);
+    source.addEventListener('pool', (message) => {
+      onEvent({ event: 'pool', data: JSON.parse((message as MessageEvent).data) });
+    });
+    source.addEventListener('resync', (message) => {
+      onEvent({ event: 'resync', data: JSON.parse((message as MessageEvent).data) });
+    });
+    return () => source.close();
+  }
+
   // New langgraph conversation methods
   static async startConversation(message: string): Promise<ConversationResponse> {
     try {
@@ -89,6 +152,92 @@ export class ApiService {
     }
   }
 
+  // Server-side sessions: only {session_id, message} travels per turn
+  static async startSession(message: string): Promise<SessionResponse> {
+    try {
+      const response = await api.post<SessionResponse>('/llm/session/start', { message });
+      return response.data;
+    } catch (error) {
+      console.error('Failed to start session:', error);
+      throw new Error('Failed to start conversation. Please try again.');
+    }
+  }
+
+  static async continueSession(sessionId: string, message: string): Promise<SessionResponse> {
+    try {
+      const response = await api.post<SessionResponse>('/llm/session/continue', {
+        session_id: sessionId,
+        message
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Failed to continue session:', error);
+      throw new Error('Failed to continue conversation. Please try again.');
+    }
+  }
+
+  // Streams a session turn; resolves with the final response from the `done` event
+  static async streamSession(
+    sessionId: string | null,
+    message: string,
+    onEvent: (event: ChatStreamEvent) => void
+  ): Promise<SessionResponse> {
+    const path = sessionId ? '/llm/session/continue/stream' : '/llm/session/start/stream';
+    const body = sessionId ? { session_id: sessionId, message } : { message };
+
+    const response = await fetch(`${API_BASE_URL}${path}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify(body),
+    });
+    if (!response.ok || !response.body) {
+      console.error('Failed to stream conversation:', response.status);
+      throw new Error('Failed to continue conversation. Please try again.');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result: SessionResponse | null = null;
+
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // SSE frames are separated by a blank line
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+
+        const eventLine = frame.split('\n').find(line => line.startsWith('event: '));
+        const dataLine = frame.split('\n').find(line => line.startsWith('data: '));
+        if (!eventLine || !dataLine) continue;
+
+        const event = {
+          event: eventLine.slice('event: '.length),
+          data: JSON.parse(dataLine.slice('data: '.length)),
+        } as ChatStreamEvent;
+
+        if (event.event === 'error') {
+          console.error('Conversation stream failed:', event.data.detail);
+          throw new Error('Failed to continue conversation. Please try again.');
+        }
+        if (event.event === 'done') {
+          result = event.data;
+        }
+        onEvent(event);
+      }
+    }
+
+    if (!result) {
+      throw new Error('Conversation ended unexpectedly. Please try again.');
+    }
+    return result;
+  }
+
   static async healthCheck(): Promise<boolean> {
     try {
       const response = await api.get('/health');